@@ -3,21 +3,30 @@ import os
 import logging
 import uuid
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, abort
+from src.utils.startup import init_startup, prewarm, startup_report
+from flask import Flask, Response, render_template, request, jsonify, abort
 from werkzeug.exceptions import HTTPException
-from supabase import create_client, Client
 from dotenv import load_dotenv
-from src.routes import apps, settings, categories
+from src.routes import apps, settings, categories, bootstrap, icons
 from src.models.exceptions import AppError, handle_app_error, handle_http_error
-from src.services.database import DatabaseService
-from src.services.data_processing import DataProcessor
+from src.services.cache import CachedDatabaseService, catalog_cache
+from src.services.facets import facets
+from src.services.popularity import popularity
+from src.services.render_cache import IndexRenderer, card_cache, page_cache
+from src.services.search_index import search_index
+from src.services.snapshot import get_snapshot_store
+from src.utils.compression import init_compression, variant_etag
+from src.utils.json_provider import FastJSONProvider
+from src.utils.metrics import init_metrics, metrics
 from config import Config
 
+startup_report.mark("imports")
+
 # Load environment variables
 load_dotenv()
 
 # Configure logging
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=Config.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
 def create_app():
@@ -30,67 +39,82 @@ def create_app():
     app.config.from_object(Config)
     app.secret_key = Config.SECRET_KEY
     
+    # Encode JSON responses with orjson when it is installed
+    app.json = FastJSONProvider(app)
+    
     # Register blueprints
     app.register_blueprint(apps.bp)
     app.register_blueprint(settings.bp)
     app.register_blueprint(categories.bp)
+    app.register_blueprint(bootstrap.bp)
+    app.register_blueprint(icons.bp)
     
     # Register error handlers
     app.register_error_handler(AppError, handle_app_error)
     app.register_error_handler(HTTPException, handle_http_error)
     
+    # Time every request, DB operation and template render
+    init_metrics(app)
+    init_startup(app)
+    
+    # Compress JSON and text responses (registered after metrics so it runs first and is timed)
+    init_compression(app)
+    
+    @app.route('/api/cache/stats')
+    def cache_stats():
+        """Report hit/miss counters for the catalog cache."""
+        snapshot = get_snapshot_store()
+        return jsonify({
+            **catalog_cache.stats(),
+            "pages": page_cache.stats(),
+            "cards": card_cache.stats(),
+            "snapshot": snapshot.stats() if snapshot else None,
+            "search": search_index.stats(),
+            "popularity": popularity.stats(),
+            "facets": facets.stats()
+        })
+    
+    @app.route('/api/startup')
+    def startup():
+        """Report how long this worker took to start and to serve its first response."""
+        return jsonify(startup_report.report())
+    
+    @app.route('/metrics')
+    def prometheus_metrics():
+        """Expose request and operation latency metrics in the Prometheus text format."""
+        return Response(metrics.expose(), mimetype='text/plain; version=0.0.4')
+    
     # Root route
+    renderer = IndexRenderer(CachedDatabaseService())
+    
     @app.route('/')
     def index():
         """Render the main application page."""
         try:
-            # Get apps with optional filtering
-            category = request.args.get('category')
-            sort_by = request.args.get('sort')
-            order = request.args.get('order', 'asc')
-            
-            # Initialize services
-            db = DatabaseService(Config.get_supabase_client())
-            processor = DataProcessor()
-            
-            # Get data
-            apps_data = db.get_apps()
-            settings_data = db.client.table(Config.SETTINGS_TABLE).select("*").execute().data[0]
-            categories = db.get_categories()
-            
-            # Format apps data
-            formatted_apps = [processor.format_app_response(app) for app in apps_data]
-            
-            # Sort apps if requested
-            if sort_by:
-                reverse = order.lower() == 'desc'
-                formatted_apps.sort(
-                    key=lambda x: x.get(sort_by, ''),
-                    reverse=reverse
-                )
-            
-            # Filter by category if specified
-            if category:
-                formatted_apps = [
-                    app for app in formatted_apps 
-                    if app['category'].lower() == category.lower()
-                ]
-            
-            # Prepare template data
-            template_data = {
-                "apps": formatted_apps,
-                "settings": settings_data["settings"],
-                "metadata": settings_data["metadata"],
-                "categories": categories
-            }
-            
-            return render_template('index.html', data=template_data)
+            # Served from the rendered-page cache when the catalog is unchanged
+            page = renderer.render(request.args)
+            use_gzip = bool(request.accept_encodings['gzip'])  # Quality 0 refuses gzip
+            response = Response(page.gzipped if use_gzip else page.body, mimetype='text/html')
+            response.vary.add('Accept-Encoding')
+            if use_gzip:
+                response.headers['Content-Encoding'] = 'gzip'
+            if page.etag:
+                response.set_etag(variant_etag(page.etag, 'gzip') if use_gzip else page.etag)
+                response.headers['Cache-Control'] = 'no-cache'
+            return response.make_conditional(request)
             
         except Exception as e:
             logger.error(f"Error loading data: {e}")
             raise AppError("Failed to load application data", 500)
     
+    # Nothing above touches the network: clients and connections are created on first use
+    startup_report.mark("create_app")
     return app
 
+def prewarm_app(app: Flask) -> None:
+    """Fill caches and open connections before traffic, when PREWARM is enabled."""
+    if Config.PREWARM:
+        prewarm(app, Config.PREWARM_PATHS)
+
 # Create the application instance
 app = create_app()
@@ -0,0 +1,24 @@
+from app import app as flask_app
+from src.utils.asgi import AsgiApp
+from src.utils.startup import prewarm_asgi, startup_report
+from config import Config
+
+def create_asgi_app(wsgi_app) -> AsgiApp:
+    """Wrap the Flask app for an ASGI server.
+
+    Run with e.g. ``uvicorn asgi:app`` or
+    ``gunicorn -k uvicorn.workers.UvicornWorker asgi:app``; each worker runs a
+    single event loop and serves the Flask views on its thread pool.
+    """
+    asgi_app = AsgiApp(wsgi_app)
+
+    async def startup():
+        if Config.PREWARM:
+            await prewarm_asgi(asgi_app, Config.PREWARM_PATHS)
+
+    asgi_app.on_startup = startup
+    startup_report.mark("create_asgi_app")
+    return asgi_app
+
+# Create the ASGI application instance
+app = create_asgi_app(flask_app)
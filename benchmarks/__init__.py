@@ -0,0 +1,3 @@
+"""
+Benchmarks for the data access and formatting layers.
+"""
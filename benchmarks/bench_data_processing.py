@@ -0,0 +1,130 @@
+"""Microbenchmarks for DataProcessor's compiled formatters and key converters.
+
+Each case times the current implementation against the per-row code it
+replaced, on a synthetic catalog of 10k rows. Run from the repository root:
+
+    python -m benchmarks.bench_data_processing [--rows 10000] [--repeat 5]
+"""
+import argparse
+import json
+import timeit
+import uuid
+from typing import Any, Callable, Dict, List
+from src.services.data_processing import DataProcessor
+
+SORT_KEYS = ["name", "category", "launchCount", "lastModified", "lastLaunched"]
+
+def make_rows(count: int) -> List[Dict[str, Any]]:
+    """Build ``count`` rows shaped like launcher_apps records."""
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"App {i}",
+            "category": ("games", "tools", "social", "uncategorized")[i % 4],
+            "icon_url": f"https://example.com/icons/{i}.png",
+            "app_store_link": f"https://apps.apple.com/app/id{100000 + i}",
+            "launch_count": i % 97,
+            "last_modified": "2026-01-01T00:00:00+00:00",
+            "last_launched": None if i % 3 else "2026-01-02T00:00:00+00:00"
+        }
+        for i in range(count)
+    ]
+
+# Baselines: the implementations these replaced
+
+def legacy_format_app_response(app_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": app_data["id"],
+        "name": app_data["name"],
+        "category": app_data["category"],
+        "iconUrl": app_data["icon_url"],
+        "appStoreLink": app_data["app_store_link"],
+        "launchCount": app_data["launch_count"],
+        "lastModified": app_data["last_modified"],
+        "lastLaunched": app_data["last_launched"]
+    }
+
+def legacy_camel_to_snake(camel_str: str) -> str:
+    snake_str = camel_str[0].lower()
+    for char in camel_str[1:]:
+        if char.isupper():
+            snake_str += '_' + char.lower()
+        else:
+            snake_str += char
+    return snake_str
+
+def legacy_to_camel_case(snake_str: str) -> str:
+    components = snake_str.split('_')
+    return components[0] + ''.join(x.title() for x in components[1:])
+
+def legacy_jsonify(rows: List[Dict[str, Any]]) -> bytes:
+    # What flask.jsonify did: build dicts, then encode with sorted keys
+    body = {"apps": [legacy_format_app_response(row) for row in rows]}
+    return json.dumps(body, ensure_ascii=True, sort_keys=True, separators=(",", ":")).encode()
+
+def cases(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Callable[[], Any]]]:
+    """Return benchmark cases as {name: {"before": fn, "after": fn}}."""
+    columns = list(rows[0].keys())
+    camel_keys = [legacy_to_camel_case(column) for column in columns]
+    return {
+        "format rows": {
+            "before": lambda: [legacy_format_app_response(row) for row in rows],
+            "after": lambda: DataProcessor.format_apps(rows)
+        },
+        "rows to JSON bytes": {
+            "before": lambda: legacy_jsonify(rows),
+            "after": lambda: ('{"apps":%s}' % DataProcessor.apps_to_json(rows)).encode()
+        },
+        "camel_to_snake x rows": {
+            "before": lambda: [legacy_camel_to_snake(SORT_KEYS[i % 5]) for i in range(len(rows))],
+            "after": lambda: [DataProcessor.camel_to_snake(SORT_KEYS[i % 5]) for i in range(len(rows))]
+        },
+        "to_camel_case x rows": {
+            "before": lambda: [legacy_to_camel_case(columns[i % 8]) for i in range(len(rows))],
+            "after": lambda: [DataProcessor.to_camel_case(columns[i % 8]) for i in range(len(rows))]
+        },
+        "camel_to_snake_dict x rows": {
+            "before": lambda: [{legacy_camel_to_snake(k): None for k in camel_keys} for _ in range(len(rows))],
+            "after": lambda: [DataProcessor.camel_to_snake_dict(dict.fromkeys(camel_keys)) for _ in range(len(rows))]
+        }
+    }
+
+def check_equivalence(rows: List[Dict[str, Any]]) -> None:
+    """Fail loudly if a fast path disagrees with the code it replaced."""
+    assert DataProcessor.format_apps(rows) == [legacy_format_app_response(row) for row in rows]
+    assert json.loads(DataProcessor.apps_to_json(rows)) == [legacy_format_app_response(row) for row in rows]
+    for key in SORT_KEYS:
+        assert DataProcessor.camel_to_snake(key) == legacy_camel_to_snake(key)
+
+def run(row_count: int, repeat: int) -> List[Dict[str, Any]]:
+    """Time every case and return one result dict per case."""
+    rows = make_rows(row_count)
+    check_equivalence(rows)
+    results = []
+    for name, pair in cases(rows).items():
+        timings = {
+            label: min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+            for label, fn in pair.items()
+        }
+        results.append({
+            "case": name,
+            "rows": row_count,
+            "before_ms": round(timings["before"], 3),
+            "after_ms": round(timings["after"], 3),
+            "speedup": round(timings["before"] / timings["after"], 2) if timings["after"] else None
+        })
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'case':<30}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for result in run(args.rows, args.repeat):
+        print(f"{result['case']:<30}{result['before_ms']:>12.2f}{result['after_ms']:>12.2f}"
+              f"{result['speedup']:>9.2f}x")
+
+if __name__ == "__main__":
+    main()
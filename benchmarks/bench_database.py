@@ -0,0 +1,213 @@
+"""End-to-end benchmarks for DatabaseService and the routes, against an in-memory Supabase.
+
+The shared client is replaced with ``FakeSupabaseClient`` (see
+``benchmarks/fake_supabase.py``), so every query still goes through the real
+service code and routes while each round trip costs a fixed, injected latency
+instead of a network call. Results are written as JSON so runs can be compared
+between commits. Run from the repository root:
+
+    python -m benchmarks.bench_database [--sizes 100,10000,100000] [--latency-ms 1] [--repeat 3]
+    python -m benchmarks.bench_database --compare before.json after.json
+"""
+import argparse
+import copy
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from benchmarks.bench_data_processing import make_rows
+from benchmarks.fake_supabase import FakeSupabaseClient
+from src.services.client_registry import registry
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+LAUNCHES_PER_REPEAT = 100
+
+def current_commit() -> str:
+    """Short hash of HEAD, with ``-dirty`` when the tree has uncommitted changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        changes = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if changes else commit
+
+def import_payload(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Half updates of existing apps, half new apps, in the export format."""
+    payload = []
+    for i, row in enumerate(rows):
+        app = {"name": f"Imported {i}", "category": row["category"], "iconUrl": row["icon_url"],
+               "appStoreLink": row["app_store_link"]}
+        if i % 2 == 0:
+            app["id"] = row["id"]
+        payload.append(app)
+    return payload
+
+class Bench:
+    """Times cases against one fake client whose catalog is reseeded per size."""
+
+    def __init__(self, client: FakeSupabaseClient, repeat: int):
+        self.client = client
+        self.repeat = repeat
+        self.results: List[Dict[str, Any]] = []
+
+        # Routes bind their DatabaseService at import time, so install first
+        registry.install(client)
+        from app import app
+        from src.services.cache import CachedDatabaseService, catalog_cache
+        from src.services.database import DatabaseService
+        from src.services.render_cache import page_cache
+        from src.utils.compression import compressed_cache
+        self.http = app.test_client()
+        self.cache = catalog_cache
+        self.response_caches = (page_cache, compressed_cache)
+        self.db = DatabaseService(client)
+        self.cached_db = CachedDatabaseService(client)
+
+    def clear_caches(self) -> None:
+        """Drop cached reads and the rendered pages and compressed responses built from them."""
+        self.cache.clear()
+        for cache in self.response_caches:
+            cache.clear()
+
+    def seed(self, size: int) -> None:
+        self.client.tables.clear()
+        self.cache.clear()
+        self.rows = make_rows(size)
+        self.client.seed("launcher_apps", self.rows)
+        self.client.seed("launcher_categories", [{"name": name} for name in ("games", "tools", "social")])
+        self.client.seed("launcher_settings", [{
+            "id": str(uuid.uuid4()),
+            "settings": {"iconSize": 60},
+            "metadata": {"version": "1.0"}
+        }])
+
+    def measure(self, case: str, size: int, fn: Callable[[], Any],
+                setup: Optional[Callable[[], None]] = None, ops: int = 1) -> None:
+        """Run ``fn`` ``repeat`` times and record per-operation timings in ms."""
+        timings = []
+        round_trips = 0
+        for _ in range(self.repeat):
+            if setup:
+                setup()
+            self.client.reset_counters()
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000 / ops)
+            round_trips = self.client.round_trips
+        result = {
+            "case": case,
+            "rows": size,
+            "min_ms": round(min(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "mean_ms": round(statistics.mean(timings), 3),
+            "max_ms": round(max(timings), 3),
+            "round_trips": round_trips / ops
+        }
+        self.results.append(result)
+        print(f"{case:<32}{size:>8}{result['median_ms']:>12.2f}{result['min_ms']:>12.2f}"
+              f"{result['round_trips']:>10.1f}")
+
+    def run_size(self, size: int) -> None:
+        self.seed(size)
+        app_ids = [row["id"] for row in self.rows]
+
+        self.measure("get_apps", size, self.db.get_apps)
+        self.measure("get_apps (cached, cold)", size, self.cached_db.get_apps, setup=self.cache.clear)
+        self.measure("get_apps (cached, warm)", size, self.cached_db.get_apps)
+
+        def launch_many():
+            for i in range(LAUNCHES_PER_REPEAT):
+                self.db.increment_launch_count(app_ids[i % len(app_ids)])
+        self.measure("increment_launch_count", size, launch_many, ops=LAUNCHES_PER_REPEAT)
+
+        snapshot = copy.deepcopy(self.client.tables)
+        payload = import_payload(self.rows)
+
+        def restore():
+            self.client.tables = copy.deepcopy(snapshot)
+        self.measure("import_apps", size, lambda: self.db.import_apps(payload), setup=restore)
+        restore()
+
+        def render():
+            response = self.http.get("/")
+            assert response.status_code == 200, response.status_code
+        self.measure("GET / (cold cache)", size, render, setup=self.clear_caches)
+        self.measure("GET / (warm cache)", size, render)
+        self.measure("GET /api/apps?limit=50", size,
+                     lambda: self.http.get("/api/apps?limit=50"), setup=self.clear_caches)
+
+def run(sizes: List[int], latency_ms: float, repeat: int) -> Dict[str, Any]:
+    client = FakeSupabaseClient(latency=latency_ms / 1000)
+    bench = Bench(client, repeat)
+    print(f"{'case':<32}{'rows':>8}{'median ms':>12}{'min ms':>12}{'trips':>10}")
+    for size in sizes:
+        bench.run_size(size)
+    return {
+        "meta": {
+            "commit": current_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "latency_ms": latency_ms,
+            "repeat": repeat,
+            "sizes": sizes
+        },
+        "results": bench.results
+    }
+
+def compare(before_path: str, after_path: str) -> None:
+    """Print median timings of two result files side by side."""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    baseline = {(r["case"], r["rows"]): r for r in before["results"]}
+    print(f"{before['meta']['commit']} -> {after['meta']['commit']}")
+    print(f"{'case':<32}{'rows':>8}{'before ms':>12}{'after ms':>12}{'change':>10}")
+    for result in after["results"]:
+        old = baseline.get((result["case"], result["rows"]))
+        if old is None:
+            continue
+        change = (result["median_ms"] / old["median_ms"] - 1) * 100 if old["median_ms"] else 0.0
+        print(f"{result['case']:<32}{result['rows']:>8}{old['median_ms']:>12.2f}"
+              f"{result['median_ms']:>12.2f}{change:>+9.1f}%")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,10000,100000",
+                        help="comma-separated catalog sizes")
+    parser.add_argument("--latency-ms", type=float, default=1.0,
+                        help="latency injected into every database round trip")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two results files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    # Per-request debug logging would dominate the timings
+    logging.disable(logging.WARNING)
+    report = run([int(size) for size in args.sizes.split(",")], args.latency_ms, args.repeat)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
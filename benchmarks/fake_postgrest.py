@@ -0,0 +1,207 @@
+"""Local Supabase stand-in: ``FakeSupabaseClient`` served over PostgREST's HTTP API.
+
+Answers ``/rest/v1/<table>`` and ``/rest/v1/rpc/<function>`` with the query
+string filters, ``Prefer`` headers and JSON bodies that postgrest-py sends,
+so the unmodified app (``SUPABASE_URL=http://127.0.0.1:<port>``) can run in
+real gunicorn workers that all share one in-memory catalog. Every request
+sleeps for the injected latency before it is answered, like a round trip to
+a remote database, and requests are served concurrently. Run from the
+repository root:
+
+    python -m benchmarks.fake_postgrest [--port 54321] [--latency-ms 5] [--apps 1000]
+"""
+import argparse
+import json
+import logging
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from benchmarks.bench_data_processing import make_rows
+from benchmarks.fake_supabase import FakeAPIError, FakeSupabaseClient
+from src.services.data_processing import DataProcessor
+
+# Any three dot-separated segments pass the client's API key check
+API_KEY = "stand-in.stand-in.stand-in"
+
+# Filter values arrive as text; these columns compare as numbers
+INTEGER_COLUMNS = frozenset(("launch_count", "launches"))
+
+_RESERVED_PARAMS = frozenset(("select", "order", "limit", "offset", "on_conflict"))
+
+def seed_catalog(client: FakeSupabaseClient, apps: int) -> None:
+    """Fill the stand-in with ``apps`` synthetic apps, their categories and the default settings."""
+    client.seed("launcher_apps", make_rows(apps))
+    client.seed("launcher_categories", [{"name": name} for name in ("games", "tools", "social")])
+    client.seed("launcher_settings", [{"id": str(uuid.uuid4()), **DataProcessor.default_settings()}])
+
+def _split_list(text: str) -> List[str]:
+    """Split the ``(a,"b,c")`` operand of an ``in`` filter."""
+    values, current, quoted = [], "", False
+    for char in text.strip("()"):
+        if char == '"':
+            quoted = not quoted
+        elif char == "," and not quoted:
+            values.append(current)
+            current = ""
+        else:
+            current += char
+    if current or values:
+        values.append(current)
+    return values
+
+def _operand(column: str, text: str) -> Any:
+    if column in INTEGER_COLUMNS:
+        try:
+            return int(text)
+        except ValueError:
+            return text
+    return text
+
+def _prefer(headers: Any) -> Dict[str, str]:
+    """Parse ``Prefer: return=minimal,resolution=merge-duplicates`` into a dict."""
+    preferences = {}
+    for item in (headers.get("Prefer") or "").split(","):
+        key, _, value = item.strip().partition("=")
+        if key:
+            preferences[key] = value
+    return preferences
+
+class PostgRESTHandler(BaseHTTPRequestHandler):
+    """Translates one PostgREST request into a ``FakeSupabaseClient`` query."""
+
+    protocol_version = "HTTP/1.1"
+    client: FakeSupabaseClient
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_HEAD(self) -> None:
+        self._handle("HEAD")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PATCH(self) -> None:
+        self._handle("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # One line per round trip would swamp the load test's output
+        pass
+
+    def _handle(self, method: str) -> None:
+        url = urlsplit(self.path)
+        params = parse_qsl(url.query, keep_blank_values=True)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        prefer = _prefer(self.headers)
+        try:
+            if not url.path.startswith("/rest/v1/"):
+                return self._send(404, {"message": f"Unknown path {url.path}"})
+            name = url.path[len("/rest/v1/"):]
+            if name.startswith("rpc/"):
+                return self._send(200, self.client.rpc(name[len("rpc/"):], body or {}).execute().data)
+            status, data, count = self._query(method, name, params, body, prefer)
+            return self._send(status, data, count)
+        except FakeAPIError as e:
+            return self._send(409 if "duplicate key" in str(e) else 400, {"message": str(e), "code": "PGRST"})
+        except Exception as e:
+            return self._send(500, {"message": f"{type(e).__name__}: {e}"})
+
+    def _query(self, method: str, table: str, params: List[Tuple[str, str]], body: Any,
+               prefer: Dict[str, str]) -> Tuple[int, Any, Optional[int]]:
+        query = self.client.table(table)
+        options = {key: value for key, value in params if key in _RESERVED_PARAMS and key != "order"}
+        returning = prefer.get("return", "representation")
+        if method in ("GET", "HEAD"):
+            query = query.select(options.get("select", "*"), count=prefer.get("count"))
+            status = 200
+        elif method == "POST":
+            if "resolution" in prefer:
+                query = query.upsert(body, returning=returning, on_conflict=options.get("on_conflict", ""),
+                                     ignore_duplicates=prefer["resolution"] == "ignore-duplicates")
+            else:
+                query = query.insert(body, returning=returning)
+            status = 201
+        elif method == "PATCH":
+            query = query.update(body, returning=returning)
+            status = 200
+        else:
+            query = query.delete(returning=returning)
+            status = 200
+
+        for key, value in params:
+            if key == "order":
+                for term in value.split(","):
+                    column, *modifiers = term.split(".")
+                    query = query.order(column, desc="desc" in modifiers, nullsfirst="nullsfirst" in modifiers)
+            elif key not in _RESERVED_PARAMS:
+                operator, _, operand = value.partition(".")
+                if operator == "not":
+                    query = query.not_
+                    operator, _, operand = operand.partition(".")
+                if operator == "in":
+                    query = query.in_(key, [_operand(key, item) for item in _split_list(operand)])
+                elif operator == "is":
+                    query = query.is_(key, None if operand == "null" else operand)
+                else:
+                    query = getattr(query, operator)(key, _operand(key, operand))
+        if "limit" in options:
+            query = query.limit(int(options["limit"]))
+        if "offset" in options:
+            query = query.offset(int(options["offset"]))
+
+        response = query.execute()
+        if method == "HEAD" or returning == "minimal" and method != "GET":
+            return 204 if status == 200 else status, None, response.count
+        return status, response.data, response.count
+
+    def _send(self, status: int, data: Any, count: Optional[int] = None) -> None:
+        payload = b"" if data is None else json.dumps(data, default=str).encode()
+        self.send_response(status)
+        if payload:
+            self.send_header("Content-Type", "application/json")
+        if count is not None:
+            self.send_header("Content-Range", f"0-{max(count - 1, 0)}/{count}")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload and self.command != "HEAD":
+            self.wfile.write(payload)
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP server over one shared ``FakeSupabaseClient``."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address: Tuple[str, int], client: FakeSupabaseClient):
+        handler = type("BoundPostgRESTHandler", (PostgRESTHandler,), {"client": client})
+        super().__init__(address, handler)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="latency injected into every database round trip")
+    parser.add_argument("--apps", type=int, default=1000, help="synthetic apps to seed")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    client = FakeSupabaseClient(latency=args.latency_ms / 1000)
+    seed_catalog(client, args.apps)
+    server = StandInServer((args.host, args.port), client)
+    print(f"Supabase stand-in on http://{args.host}:{server.server_address[1]} "
+          f"({args.apps} apps, {args.latency_ms:g} ms per call, key {API_KEY})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+"""In-memory stand-in for the Supabase client used by DatabaseService.
+
+Implements the subset of the PostgREST query-builder chain the app uses
+(``table().select().eq().in_().order().limit().insert().upsert().update()
+.delete().execute()`` and ``rpc()``) over Python dicts, plus the database
+functions declared in ``supabase_schema.sql``. Every ``execute()`` counts as
+one round trip and can sleep for an injected latency to model the network.
+"""
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+class FakeAPIError(Exception):
+    """Raised where PostgREST would answer with an error."""
+
+class FakeResponse:
+    """Mimics postgrest's APIResponse."""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _parse(timestamp: str) -> datetime:
+    parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+# Column defaults from supabase_schema.sql
+TABLE_DEFAULTS: Dict[str, Dict[str, Callable[[], Any]]] = {
+    "launcher_apps": {
+        "category": lambda: "uncategorized",
+        "icon_url": lambda: None,
+        "app_store_link": lambda: None,
+        "launch_count": lambda: 0,
+        "last_modified": _now,
+        "last_launched": lambda: None
+    },
+    "launcher_settings": {"created_at": _now, "updated_at": _now},
+    "launcher_categories": {"created_at": _now},
+    "launcher_app_tombstones": {"deleted_at": _now}
+}
+
+# Columns with a UNIQUE constraint besides the primary key
+UNIQUE_COLUMNS: Dict[str, Tuple[str, ...]] = {"launcher_categories": ("name",)}
+
+def _sort_key(value: Any) -> Tuple[bool, Any]:
+    # Postgres sorts NULLs last in ascending order (and first in descending)
+    return (value is None, value if value is not None else 0)
+
+def _matches(row: Dict[str, Any], column: str, op: str, value: Any) -> bool:
+    actual = row.get(column)
+    if op.startswith("not."):
+        # SQL NOT: a comparison with NULL stays unknown, so it still does not match
+        base = op[len("not."):]
+        return (base == "is" or actual is not None) and not _matches(row, column, base, value)
+    if op == "in":
+        return actual in value
+    if op == "is":
+        return actual is None if value is None else bool(actual == value)
+    if actual is None:
+        return False
+    if op == "eq":
+        return bool(actual == value)
+    if op == "neq":
+        return bool(actual != value)
+    if op == "gt":
+        return bool(actual > value)
+    if op == "gte":
+        return bool(actual >= value)
+    if op == "lt":
+        return bool(actual < value)
+    if op == "lte":
+        return bool(actual <= value)
+    raise FakeAPIError(f"Unsupported filter operator {op}")
+
+class FakeQuery:
+    """One query being built against a fake table."""
+
+    def __init__(self, client: "FakeSupabaseClient", table: str):
+        self.client = client
+        self.table = table
+        self.operation = "select"
+        self.columns: Optional[List[str]] = None
+        self.count: Optional[str] = None
+        self.payload: Any = None
+        self.returning = "representation"
+        self.on_conflict = "id"
+        self.ignore_duplicates = False
+        self.filters: List[Tuple[str, str, Any]] = []
+        self.negate_next = False
+        self.orders: List[Tuple[str, bool]] = []
+        self.limit_count: Optional[int] = None
+        self.offset_count = 0
+
+    # Operations
+
+    def select(self, *columns: str, count: Optional[str] = None) -> "FakeQuery":
+        self.operation = "select"
+        names = [name.strip() for column in columns for name in column.split(",")]
+        self.columns = None if not names or "*" in names else names
+        self.count = count
+        return self
+
+    def insert(self, json: Any, *, count: Optional[str] = None, returning: str = "representation",
+               upsert: bool = False) -> "FakeQuery":
+        self.operation = "upsert" if upsert else "insert"
+        self.payload = json
+        self.returning = str(getattr(returning, "value", returning))
+        return self
+
+    def upsert(self, json: Any, *, count: Optional[str] = None, returning: str = "representation",
+               ignore_duplicates: bool = False, on_conflict: str = "") -> "FakeQuery":
+        self.operation = "upsert"
+        self.payload = json
+        self.returning = str(getattr(returning, "value", returning))
+        self.ignore_duplicates = ignore_duplicates
+        self.on_conflict = on_conflict or "id"
+        return self
+
+    def update(self, json: Dict[str, Any], *, count: Optional[str] = None,
+               returning: str = "representation") -> "FakeQuery":
+        self.operation = "update"
+        self.payload = json
+        self.returning = str(getattr(returning, "value", returning))
+        return self
+
+    def delete(self, *, count: Optional[str] = None, returning: str = "representation") -> "FakeQuery":
+        self.operation = "delete"
+        self.returning = str(getattr(returning, "value", returning))
+        return self
+
+    # Filters and modifiers
+
+    def _filter(self, column: str, op: str, value: Any) -> "FakeQuery":
+        if self.negate_next:
+            op, self.negate_next = f"not.{op}", False
+        self.filters.append((column, op, value))
+        return self
+
+    @property
+    def not_(self) -> "FakeQuery":
+        self.negate_next = True
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "lte", value)
+
+    def is_(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "is", None if value in (None, "null") else value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "FakeQuery":
+        return self._filter(column, "in", set(values))
+
+    def order(self, column: str, *, desc: bool = False, nullsfirst: bool = False,
+              foreign_table: Optional[str] = None) -> "FakeQuery":
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, size: int, *, foreign_table: Optional[str] = None) -> "FakeQuery":
+        self.limit_count = size
+        return self
+
+    def offset(self, size: int) -> "FakeQuery":
+        self.offset_count = size
+        return self
+
+    def range(self, start: int, end: int) -> "FakeQuery":
+        self.offset_count = start
+        self.limit_count = end - start
+        return self
+
+    def execute(self) -> FakeResponse:
+        return self.client._execute(self)
+
+class FakeRPC:
+    """A pending database function call."""
+
+    def __init__(self, client: "FakeSupabaseClient", name: str, params: Dict[str, Any]):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self) -> FakeResponse:
+        return self.client._call(self.name, self.params)
+
+class FakeSupabaseClient:
+    """Thread-safe in-memory Supabase client with injectable per-call latency."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.functions: Dict[str, Callable[..., Any]] = {
+            "increment_launch_count": self._increment_launch_count,
+            "increment_launch_counts": self._increment_launch_counts,
+            "app_popularity": self._app_popularity,
+            "category_facets": self._category_facets,
+            "catalog_version": self._catalog_version
+        }
+        self.round_trips = 0
+        self._lock = threading.RLock()
+
+    # Client surface used by the app
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def from_(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> FakeRPC:
+        return FakeRPC(self, name, params)
+
+    def close(self) -> None:
+        pass
+
+    # Test helpers
+
+    def seed(self, table: str, rows: Iterable[Dict[str, Any]]) -> None:
+        """Insert rows directly, without counting round trips or latency."""
+        with self._lock:
+            for row in rows:
+                self._insert_row(table, dict(row))
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        """Return copies of every row in a table."""
+        with self._lock:
+            return [dict(row) for row in self.tables.get(table, {}).values()]
+
+    def reset_counters(self) -> None:
+        self.round_trips = 0
+
+    # Execution
+
+    def _round_trip(self) -> None:
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _execute(self, query: FakeQuery) -> FakeResponse:
+        self._round_trip()
+        with self._lock:
+            response: FakeResponse = getattr(self, f"_do_{query.operation}")(query)
+            return response
+
+    def _call(self, name: str, params: Dict[str, Any]) -> FakeResponse:
+        self._round_trip()
+        function = self.functions.get(name)
+        if function is None:
+            raise FakeAPIError(f"Could not find the function {name}")
+        with self._lock:
+            return FakeResponse(function(**params))
+
+    def _table(self, name: str) -> Dict[str, Dict[str, Any]]:
+        return self.tables.setdefault(name, {})
+
+    def _candidates(self, query: FakeQuery) -> List[Dict[str, Any]]:
+        table = self._table(query.table)
+        rows: Iterable[Dict[str, Any]] = table.values()
+        # Primary-key lookups skip the scan, like an index would
+        for column, op, value in query.filters:
+            if column == "id" and op == "eq":
+                rows = [table[value]] if value in table else []
+                break
+            if column == "id" and op == "in":
+                rows = [table[v] for v in value if v in table]
+                break
+        return [
+            row for row in rows
+            if all(_matches(row, column, op, value) for column, op, value in query.filters)
+        ]
+
+    def _project(self, rows: List[Dict[str, Any]], columns: Optional[List[str]]) -> List[Dict[str, Any]]:
+        if columns is None:
+            return [dict(row) for row in rows]
+        return [{column: row.get(column) for column in columns} for row in rows]
+
+    def _returning(self, query: FakeQuery, rows: List[Dict[str, Any]]) -> FakeResponse:
+        if query.returning == "minimal":
+            return FakeResponse([])
+        return FakeResponse(self._project(rows, None))
+
+    def _do_select(self, query: FakeQuery) -> FakeResponse:
+        rows = self._candidates(query)
+        count = len(rows) if query.count else None
+        for column, desc in reversed(query.orders):
+            rows.sort(key=lambda row: _sort_key(row.get(column)), reverse=desc)
+        rows = rows[query.offset_count:]
+        if query.limit_count is not None:
+            rows = rows[:query.limit_count]
+        return FakeResponse(self._project(rows, query.columns), count)
+
+    def _insert_row(self, table_name: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._table(table_name)
+        for column, default in TABLE_DEFAULTS.get(table_name, {}).items():
+            if column not in row:
+                row[column] = default()
+        row.setdefault("id", str(uuid.uuid4()))
+        if row["id"] in table:
+            raise FakeAPIError(f"duplicate key value violates unique constraint on {table_name}.id")
+        for column in UNIQUE_COLUMNS.get(table_name, ()):
+            if any(existing.get(column) == row.get(column) for existing in table.values()):
+                raise FakeAPIError(f"duplicate key value violates unique constraint on {table_name}.{column}")
+        table[row["id"]] = row
+        return row
+
+    def _payload_rows(self, query: FakeQuery) -> List[Dict[str, Any]]:
+        payload = query.payload if isinstance(query.payload, list) else [query.payload]
+        return [dict(row) for row in payload]
+
+    def _do_insert(self, query: FakeQuery) -> FakeResponse:
+        inserted = [self._insert_row(query.table, row) for row in self._payload_rows(query)]
+        return self._returning(query, inserted)
+
+    def _do_upsert(self, query: FakeQuery) -> FakeResponse:
+        table = self._table(query.table)
+        written = []
+        for row in self._payload_rows(query):
+            key = query.on_conflict
+            existing = next(
+                (r for r in (table.values() if key != "id" else [table.get(row.get("id", ""))])
+                 if r is not None and r.get(key) == row.get(key)),
+                None
+            )
+            if existing is None:
+                written.append(self._insert_row(query.table, row))
+            elif not query.ignore_duplicates:
+                existing.update({k: v for k, v in row.items() if k != "id"})
+                written.append(existing)
+        return self._returning(query, written)
+
+    def _do_update(self, query: FakeQuery) -> FakeResponse:
+        rows = self._candidates(query)
+        for row in rows:
+            row.update(query.payload)
+        return self._returning(query, rows)
+
+    def _do_delete(self, query: FakeQuery) -> FakeResponse:
+        rows = self._candidates(query)
+        table = self._table(query.table)
+        for row in rows:
+            del table[row["id"]]
+        return self._returning(query, rows)
+
+    # Database functions from supabase_schema.sql
+
+    def _increment_launch_count(self, app_id: str, amount: int = 1,
+                                launched_at: Optional[str] = None) -> List[Dict[str, Any]]:
+        row = self._table("launcher_apps").get(app_id)
+        if row is None:
+            return []
+        launched_at = launched_at or _now()
+        row["launch_count"] = (row.get("launch_count") or 0) + amount
+        row["last_launched"] = max(row.get("last_launched") or launched_at, launched_at)
+        # Hourly rollup row, keyed like its (app_id, bucket) primary key
+        bucket = _parse(launched_at).replace(minute=0, second=0, microsecond=0).isoformat()
+        rollup = self._table("launcher_app_launches").setdefault(
+            f"{app_id}/{bucket}", {"id": f"{app_id}/{bucket}", "app_id": app_id, "bucket": bucket, "launches": 0}
+        )
+        rollup["launches"] += amount
+        return [dict(row)]
+
+    def _increment_launch_counts(self, increments: List[Dict[str, Any]]) -> int:
+        return sum(
+            len(self._increment_launch_count(delta["id"], delta["count"], delta["last_launched"]))
+            for delta in increments
+        )
+
+    def _app_popularity(self, half_life_hours: float, since: str) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        since_at = _parse(since)
+        apps = self._table("launcher_apps")
+        scores: Dict[str, float] = {}
+        for rollup in self._table("launcher_app_launches").values():
+            bucket = _parse(rollup["bucket"])
+            # Rollups of deleted apps are gone with them (ON DELETE CASCADE)
+            if bucket < since_at or rollup["app_id"] not in apps:
+                continue
+            age_hours = (now - bucket).total_seconds() / 3600
+            scores[rollup["app_id"]] = scores.get(rollup["app_id"], 0.0) + \
+                rollup["launches"] * 2 ** (-age_hours / half_life_hours)
+        return [{"app_id": app_id, "score": score} for app_id, score in scores.items()]
+
+    def _category_facets(self) -> List[Dict[str, Any]]:
+        counts: Dict[str, int] = {}
+        newest: Dict[str, str] = {}
+        for app in self._table("launcher_apps").values():
+            category = app.get("category") or "uncategorized"
+            counts[category] = counts.get(category, 0) + 1
+            if app.get("last_modified") and app["last_modified"] > newest.get(category, ""):
+                newest[category] = app["last_modified"]
+        listed = {row["name"] for row in self._table("launcher_categories").values()}
+        return [
+            {"name": name, "app_count": counts.get(name, 0), "last_modified": newest.get(name), "listed": name in listed}
+            for name in sorted(listed | counts.keys())
+        ]
+
+    def _catalog_version(self) -> Dict[str, Any]:
+        apps = self._table("launcher_apps").values()
+        categories = self._table("launcher_categories").values()
+        settings = self._table("launcher_settings").values()
+
+        def newest(rows: Iterable[Dict[str, Any]], column: str) -> Optional[str]:
+            values = [row[column] for row in rows if row.get(column)]
+            return max(values) if values else None
+
+        return {
+            "apps_count": len(self._table("launcher_apps")),
+            "apps_modified": newest(apps, "last_modified"),
+            "apps_launched": newest(apps, "last_launched"),
+            "categories_count": len(self._table("launcher_categories")),
+            "categories_created": newest(categories, "created_at"),
+            "settings_updated": newest(settings, "updated_at")
+        }
@@ -0,0 +1,351 @@
+"""Load test: the app under gunicorn against a local Supabase stand-in, driven by a weighted traffic mix.
+
+For each worker/thread combination this starts the Supabase stand-in
+(``benchmarks/fake_postgrest.py``, a fixed latency per database call) and
+``gunicorn main:app`` against it, then runs closed-loop clients that pick
+scenarios by weight: ``/`` renders, ``GET /api/apps`` pages by sort and
+category, bursts of launches of popular apps, settings reads and occasional
+imports. It reports throughput, p50/p95/p99 latency and error rate per
+endpoint, picks the saturation point of the sweep, and writes the results to
+``benchmarks/results/loadtest-<commit>.json``. Run from the repository root:
+
+    python -m benchmarks.loadtest [--workers 1,2,4] [--threads 1,4,8] [--clients 32] [--duration 20]
+    python -m benchmarks.loadtest --latency-ms 20 --mix index=10,list=40,launch=30,settings=20,import=0
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from benchmarks.bench_database import RESULTS_DIR, current_commit
+from benchmarks.fake_postgrest import API_KEY
+
+# Scenario weights: relative share of client iterations
+DEFAULT_MIX = {"index": 15, "list": 35, "launch": 25, "settings": 24, "import": 1}
+
+SORTS = ("", "name", "launchCount", "lastModified", "popular")
+CATEGORIES = ("", "", "games", "tools", "social", "uncategorized")
+LAUNCH_BURST = (1, 5)
+IMPORT_SIZE = 20
+# Share of launches that go to the hottest tenth of the catalog
+HOT_SHARE = 0.8
+
+# One sample: (endpoint, status or 0 for a connection error, latency in seconds)
+Sample = Tuple[str, int, float]
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+def parse_mix(text: Optional[str]) -> Dict[str, float]:
+    """Parse ``name=weight,...`` over the default mix."""
+    mix: Dict[str, float] = dict(DEFAULT_MIX)
+    for item in filter(None, (text or "").split(",")):
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown scenario {name!r}, expected one of: {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight)
+    if not any(mix.values()):
+        raise SystemExit("The mix needs at least one scenario with a positive weight")
+    return mix
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with status {process.returncode} before becoming ready")
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status < 500:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} was not ready after {timeout:g}s")
+
+def stop(process: subprocess.Popen) -> None:
+    if process.poll() is None:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+class Client:
+    """One simulated user on a keep-alive connection, running scenarios until the deadline."""
+
+    def __init__(self, port: int, app_ids: List[str], mix: Dict[str, float], seed: int):
+        self.port = port
+        self.app_ids = app_ids
+        self.hot_ids = app_ids[:max(1, len(app_ids) // 10)]
+        self.rng = random.Random(seed)
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.scenarios: Dict[str, Callable[[], None]] = {
+            "index": self.index, "list": self.list_apps, "launch": self.launch,
+            "settings": self.settings, "import": self.import_apps
+        }
+        self.conn: Optional[http.client.HTTPConnection] = None
+        self.samples: List[Sample] = []
+        self.record_after = 0.0
+
+    def run(self, warmup_until: float, deadline: float) -> List[Sample]:
+        self.record_after = warmup_until
+        while time.monotonic() < deadline:
+            self.scenarios[self.rng.choices(self.names, self.weights)[0]]()
+        if self.conn is not None:
+            self.conn.close()
+        return self.samples
+
+    def request(self, endpoint: str, method: str, path: str, body: Optional[Any] = None) -> Optional[bytes]:
+        """Send one request and record its latency under ``endpoint``; returns the body on success."""
+        headers = {"Accept-Encoding": "gzip"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        started = time.monotonic()
+        try:
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+            self.conn.request(method, path, body=payload, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            if self.conn is not None:
+                self.conn.close()
+            self.conn, data, status = None, None, 0
+        if started >= self.record_after:
+            self.samples.append((endpoint, status, time.monotonic() - started))
+        return data if 200 <= status < 400 else None
+
+    def _query(self) -> str:
+        sort, category = self.rng.choice(SORTS), self.rng.choice(CATEGORIES)
+        args = [f"sort={sort}"] if sort else []
+        if category:
+            args.append(f"category={category}")
+        if sort and self.rng.random() < 0.3:
+            args.append("order=desc")
+        return "&".join(args)
+
+    def index(self) -> None:
+        query = self._query()
+        self.request("GET /", "GET", f"/?{query}" if query else "/")
+
+    def list_apps(self) -> None:
+        query = "&".join(filter(None, (self._query(), "limit=50")))
+        data = self.request("GET /api/apps", "GET", f"/api/apps?{query}")
+        # Some users page on; bodies are gzipped, so only plain ones are followed
+        if data and self.rng.random() < 0.3 and data[:1] == b"{":
+            cursor = json.loads(data).get("nextCursor")
+            if cursor:
+                self.request("GET /api/apps", "GET", f"/api/apps?{query}&cursor={cursor}")
+
+    def launch(self) -> None:
+        pool = self.hot_ids if self.rng.random() < HOT_SHARE else self.app_ids
+        app_id = self.rng.choice(pool)
+        for _ in range(self.rng.randint(*LAUNCH_BURST)):
+            self.request("POST /api/apps/<id>/launch", "POST", f"/api/apps/{app_id}/launch", {})
+
+    def settings(self) -> None:
+        self.request("GET /api/settings", "GET", "/api/settings")
+
+    def import_apps(self) -> None:
+        # Re-imports existing apps, so the catalog keeps its size
+        apps = [
+            {"id": app_id, "name": f"Imported {app_id[:8]}", "category": self.rng.choice(CATEGORIES[2:]),
+             "iconUrl": "", "appStoreLink": ""}
+            for app_id in self.rng.sample(self.app_ids, min(IMPORT_SIZE, len(self.app_ids)))
+        ]
+        self.request("POST /api/apps/import", "POST", "/api/apps/import", {"apps": apps})
+
+def drive(port: int, app_ids: List[str], mix: Dict[str, float], clients: int, seed: int,
+          warmup_until: float, deadline: float) -> List[Sample]:
+    """Run ``clients`` client threads in this process and return their samples."""
+    workers = [Client(port, app_ids, mix, seed + i) for i in range(clients)]
+    results: List[List[Sample]] = [[] for _ in workers]
+
+    def run(index: int) -> None:
+        results[index] = workers[index].run(warmup_until, deadline)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [sample for samples in results for sample in samples]
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Any]:
+    """Per-endpoint and overall throughput, latency percentiles and error rate."""
+    groups: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        groups.setdefault(sample[0], []).append(sample)
+    groups["total"] = samples
+
+    summary = {}
+    for endpoint, group in groups.items():
+        latencies = sorted(latency * 1000 for _, _, latency in group)
+        errors = sum(1 for _, status, _ in group if not 200 <= status < 400)
+        summary[endpoint] = {
+            "requests": len(group),
+            "rps": round(len(group) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "errors": errors,
+            "error_rate": round(errors / len(group), 4) if group else 0.0
+        }
+    return summary
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    print(f"  {'endpoint':<30}{'requests':>9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for endpoint, stats in sorted(summary.items(), key=lambda item: item[0] == "total"):
+        print(f"  {endpoint:<30}{stats['requests']:>9}{stats['rps']:>9.1f}{stats['p50_ms']:>9.1f}"
+              f"{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['error_rate']:>8.1%}")
+
+def run_combination(args: argparse.Namespace, mix: Dict[str, float], workers: int, threads: int,
+                    log: Any) -> Dict[str, Any]:
+    """Start the stand-in and gunicorn, drive the mix, and shut both down."""
+    db_port, app_port = free_port(), free_port()
+    stand_in = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_postgrest", "--port", str(db_port),
+         "--latency-ms", str(args.latency_ms), "--apps", str(args.apps)],
+        stdout=log, stderr=subprocess.STDOUT
+    )
+    server = None
+    try:
+        rest_url = f"http://127.0.0.1:{db_port}/rest/v1"
+        wait_until_ready(f"{rest_url}/launcher_settings?select=id", stand_in, 30)
+        with urllib.request.urlopen(f"{rest_url}/launcher_apps?select=id&order=id") as response:
+            app_ids = [row["id"] for row in json.load(response)]
+
+        env = {
+            **os.environ,
+            "STORAGE_BACKEND": "supabase",
+            "SUPABASE_URL": f"http://127.0.0.1:{db_port}",
+            "SUPABASE_KEY": API_KEY
+        }
+        server = subprocess.Popen(
+            ["gunicorn", args.app, "--bind", f"127.0.0.1:{app_port}", "--workers", str(workers),
+             "--threads", str(threads), "--worker-class", args.worker_class,
+             "--backlog", "2048", "--log-level", "warning"],
+            env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+        wait_until_ready(f"http://127.0.0.1:{app_port}/api/settings", server, 60)
+
+        now = time.monotonic()
+        warmup_until, deadline = now + args.warmup, now + args.warmup + args.duration
+        processes = min(args.client_processes, args.clients)
+        per_process = [args.clients // processes + (i < args.clients % processes) for i in range(processes)]
+        with ProcessPoolExecutor(processes) as pool:
+            futures = [
+                pool.submit(drive, app_port, app_ids, mix, count, args.seed + 1000 * i, warmup_until, deadline)
+                for i, count in enumerate(per_process)
+            ]
+            samples = [sample for future in futures for sample in future.result()]
+        return summarize(samples, args.duration)
+    finally:
+        if server is not None:
+            stop(server)
+        stop(stand_in)
+
+def saturation_point(runs: List[Dict[str, Any]], tolerance: float) -> Dict[str, Any]:
+    """The smallest worker x thread count within ``tolerance`` of the best throughput."""
+    best = max(run["summary"]["total"]["rps"] for run in runs)
+    candidates = [run for run in runs if run["summary"]["total"]["rps"] >= best * (1 - tolerance)]
+    return min(candidates, key=lambda run: (run["workers"] * run["threads"], run["summary"]["total"]["p99_ms"]))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="main:app", help="gunicorn application (e.g. asgi:app)")
+    parser.add_argument("--worker-class", default="gthread",
+                        help="gunicorn worker class (uvicorn.workers.UvicornWorker for asgi:app)")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated gunicorn worker counts")
+    parser.add_argument("--threads", default="1,4,8", help="comma-separated threads per worker")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent simulated users")
+    parser.add_argument("--client-processes", type=int, default=min(4, os.cpu_count() or 1),
+                        help="processes the clients are spread over, so the driver isn't the bottleneck")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds per combination")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds before each run")
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="latency injected into every database round trip")
+    parser.add_argument("--apps", type=int, default=1000, help="apps seeded into the stand-in")
+    parser.add_argument("--mix", help="scenario weights, e.g. index=15,list=35,launch=25,settings=24,import=1")
+    parser.add_argument("--tolerance", type=float, default=0.05,
+                        help="throughput within this fraction of the best counts as saturated")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/loadtest-<commit>.json)")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    combinations = [(int(w), int(t)) for w in args.workers.split(",") for t in args.threads.split(",")]
+    runs: List[Dict[str, Any]] = []
+    with tempfile.NamedTemporaryFile("w+", prefix="loadtest-", suffix=".log", delete=False) as log:
+        print(f"Mix {mix}, {args.clients} clients, {args.latency_ms:g} ms per database call; "
+              f"server logs in {log.name}")
+        for workers, threads in combinations:
+            print(f"\nworkers={workers} threads={threads}", flush=True)
+            try:
+                summary = run_combination(args, mix, workers, threads, log)
+            except RuntimeError as e:
+                print(f"  failed: {e}")
+                continue
+            print_summary(summary)
+            runs.append({"workers": workers, "threads": threads, "summary": summary})
+
+    if not runs:
+        raise SystemExit("No combination completed")
+
+    print(f"\n{'workers':>8}{'threads':>8}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for run in runs:
+        total = run["summary"]["total"]
+        print(f"{run['workers']:>8}{run['threads']:>8}{total['rps']:>9.1f}{total['p50_ms']:>9.1f}"
+              f"{total['p99_ms']:>9.1f}{total['error_rate']:>8.1%}")
+    saturated = saturation_point(runs, args.tolerance)
+    print(f"\nSaturation point: {saturated['workers']} workers x {saturated['threads']} threads "
+          f"({saturated['summary']['total']['rps']:.1f} req/s, within {args.tolerance:.0%} of the best)")
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": current_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "app": args.app,
+            "worker_class": args.worker_class,
+            "clients": args.clients,
+            "duration": args.duration,
+            "latency_ms": args.latency_ms,
+            "apps": args.apps,
+            "mix": mix
+        },
+        "runs": runs,
+        "saturation": {"workers": saturated["workers"], "threads": saturated["threads"]}
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"loadtest-{report['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
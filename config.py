@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -8,25 +9,169 @@ class Config:
     # App configuration
     SECRET_KEY = os.urandom(24)
     DEBUG = os.getenv('FLASK_ENV') == 'development'
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG" if DEBUG else "INFO").upper()
+    
+    # Startup: optionally serve these paths in-process once a worker has loaded
+    # the app (gunicorn post_worker_init), so the first real request is warm
+    PREWARM = os.getenv("PREWARM", "false").lower() in ("1", "true", "yes")
+    PREWARM_PATHS = tuple(path for path in os.getenv("PREWARM_PATHS", "/,/api/bootstrap").split(",") if path)
     
     # Database configuration
     SUPABASE_URL = os.getenv("SUPABASE_URL")
     SUPABASE_KEY = os.getenv("SUPABASE_KEY")
     
+    # Storage backend: "supabase" (PostgREST) or "sqlite" (embedded, WAL mode)
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").lower()
+    SQLITE_PATH = os.getenv("SQLITE_PATH", "launcher.db")
+    
+    # Connection pool configuration (one shared pool per worker process)
+    SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "10"))
+    SUPABASE_POOL_KEEPALIVE = int(os.getenv("SUPABASE_POOL_KEEPALIVE", "10"))
+    SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+    SUPABASE_READ_TIMEOUT = float(os.getenv("SUPABASE_READ_TIMEOUT", "10"))
+    
+    # ASGI serving mode: threads per worker that run the Flask views next to its event loop
+    ASGI_THREADS = int(os.getenv("ASGI_THREADS", "32"))
+    
     # Table configuration
     TABLE_PREFIX = "launcher_"
     APPS_TABLE = TABLE_PREFIX + "apps"
     SETTINGS_TABLE = TABLE_PREFIX + "settings"
     CATEGORIES_TABLE = TABLE_PREFIX + "categories"
+    TOMBSTONES_TABLE = TABLE_PREFIX + "app_tombstones"
+    LAUNCHES_TABLE = TABLE_PREFIX + "app_launches"
+    
+    # Columns of the apps table, in API response order
+    APP_COLUMNS = (
+        "id", "name", "category", "icon_url", "app_store_link",
+        "launch_count", "last_modified", "last_launched"
+    )
     
     # App defaults
     DEFAULT_ICON_SIZE = 60
     DEFAULT_CATEGORY = "uncategorized"
     
+    # Cache configuration
+    CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "128"))
+    
+    # Rendered-output cache: whole index pages (with a gzip variant) and per-app cards
+    RENDER_CACHE_TTL = float(os.getenv("RENDER_CACHE_TTL", "300"))
+    PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "32"))
+    PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    CARD_CACHE_MAX_ENTRIES = int(os.getenv("CARD_CACHE_MAX_ENTRIES", "20000"))
+    CARD_CACHE_MAX_BYTES = int(os.getenv("CARD_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    RENDER_GZIP_LEVEL = 6
+    
+    # Catalog snapshot: apps, categories and settings in one memory-mapped file
+    # shared by every worker process (a tmpfs path keeps it in RAM). Rebuilt from
+    # the database when older than SNAPSHOT_MAX_AGE seconds
+    SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "false").lower() in ("1", "true", "yes")
+    SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", os.path.join(
+        "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "launcher-catalog.snapshot"
+    ))
+    SNAPSHOT_MAX_AGE = float(os.getenv("SNAPSHOT_MAX_AGE", "300"))
+    
+    # Listing configuration: columns the database may sort by, and page bounds
+    SORTABLE_COLUMNS = ("name", "category", "launch_count", "last_modified")
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+    
+    # Page loading: concurrent fetches behind / and /api/bootstrap
+    PAGE_LOADER_WORKERS = int(os.getenv("PAGE_LOADER_WORKERS", "8"))
+    PAGE_LOAD_TIMEOUT = float(os.getenv("PAGE_LOAD_TIMEOUT", "8"))
+    
+    # Delta sync: changes are re-sent from this many seconds before a token to
+    # cover clock skew and buffered launches; tombstones older than the retention
+    # window are purged and older tokens get a full resync
+    SYNC_OVERLAP_SECONDS = float(os.getenv("SYNC_OVERLAP_SECONDS", "10"))
+    TOMBSTONE_RETENTION_DAYS = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+    
+    # Export configuration: rows fetched per page and bytes per write while streaming
+    EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "1000"))
+    EXPORT_CHUNK_BYTES = 64 * 1024
+    
+    # Bulk import configuration
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "200"))
+    IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(256 * 1024 * 1024)))
+    IMPORT_MAX_REPORTED_ROWS = 1000
+    
+    # Typeahead search (GET /api/apps/search): result limits, and the longest an
+    # in-process index is used before it is rebuilt from the catalog
+    SEARCH_DEFAULT_LIMIT = int(os.getenv("SEARCH_DEFAULT_LIMIT", "10"))
+    SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "50"))
+    SEARCH_INDEX_MAX_AGE = float(os.getenv("SEARCH_INDEX_MAX_AGE", "300"))
+    
+    # Bulk mutations (POST /api/apps/batch): IDs per update/delete query, and per request
+    BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "200"))
+    BATCH_MAX_IDS = int(os.getenv("BATCH_MAX_IDS", "5000"))
+    
+    # Popularity ranking (sort=popular): launches are rolled up per app and hour,
+    # and each counts 2^(-age / half-life). The top POPULARITY_TOP_K apps are
+    # ranked in memory; scores are re-read from the database every
+    # POPULARITY_REFRESH_SECONDS to pick up other workers' launches. Reads skip
+    # rollup rows older than the retention window; each worker purges them after
+    # writing launches, at most once every POPULARITY_PURGE_INTERVAL seconds
+    POPULARITY_HALF_LIFE_HOURS = float(os.getenv("POPULARITY_HALF_LIFE_HOURS", "72"))
+    POPULARITY_TOP_K = int(os.getenv("POPULARITY_TOP_K", "100"))
+    POPULARITY_REFRESH_SECONDS = float(os.getenv("POPULARITY_REFRESH_SECONDS", "300"))
+    POPULARITY_RETENTION_DAYS = int(os.getenv("POPULARITY_RETENTION_DAYS", "30"))
+    POPULARITY_PURGE_INTERVAL = float(os.getenv("POPULARITY_PURGE_INTERVAL", "3600"))
+    
+    # Category facets (GET /api/categories/facets): per-category app counts are
+    # kept current from this worker's writes and re-read from the database when
+    # the catalog version shows another worker's, or after this many seconds
+    FACETS_MAX_AGE = float(os.getenv("FACETS_MAX_AGE", "300"))
+    
+    # Database functions (see supabase_schema.sql); launch counting may be
+    # fronted by a write-behind buffer
+    INCREMENT_LAUNCH_FN = "increment_launch_count"
+    INCREMENT_LAUNCHES_FN = "increment_launch_counts"
+    CATALOG_VERSION_FN = "catalog_version"
+    POPULARITY_FN = "app_popularity"
+    CATEGORY_FACETS_FN = "category_facets"
+    LAUNCH_WRITE_BEHIND = os.getenv("LAUNCH_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+    LAUNCH_FLUSH_INTERVAL = float(os.getenv("LAUNCH_FLUSH_INTERVAL", "5"))
+    LAUNCH_FLUSH_THRESHOLD = int(os.getenv("LAUNCH_FLUSH_THRESHOLD", "100"))
+    # Only apps in the catalog are buffered, and at most this many at once
+    LAUNCH_MAX_PENDING_APPS = int(os.getenv("LAUNCH_MAX_PENDING_APPS", "10000"))
+    
+    # Icon proxy: icons are fetched once, downscaled to the nearest size bucket
+    # (covering 2x the 24-96px icon sizes) and kept in a size-capped disk cache
+    ICON_CACHE_DIR = os.getenv("ICON_CACHE_DIR", "icon_cache")
+    ICON_CACHE_MAX_BYTES = int(os.getenv("ICON_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    ICON_SIZES = tuple(int(size) for size in os.getenv("ICON_SIZES", "24,48,64,96,128,192").split(","))
+    ICON_FETCH_TIMEOUT = float(os.getenv("ICON_FETCH_TIMEOUT", "5"))
+    # Icons of edited apps are prefetched on a pool of their own, so slow icon
+    # origins never hold up page loads; prefetches beyond the backlog are skipped
+    ICON_PREFETCH_WORKERS = int(os.getenv("ICON_PREFETCH_WORKERS", "2"))
+    ICON_PREFETCH_MAX_PENDING = 32
+    ICON_MAX_SOURCE_BYTES = 5 * 1024 * 1024
+    ICON_MAX_REDIRECTS = 3
+    # Icon URLs come from clients: only fetch from public addresses unless allowed
+    ICON_ALLOW_PRIVATE_HOSTS = os.getenv("ICON_ALLOW_PRIVATE_HOSTS", "false").lower() in ("1", "true", "yes")
+    ICON_MAX_AGE = 365 * 24 * 3600
+    
+    # Instrumentation: latency histograms at /metrics and Server-Timing headers
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    
+    # JSON encoding: "auto" uses orjson when it is installed, "json" forces the stdlib encoder
+    JSON_ENCODER = os.getenv("JSON_ENCODER", "auto").lower()
+    
+    # Response compression: JSON and text bodies of at least COMPRESS_MIN_SIZE bytes
+    # are sent with brotli (when the brotli package is installed) or gzip, as the
+    # client accepts. Compressed bodies of responses with a catalog ETag are cached
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "true").lower() in ("1", "true", "yes")
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+    COMPRESS_CACHE_MAX_ENTRIES = int(os.getenv("COMPRESS_CACHE_MAX_ENTRIES", "256"))
+    COMPRESS_CACHE_MAX_BYTES = int(os.getenv("COMPRESS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    
     # API configuration
     APP_STORE_URL_PREFIX = "https://apps.apple.com/"
     
     @classmethod
     def get_supabase_client(cls):
-        from supabase import create_client
-        return create_client(cls.SUPABASE_URL, cls.SUPABASE_KEY) 
\ No newline at end of file
+        """Return the process-wide database client shared by every route and service."""
+        from src.services.client_registry import registry
+        return registry.get()
@@ -0,0 +1,14 @@
+# Loaded automatically by gunicorn from the working directory
+
+
+def post_worker_init(worker):
+    """Pre-warm each worker after it has loaded the app and before it accepts requests.
+
+    ASGI workers (``-k uvicorn.workers.UvicornWorker asgi:app``) pre-warm in
+    their lifespan startup instead, on the worker's event loop.
+    """
+    from flask import Flask
+    from app import prewarm_app
+
+    if isinstance(worker.wsgi, Flask):
+        prewarm_app(worker.wsgi)
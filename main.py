@@ -1,4 +1,5 @@
-from app import app
+from app import app, prewarm_app
 
 if __name__ == "__main__":
+    prewarm_app(app)
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -5,5 +5,7 @@ Routes package containing all API endpoints.
 from . import apps
 from . import settings
 from . import categories
+from . import bootstrap
+from . import icons
 
-__all__ = ['apps', 'settings', 'categories'] 
\ No newline at end of file
+__all__ = ['apps', 'settings', 'categories', 'bootstrap', 'icons'] 
\ No newline at end of file
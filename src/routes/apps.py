@@ -1,42 +1,47 @@
+import json
+import logging
 import uuid
-from flask import Blueprint, request, jsonify
-from ..services.database import DatabaseService
+from datetime import datetime
+from typing import Any, Iterable
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from ..services.cache import CachedDatabaseService
 from ..services.data_processing import DataProcessor
+from ..services.icon_cache import icon_cache
+from ..services.importer import ImportReport, import_in_batches
+from ..services.launch_counter import LaunchCounter
 from ..models.exceptions import AppError
+from ..utils.conditional import conditional_response
+from ..utils.json_stream import JsonArrayReader, iter_ndjson, read_body
+from ..utils.streaming import batched, gzip_stream, json_array, ndjson_lines
 from config import Config
 
+logger = logging.getLogger(__name__)
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonlines')
+
 # Initialize blueprint
 bp = Blueprint('apps', __name__, url_prefix='/api/apps')
 
 # Initialize services
-db = DatabaseService(Config.get_supabase_client())
+db = CachedDatabaseService()
 processor = DataProcessor()
+launch_counter = LaunchCounter(
+    db,
+    flush_interval=Config.LAUNCH_FLUSH_INTERVAL,
+    flush_threshold=Config.LAUNCH_FLUSH_THRESHOLD,
+    max_pending=Config.LAUNCH_MAX_PENDING_APPS
+) if Config.LAUNCH_WRITE_BEHIND else None
 
 @bp.route('', methods=['GET'])
+@conditional_response(db)
 def get_apps():
     """Get all apps with optional filtering."""
     try:
-        # Get filter parameters
-        category = request.args.get('category')
-        sort_by = request.args.get('sort')
-        order = request.args.get('order', 'asc')
-        
-        # Build filters
-        filters = {}
-        if category:
-            filters['category'] = category.lower()
-        
-        # Get apps from database
-        apps = db.get_apps(filters)
-        
-        # Sort apps if requested
-        if sort_by:
-            reverse = order.lower() == 'desc'
-            apps.sort(key=lambda x: x.get(processor.camel_to_snake(sort_by), ''), reverse=reverse)
+        # Sorting and pagination happen in the database
+        page = db.get_apps_page(**processor.validate_list_args(request.args))
         
-        # Format response
-        formatted_apps = [processor.format_app_response(app) for app in apps]
-        return jsonify({"apps": formatted_apps})
+        # Encode rows straight to JSON, skipping the intermediate response dicts
+        return Response(processor.page_to_json(page), mimetype='application/json')
     
     except Exception as e:
         raise AppError(f"Failed to get apps: {str(e)}")
@@ -57,7 +62,98 @@ def create_app():
     except Exception as e:
         raise AppError(f"Failed to create app: {str(e)}")
 
+@bp.route('/batch', methods=['POST'])
+def batch_apps():
+    """Delete, recategorize or update many apps in one request.
+
+    Each operation runs as one query per ``BATCH_CHUNK_SIZE`` IDs and the
+    caches are invalidated once. The response counts each outcome and gives
+    every ID's status (``updated``, ``deleted``, ``missing`` or ``error``) per
+    operation.
+    """
+    try:
+        operations = processor.validate_batch(request.json)
+        return jsonify({"status": "success", **db.batch_apps(operations)})
+    
+    except AppError as e:
+        raise AppError(f"Failed to apply batch: {e.message}", e.status_code)
+    except Exception as e:
+        raise AppError(f"Failed to apply batch: {str(e)}")
+
+@bp.route('/search', methods=['GET'])
+def search_apps():
+    """Typeahead search: apps whose name, a word of it or category starts with ``q``.
+
+    Answered from the in-process search index, so keystrokes don't reach the
+    database; fuzzy matches fill the results when prefixes find too few.
+    """
+    try:
+        query, limit = processor.validate_search_args(request.args)
+        results = db.search_apps(query, limit) if query else []
+        return jsonify({"query": query, "apps": [processor.snake_to_camel_dict(r) for r in results]})
+    
+    except Exception as e:
+        raise AppError(f"Failed to search apps: {str(e)}")
+
+@bp.route('/changes', methods=['GET'])
+@conditional_response(db)
+def get_changes():
+    """Get apps changed since a sync token, plus IDs of deleted apps.
+
+    Without ``since`` (or with an expired token) the whole catalog is returned
+    and ``reset`` is true. Clients store ``token`` and pass it as ``since`` on
+    the next call.
+    """
+    try:
+        changes = db.get_changes(request.args.get('since'))
+        return Response(processor.changes_to_json(changes), mimetype='application/json')
+    
+    except Exception as e:
+        raise AppError(f"Failed to get changes: {str(e)}")
+
+@bp.route('/export', methods=['GET'])
+def export_apps():
+    """Stream the whole catalog as a download.
+
+    Rows are fetched page by page and formatted as they are written, so server
+    memory stays flat and the first bytes go out before the catalog is read.
+    ``format`` is ``json`` (default, ``{"apps": [...]}``) or ``ndjson``; the
+    body is gzipped when the client accepts it unless ``compress=none``.
+    """
+    export_format = request.args.get('format', 'json').lower()
+    if export_format not in ('json', 'ndjson'):
+        raise AppError("Export format must be json or ndjson")
+    use_gzip = request.args.get('compress') != 'none' and bool(request.accept_encodings['gzip'])
+    
+    def generate():
+        rows = db.iter_apps()
+        if export_format == 'ndjson':
+            chunks = ndjson_lines(rows, processor.app_to_json)
+        else:
+            chunks = json_array(rows, processor.app_to_json, "apps")
+        chunks = batched(chunks, Config.EXPORT_CHUNK_BYTES)
+        if use_gzip:
+            chunks = gzip_stream(chunks)
+        try:
+            yield from chunks
+        except Exception as e:
+            # Headers are already sent; the truncated body is the only signal left
+            logger.error(f"Export aborted: {e}")
+    
+    extension = 'ndjson' if export_format == 'ndjson' else 'json'
+    filename = f"app_gallery_export_{datetime.utcnow().date().isoformat()}.{extension}"
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson' if export_format == 'ndjson' else 'application/json'
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['Vary'] = 'Accept-Encoding'
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
 @bp.route('/<app_id>', methods=['GET'])
+@conditional_response(db)
 def get_app(app_id):
     """Get a single app by ID."""
     try:
@@ -75,8 +171,12 @@ def update_app(app_id):
     """Update an existing app."""
     try:
         app_data = processor.validate_app_data(request.json, for_update=True)
+        previous = db.get_app_by_id(app_id) if "icon_url" in app_data else None
         updated_app = db.update_app(app_id, app_data)
         
+        if previous and previous.get("icon_url") and previous["icon_url"] != updated_app.get("icon_url"):
+            icon_cache.replace(previous["icon_url"], updated_app.get("icon_url"))
+        
         return jsonify({
             "status": "success",
             "app": processor.format_app_response(updated_app)
@@ -99,6 +199,11 @@ def delete_app(app_id):
 def launch_app(app_id):
     """Increment app launch count."""
     try:
+        if launch_counter:
+            # Write-behind mode: buffer the launch and answer without a DB round trip
+            pending = launch_counter.record(app_id)
+            return jsonify({"status": "success", "queued": True, "pending": pending})
+        
         updated_app = db.increment_launch_count(app_id)
         return jsonify({
             "status": "success",
@@ -110,42 +215,51 @@ def launch_app(app_id):
 
 @bp.route('/import', methods=['POST'])
 def import_apps():
-    """Import apps from JSON data."""
+    """Import apps from a streamed request body.
+
+    The body may be a JSON array, an ``{"apps": [...]}`` object or NDJSON
+    (``Content-Type: application/x-ndjson``), optionally gzipped. Rows are
+    parsed incrementally and written in fixed-size batches, so memory is
+    bounded by the batch size rather than the file size. Send
+    ``Accept: application/x-ndjson`` (or ``?progress=1``) to receive a progress
+    line after every batch followed by the final report.
+    """
+    report = ImportReport(full=request.args.get('report') == 'full')
     try:
-        data = request.json
-        apps_to_import = data.get("apps", []) if isinstance(data, dict) else data
-        
-        if not isinstance(apps_to_import, list):
-            raise AppError("Invalid data format - expected array of apps")
+        if request.content_length and request.content_length > Config.IMPORT_MAX_BYTES:
+            raise AppError(f"Import body exceeds the {Config.IMPORT_MAX_BYTES} byte limit", 413)
         
-        imported_count = 0
-        updated_count = 0
+        chunks = read_body(request.stream, Config.IMPORT_MAX_BYTES)
+        rows: Iterable[Any]
+        if request.mimetype in NDJSON_MIMETYPES:
+            rows = iter_ndjson(chunks)
+        else:
+            rows = JsonArrayReader(chunks, key="apps")
+        batches = import_in_batches(db, rows, report)
         
-        for app in apps_to_import:
-            try:
-                app_data = processor.validate_app_data(app)
-                
-                if "id" in app:
-                    # Update existing app
-                    if db.get_app_by_id(app["id"]):
-                        db.update_app(app["id"], app_data)
-                        updated_count += 1
-                        continue
-                
-                # Create new app
-                app_data["id"] = str(uuid.uuid4())
-                db.create_app(app_data)
-                imported_count += 1
-                
-            except Exception as e:
-                continue  # Skip invalid apps
+        if request.args.get('progress') or request.accept_mimetypes.best == 'application/x-ndjson':
+            return Response(
+                stream_with_context(_import_progress(batches, report)),
+                mimetype='application/x-ndjson'
+            )
         
-        return jsonify({
-            "status": "success",
-            "imported": imported_count,
-            "updated": updated_count,
-            "total": len(apps_to_import)
-        })
+        for progress in batches:
+            logger.debug(f"Import progress: {progress.progress()}")
+        return jsonify({"status": "success", **report.to_dict()})
     
+    except AppError as e:
+        raise AppError(f"Import failed after {report.total} rows: {e.message}", e.status_code)
+    except Exception as e:
+        raise AppError(f"Import failed after {report.total} rows: {str(e)}")
+
+def _import_progress(batches, report: ImportReport):
+    """Yield one NDJSON progress line per batch, then the final report."""
+    try:
+        for progress in batches:
+            yield json.dumps({"status": "progress", **progress.progress()}) + "\n"
+        yield json.dumps({"status": "success", **report.to_dict()}) + "\n"
     except Exception as e:
-        raise AppError(f"Import failed: {str(e)}") 
\ No newline at end of file
+        # Headers are already sent, so the failure is reported in-band
+        message = e.message if isinstance(e, AppError) else str(e)
+        logger.error(f"Import failed after {report.total} rows: {message}")
+        yield json.dumps({"status": "error", "error": message, **report.to_dict()}) + "\n"
@@ -0,0 +1,21 @@
+from flask import Blueprint, request, jsonify
+from ..services.cache import CachedDatabaseService
+from ..services.page_loader import PageLoader
+from ..models.exceptions import AppError
+from ..utils.conditional import conditional_response
+
+# Initialize blueprint
+bp = Blueprint('bootstrap', __name__, url_prefix='/api/bootstrap')
+
+# Initialize services
+db = CachedDatabaseService()
+loader = PageLoader(db)
+
+@bp.route('', methods=['GET'])
+@conditional_response(db)
+def get_bootstrap():
+    """Get apps, settings and categories for the page in one request."""
+    try:
+        return jsonify(loader.page_data(request.args))
+    except Exception as e:
+        raise AppError(f"Failed to load page data: {str(e)}")
@@ -1,17 +1,18 @@
-from flask import Blueprint, request, jsonify
-from ..services.database import DatabaseService
+from flask import Blueprint, Response, request, jsonify
+from ..services.cache import CachedDatabaseService
 from ..services.data_processing import DataProcessor
 from ..models.exceptions import AppError
-from config import Config
+from ..utils.conditional import conditional_response
 
 # Initialize blueprint
 bp = Blueprint('categories', __name__, url_prefix='/api/categories')
 
 # Initialize services
-db = DatabaseService(Config.get_supabase_client())
+db = CachedDatabaseService()
 processor = DataProcessor()
 
 @bp.route('', methods=['GET'])
+@conditional_response(db)
 def get_categories():
     """Get all categories."""
     try:
@@ -20,11 +21,21 @@ def get_categories():
     except Exception as e:
         raise AppError(f"Failed to get categories: {str(e)}")
 
+@bp.route('/facets', methods=['GET'])
+@conditional_response(db)
+def get_category_facets():
+    """Get every category with its app count and newest app modification."""
+    try:
+        facets = db.get_category_facets()
+        return jsonify({"categories": processor.format_facets(facets)})
+    except Exception as e:
+        raise AppError(f"Failed to get category facets: {str(e)}")
+
 @bp.route('', methods=['POST'])
 def add_category():
     """Add a new category."""
     try:
-        category_name = request.json.get("name")
+        category_name = (request.json or {}).get("name")
         if not category_name:
             raise AppError("Category name is required")
         
@@ -39,11 +50,11 @@ def add_category():
         raise AppError(f"Failed to add category: {str(e)}")
 
 @bp.route('/<category>/apps', methods=['GET'])
+@conditional_response(db)
 def get_apps_by_category(category):
     """Get all apps in a category."""
     try:
         apps = db.get_apps({"category": category.lower()})
-        formatted_apps = [processor.format_app_response(app) for app in apps]
-        return jsonify({"apps": formatted_apps})
+        return Response('{"apps":%s}' % processor.apps_to_json(apps), mimetype='application/json')
     except Exception as e:
         raise AppError(f"Failed to get apps for category {category}: {str(e)}") 
\ No newline at end of file
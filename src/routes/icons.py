@@ -0,0 +1,53 @@
+from flask import Blueprint, Response, request, url_for
+from ..services.cache import CachedDatabaseService
+from ..services.icon_cache import icon_cache
+from ..models.exceptions import AppError
+from config import Config
+
+# Initialize blueprint
+bp = Blueprint('icons', __name__, url_prefix='/icons')
+
+# Initialize services
+db = CachedDatabaseService()
+
+@bp.app_template_global()
+def icon_src(app, size):
+    """Return the proxied URL of an app's icon at ``size`` pixels, or '' if it has none."""
+    icon_url = app.get("iconUrl")
+    if not icon_url:
+        return ""
+    return url_for('icons.get_icon', app_id=app["id"], size=icon_cache.bucket(int(size)),
+                   v=icon_cache.version(icon_url))
+
+@bp.route('/<app_id>/<int:size>', methods=['GET'])
+def get_icon(app_id, size):
+    """Serve an app's icon downscaled to the nearest size bucket.
+
+    ``v`` is the icon URL's hash (see ``icon_src``). When it matches, the
+    response never changes and is served as immutable; a cached file for that
+    hash is served without touching the database.
+    """
+    bucket = icon_cache.bucket(size)
+    version = request.args.get('v')
+
+    cached = icon_cache.lookup(version, bucket) if version else None
+    if cached is None:
+        app = db.get_app_by_id(app_id)
+        if not app or not app.get("icon_url"):
+            raise AppError(f"No icon for app {app_id}", 404)
+        if version and version != icon_cache.version(app["icon_url"]):
+            version = None
+        cached = icon_cache.get(app["icon_url"], bucket)
+
+    data, key = cached
+    response = Response(data, mimetype="image/png")
+    response.set_etag(key)
+    # Icons are always re-encoded PNGs; never let a browser treat one as a document
+    response.headers['X-Content-Type-Options'] = "nosniff"
+    response.headers['Content-Security-Policy'] = "default-src 'none'; sandbox"
+    if version:
+        response.headers['Cache-Control'] = f"public, max-age={Config.ICON_MAX_AGE}, immutable"
+    else:
+        # Unversioned URLs follow icon_url changes, so revalidate every time
+        response.headers['Cache-Control'] = "public, no-cache"
+    return response.make_conditional(request)
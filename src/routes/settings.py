@@ -1,55 +1,24 @@
 from flask import Blueprint, request, jsonify
-from datetime import datetime
-from ..services.database import DatabaseService
+from ..services.cache import CachedDatabaseService
+from ..services.data_processing import DataProcessor
 from ..models.exceptions import AppError
-from config import Config
+from ..utils.conditional import conditional_response
 
 # Initialize blueprint
 bp = Blueprint('settings', __name__, url_prefix='/api/settings')
 
 # Initialize services
-db = DatabaseService(Config.get_supabase_client())
-
-def validate_settings(settings):
-    """Validate settings data."""
-    if "iconSize" in settings:
-        try:
-            icon_size = int(settings["iconSize"])
-            if not (24 <= icon_size <= 96):
-                raise AppError("Icon size must be between 24 and 96 pixels")
-        except ValueError:
-            raise AppError("Invalid icon size value")
-    
-    # Add more validation as needed
-    return settings
+db = CachedDatabaseService()
+processor = DataProcessor()
 
 @bp.route('', methods=['GET'])
+@conditional_response(db)
 def get_settings():
     """Get current settings."""
     try:
-        response = db.client.table(Config.SETTINGS_TABLE).select("*").execute()
-        if not response.data:
-            # Create default settings
-            default_settings = {
-                "metadata": {
-                    "lastUpdated": datetime.utcnow().isoformat(),
-                    "version": "1.0"
-                },
-                "settings": {
-                    "gridGap": "5",
-                    "gridPadding": "0",
-                    "iconSize": Config.DEFAULT_ICON_SIZE,
-                    "theme": "dark",
-                    "appNameColor": "#ffffff",
-                    "paddingX": "2",
-                    "paddingY": "6",
-                    "safeAreaTop": "0"
-                }
-            }
-            response = db.client.table(Config.SETTINGS_TABLE).insert(default_settings).execute()
-            return jsonify(default_settings)
-        
-        return jsonify(response.data[0])
+        # Default settings are saved on first read
+        settings, _ = db.get_or_create_settings()
+        return jsonify(settings)
     except Exception as e:
         raise AppError(f"Failed to get settings: {str(e)}")
 
@@ -57,30 +26,15 @@ def get_settings():
 def update_settings():
     """Update settings."""
     try:
-        # Get current settings first
-        current = db.client.table(Config.SETTINGS_TABLE).select("*").execute()
-        if not current.data:
-            raise AppError("Settings not found")
-        
-        settings_data = current.data[0]
-        new_settings = request.json
-        
         # Validate new settings
-        validated_settings = validate_settings(new_settings)
-        
-        # Update settings
-        settings_data["settings"].update(validated_settings)
-        settings_data["metadata"]["lastUpdated"] = datetime.utcnow().isoformat()
+        validated_settings = processor.validate_settings(request.json)
         
-        # Save to database
-        response = db.client.table(Config.SETTINGS_TABLE)\
-            .update(settings_data)\
-            .eq("id", settings_data["id"])\
-            .execute()
+        # Merge into the saved settings
+        updated = db.update_settings(validated_settings)
         
         return jsonify({
             "status": "success",
-            "settings": response.data[0]["settings"]
+            "settings": updated["settings"]
         })
     except Exception as e:
         raise AppError(f"Failed to update settings: {str(e)}")
@@ -89,38 +43,11 @@ def update_settings():
 def reset_settings():
     """Reset settings to defaults."""
     try:
-        default_settings = {
-            "metadata": {
-                "lastUpdated": datetime.utcnow().isoformat(),
-                "version": "1.0"
-            },
-            "settings": {
-                "gridGap": "5",
-                "gridPadding": "0",
-                "iconSize": Config.DEFAULT_ICON_SIZE,
-                "theme": "dark",
-                "appNameColor": "#ffffff",
-                "paddingX": "2",
-                "paddingY": "6",
-                "safeAreaTop": "0"
-            }
-        }
-        
-        # Get current settings to get the ID
-        current = db.client.table(Config.SETTINGS_TABLE).select("*").execute()
-        if current.data:
-            # Update existing settings
-            response = db.client.table(Config.SETTINGS_TABLE)\
-                .update(default_settings)\
-                .eq("id", current.data[0]["id"])\
-                .execute()
-        else:
-            # Create new settings
-            response = db.client.table(Config.SETTINGS_TABLE).insert(default_settings).execute()
+        reset = db.reset_settings()
         
         return jsonify({
             "status": "success",
-            "settings": response.data[0]["settings"]
+            "settings": reset["settings"]
         })
     except Exception as e:
         raise AppError(f"Failed to reset settings: {str(e)}") 
\ No newline at end of file
@@ -4,5 +4,6 @@ Services package containing business logic and data access layers.
 
 from .database import DatabaseService
 from .data_processing import DataProcessor
+from .cache import CachedDatabaseService, TTLCache, catalog_cache
 
-__all__ = ['DatabaseService', 'DataProcessor'] 
\ No newline at end of file
+__all__ = ['DatabaseService', 'DataProcessor', 'CachedDatabaseService', 'TTLCache', 'catalog_cache'] 
\ No newline at end of file
@@ -0,0 +1,391 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+from .catalog_indexes import CatalogIndexes
+from .database import DatabaseService
+from .facets import group_facets
+from .popularity import POPULAR_SORT, popular_page, popular_start
+from .snapshot import LAUNCH_COLUMNS, SnapshotCatalog, SnapshotStore, get_snapshot_store
+from config import Config
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL.
+
+    Entries are bounded by count and, when a ``weigher`` is given, by their
+    total weight (e.g. bytes) as well.
+    """
+
+    def __init__(self, ttl: float, max_entries: int,
+                 weigher: Optional[Callable[[Any], int]] = None, max_weight: int = 0):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.weigher = weigher
+        self.max_weight = max_weight
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) for a key, dropping it if it has expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value, weight = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self._weight -= weight
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Store a value, evicting the least recently used entries past the size bound.
+
+        When ``generation`` is given the value is only stored if the cache has not
+        been cleared since that generation was read, so a load that raced with a
+        write never re-populates the cache with stale data.
+        """
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        weight = self.weigher(value) if self.weigher else 0
+        if self.weigher and weight > self.max_weight:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._weight -= previous[2]
+            self._entries[key] = (time.monotonic() + self.ttl, value, weight)
+            self._weight += weight
+            while len(self._entries) > self.max_entries or (self.weigher and self._weight > self.max_weight):
+                _, (_, _, evicted_weight) = self._entries.popitem(last=False)
+                self._weight -= evicted_weight
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for a key, calling the loader on a miss."""
+        found, value = self.get(key)
+        if found:
+            return value
+        generation = self._generation
+        value = loader()
+        self.set(key, value, generation)
+        return value
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every ``clear`` and ``discard``; pass it back to ``set``."""
+        return self._generation
+
+    def clear(self) -> None:
+        """Drop every entry and invalidate any load currently in flight."""
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+            self._generation += 1
+            self.invalidations += 1
+
+    def discard(self, stale: Callable[[Hashable, Any], bool]) -> None:
+        """Drop the entries ``stale(key, value)`` picks and invalidate any load currently in flight."""
+        with self._lock:
+            for key in [key for key, (_, value, _) in self._entries.items() if stale(key, value)]:
+                self._weight -= self._entries.pop(key)[2]
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "weight": self._weight,
+                "ttl": self.ttl
+            }
+
+def launch_stale(app_ids: Set[str]) -> Callable[[Hashable, Any], bool]:
+    """Pick the catalog cache entries that launches of ``app_ids`` made stale, for ``TTLCache.discard``.
+
+    A launch moves only an app's launch count and time: categories and facets
+    are kept, and so are lists that hold none of the launched apps, unless
+    they are sorted or filtered by a launch column.
+    """
+    def launch_filtered(filters_key: Tuple) -> bool:
+        return any(column in LAUNCH_COLUMNS for column, _ in filters_key)
+
+    def stale(key: Hashable, value: Any) -> bool:
+        if not isinstance(key, tuple):
+            return True
+        kind = key[0]
+        if kind in ("categories", "facets"):
+            return False
+        if kind == "app":
+            return key[1] in app_ids
+        if kind == "ranked":
+            return not app_ids.isdisjoint(key[1])
+        if kind == "apps":
+            return launch_filtered(key[1]) or any(app["id"] in app_ids for app in value)
+        if kind == "page":
+            return (key[2] in LAUNCH_COLUMNS or launch_filtered(key[1])
+                    or any(app["id"] in app_ids for app in value["apps"]))
+        return True
+
+    return stale
+
+# Process-wide cache shared by every CachedDatabaseService instance so that a
+# write through any blueprint invalidates reads served by all the others.
+catalog_cache = TTLCache(Config.CACHE_TTL_SECONDS, Config.CACHE_MAX_ENTRIES)
+
+class CachedDatabaseService(DatabaseService):
+    """DatabaseService with a read-through cache for apps and categories.
+
+    With ``SNAPSHOT_ENABLED`` reads are answered from the catalog snapshot
+    shared by all worker processes instead of the database, cache keys carry
+    the snapshot version so every worker sees a write as soon as it is
+    published, and writes publish their rows to the snapshot. Writes also
+    keep the in-process search index, popularity ranking and category facets
+    (``CatalogIndexes``) current.
+    """
+
+    def __init__(self, client: Optional[Any] = None, cache: Optional[TTLCache] = None,
+                 snapshot: Optional[SnapshotStore] = None, indexes: Optional[CatalogIndexes] = None):
+        super().__init__(client)
+        self.cache = cache if cache is not None else catalog_cache
+        store = snapshot if snapshot is not None else get_snapshot_store()
+        self.snapshot = SnapshotCatalog(store) if store is not None else None
+        self.reader = self.snapshot.reader if self.snapshot is not None else None
+        self.indexes = indexes if indexes is not None else CatalogIndexes()
+
+    @staticmethod
+    def _filters_key(filters: Optional[Dict[str, Any]]) -> Tuple:
+        """Build a hashable cache key from a filter set."""
+        return tuple(sorted((filters or {}).items()))
+
+    def _key(self, *parts: Any) -> Tuple:
+        """Build a cache key, scoped to the current snapshot version when there is one."""
+        return self.snapshot.scope(parts) if self.snapshot is not None else parts
+
+    def _publish(self, stale: Optional[Callable[[Hashable, Any], bool]] = None, **changes: Any) -> None:
+        """Publish a write's changes, to the snapshot if there is one, and invalidate cached reads.
+
+        Every cached read is dropped unless ``stale`` picks the ones the write affected.
+        """
+        if self.snapshot is not None and changes:
+            self.snapshot.publish(**changes)
+        if stale is None:
+            self.cache.clear()
+        else:
+            self.cache.discard(stale)
+
+    def _rebuild(self, after: str) -> None:
+        """Republish from the database after a write whose rows aren't known, and drop cached reads.
+
+        The search index and category facets are rebuilt on their next use.
+        """
+        self.indexes.invalidate()
+        if self.snapshot is not None:
+            self.snapshot.rebuild(after)
+        self.cache.clear()
+
+    def get_apps(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """Get all apps with optional filtering, served from the cache when fresh."""
+        load = self.reader.get_apps if self.reader else super().get_apps
+        apps = self.cache.get_or_load(self._key("apps", self._filters_key(filters)), lambda: load(filters))
+        # Hand out a new list so callers sorting in place don't reorder the cached one
+        return list(apps)
+
+    def get_apps_page(self, filters: Optional[Dict[str, Any]] = None, sort: Optional[str] = None,
+                      descending: bool = False, limit: Optional[int] = None,
+                      cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Get a sorted page of apps, served from the cache when fresh.
+
+        ``sort="popular"`` ranks apps by recent launches instead (see ``_popular_page``).
+        """
+        if sort == POPULAR_SORT:
+            return self._popular_page(filters, limit, cursor)
+        load = self.reader.get_apps_page if self.reader else super().get_apps_page
+        key = self._key("page", self._filters_key(filters), sort, descending, limit, cursor)
+        page = self.cache.get_or_load(key, lambda: load(filters, sort, descending, limit, cursor))
+        return {**page, "apps": list(page["apps"])}
+
+    def _popular_page(self, filters: Optional[Dict[str, Any]], limit: Optional[int],
+                      cursor: Optional[str]) -> Dict[str, Any]:
+        """Page through apps by popularity: the ranked top K first, then the rest by name.
+
+        The ranked apps are read by ID, so pages within them never scan the
+        catalog; only pages reaching past them read the cached name ordering.
+        The ordering is always most popular first, and cursors hold positions
+        in it.
+        """
+        start = popular_start(cursor)
+        apps = self._ranked_apps(filters)
+        if limit is None or start + limit >= len(apps):
+            ranked = {app["id"] for app in apps}
+            apps += [app for app in self.get_apps_page(filters, "name")["apps"] if app["id"] not in ranked]
+        return popular_page(apps, start, limit)
+
+    def _ranked_apps(self, filters: Optional[Dict[str, Any]]) -> List[Dict]:
+        """The apps in the popularity top K that match ``filters``, most popular first."""
+        ranking = self.indexes.ranking(self.get_launch_scores)
+        if not ranking:
+            return []
+        load = self.reader.get_apps_by_ids if self.reader else super().get_apps_by_ids
+        rows = self.cache.get_or_load(self._key("ranked", tuple(ranking)), lambda: load(ranking))
+        return self.indexes.popularity.ranked_rows(ranking, rows, filters)
+
+    def get_app_by_id(self, app_id: str) -> Optional[Dict]:
+        """Get a single app by ID, served from the cache when fresh."""
+        load = self.reader.get_app_by_id if self.reader else super().get_app_by_id
+        app = self.cache.get_or_load(self._key("app", app_id), lambda: load(app_id))
+        return dict(app) if app else None
+
+    def get_categories(self) -> List[str]:
+        """Get all categories, served from the cache when fresh."""
+        load = self.reader.get_categories if self.reader else super().get_categories
+        return list(self.cache.get_or_load(self._key("categories"), load))
+
+    def get_category_facets(self) -> List[Dict]:
+        """Get every category with its app count, kept current in process.
+
+        The facets are rebuilt with one grouped query only when they no longer
+        match the catalog version. With a snapshot they are grouped from the
+        snapshot's apps instead, served from the cache when fresh.
+        """
+        reader = self.reader
+        if reader is not None:
+            rows: List[Dict] = self.cache.get_or_load(
+                self._key("facets"), lambda: group_facets(reader.get_apps(), reader.get_categories())
+            )
+            return rows
+        return self.indexes.category_facets(self.get_catalog_version(), super().get_category_facets)
+
+    def search_apps(self, query: str, limit: int) -> List[Dict]:
+        """Typeahead search over app names and categories, answered by the in-process index.
+
+        The index is rebuilt from the cached catalog only when it no longer
+        matches the catalog version, so searching makes no database calls.
+        """
+        return self.indexes.search(query, limit, self.get_catalog_version(), self.get_apps)
+
+    def get_settings(self) -> Optional[Dict]:
+        """Get the settings row, from the snapshot when there is one."""
+        if self.reader:
+            return self.reader.get_settings()
+        return super().get_settings()
+
+    def get_or_create_settings(self) -> Tuple[Dict, bool]:
+        """Get the settings row, invalidating cached reads if the defaults had to be saved."""
+        settings, created = super().get_or_create_settings()
+        if created:
+            self.invalidate()
+        return settings, created
+
+    def update_settings(self, values: Dict[str, Any]) -> Dict:
+        """Update the saved settings and invalidate cached reads."""
+        updated = super().update_settings(values)
+        self._publish(settings=updated)
+        return updated
+
+    def reset_settings(self) -> Dict:
+        """Reset the saved settings and invalidate cached reads."""
+        reset = super().reset_settings()
+        self._publish(settings=reset)
+        return reset
+
+    def get_catalog_version(self) -> Dict[str, Any]:
+        """Get the catalog version, served from the cache when fresh.
+
+        With a snapshot the version is the snapshot's own, which changes with
+        every published write, so no database round trip is needed.
+        """
+        if self.snapshot is not None:
+            return self.snapshot.version()
+        version: Dict[str, Any] = self.cache.get_or_load(("version",), super().get_catalog_version)
+        return version
+
+    def invalidate(self) -> None:
+        """Drop cached reads after a write made outside this service."""
+        self.indexes.facets.invalidate()
+        if self.snapshot is None:
+            self._publish()
+        else:
+            self._publish(categories=super().get_categories(), settings=super().get_settings())
+
+    def create_app(self, app_data: Dict) -> Dict:
+        """Create a new app and invalidate cached reads."""
+        created = super().create_app(app_data)
+        self._publish(**self.indexes.created(created))
+        return created
+
+    def update_app(self, app_id: str, app_data: Dict) -> Dict:
+        """Update an existing app and invalidate cached reads."""
+        previous = self.get_app_by_id(app_id) if self.indexes.needs_previous(app_data) else None
+        updated = super().update_app(app_id, app_data)
+        self._publish(**self.indexes.updated(updated, previous, app_data))
+        return updated
+
+    def delete_app(self, app_id: str) -> bool:
+        """Delete an app and invalidate cached reads."""
+        self._publish(**self.indexes.deleted(super()._delete_app(app_id)))
+        return True
+
+    def increment_launch_count(self, app_id: str) -> Dict:
+        """Increment the launch count for an app and drop the cached reads it made stale."""
+        updated = super().increment_launch_count(app_id)
+        launched = self.indexes.launched({updated["id"]: 1}, [updated])
+        self._publish(stale=launch_stale({updated["id"]}), **launched)
+        return updated
+
+    def increment_launch_counts(self, increments: Dict[str, Dict[str, Any]]) -> int:
+        """Apply merged launch increments and drop the cached reads they made stale, once."""
+        updated = super().increment_launch_counts(increments)
+        # The RPC returns only a count, so read back the new totals for the snapshot
+        rows = self.get_apps_by_ids(list(increments)) if self.snapshot is not None and updated else None
+        launched = self.indexes.launched({app_id: delta["count"] for app_id, delta in increments.items()}, rows)
+        self._publish(stale=launch_stale(set(increments)), **launched)
+        return updated
+
+    def add_category(self, name: str) -> Dict:
+        """Add a new category and invalidate cached reads."""
+        result = super().add_category(name)
+        if result["status"] == "success":
+            self.indexes.category_added(result["category"])
+            self._publish(categories=super().get_categories())
+        else:
+            self._publish()
+        return result
+
+    def batch_apps(self, operations: List[Tuple[str, List[str], Dict[str, Any]]],
+                   chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """Apply bulk deletes and updates and invalidate cached reads once for the whole batch."""
+        try:
+            report, rows, deleted = self._apply_batch(operations, chunk_size)
+        except Exception:
+            # Part of the batch may have been written, so republish from the database
+            self._rebuild("batch")
+            raise
+        self._publish(**self.indexes.batched(rows, deleted))
+        return report
+
+    def import_apps(self, apps: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """Import apps in bulk and invalidate cached reads once for the whole batch."""
+        try:
+            return super().import_apps(apps, chunk_size)
+        finally:
+            # Upserts return no rows, so republish from the database
+            self._rebuild("import")
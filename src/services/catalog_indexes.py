@@ -0,0 +1,135 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from .facets import CategoryFacets, facets
+from .popularity import PopularityTracker, popularity
+from .search_index import SearchIndex, search_index
+
+logger = logging.getLogger(__name__)
+
+class CatalogIndexes:
+    """The in-process search index, popularity ranking and category facets.
+
+    Write hooks follow a write into the indexes and return the changes for
+    the caller to publish; reads rebuild an index when it no longer matches
+    the catalog, from the loader they are given.
+    """
+
+    def __init__(self, search: Optional[SearchIndex] = None, ranking: Optional[PopularityTracker] = None,
+                 categories: Optional[CategoryFacets] = None):
+        self.search_index = search if search is not None else search_index
+        self.popularity = ranking if ranking is not None else popularity
+        self.facets = categories if categories is not None else facets
+
+    def needs_previous(self, app_data: Dict) -> bool:
+        """Whether an update must read the app first: the facets need the category it leaves."""
+        return "category" in app_data and self.facets.ready
+
+    def created(self, created: Dict) -> Dict[str, Any]:
+        """Count a created app in the facets; returns the changes to publish."""
+        self.facets.add(created)
+        return self.apply({"rows": [created]})
+
+    def updated(self, updated: Dict, previous: Optional[Dict], app_data: Dict) -> Dict[str, Any]:
+        """Move an updated app between facets, or drop them if its old category is unknown."""
+        if "category" in app_data and previous is None:
+            self.facets.invalidate()
+        else:
+            self.facets.update(updated, previous)
+        return self.apply({"rows": [updated]})
+
+    def deleted(self, deleted: Dict) -> Dict[str, Any]:
+        """Uncount a deleted app's row in the facets; returns the changes to publish."""
+        self.facets.remove(deleted)
+        return self.apply({"deleted": [deleted["id"]]})
+
+    def launched(self, counts: Dict[str, int], rows: Optional[List[Dict]] = None) -> Dict[str, Any]:
+        """Record launches in the popularity ranking; returns the changes to publish."""
+        self.popularity.record_many(counts)
+        return self.apply({"rows": rows}) if rows else {}
+
+    def batched(self, rows: List[Dict], deleted: List[str]) -> Dict[str, Any]:
+        """Drop the facets after a batch that wrote anything; returns the changes to publish."""
+        if not rows and not deleted:
+            return {}
+        # Recategorized apps' previous categories aren't known
+        self.facets.invalidate()
+        return self.apply({"rows": rows, "deleted": deleted})
+
+    def category_added(self, name: str) -> None:
+        self.facets.add_category(name)
+
+    def apply(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply a write's changes to the search index and popularity ranking; returns them."""
+        self.search_index.upsert(changes.get("rows", ()))
+        self.search_index.remove(changes.get("deleted", ()))
+        self.popularity.remove(changes.get("deleted", ()))
+        return changes
+
+    def invalidate(self) -> None:
+        """Rebuild the search index and facets on their next use."""
+        self.search_index.invalidate()
+        self.facets.invalidate()
+
+    def search(self, query: str, limit: int, version: Dict[str, Any],
+               load_apps: Callable[[], List[Dict]]) -> List[Dict]:
+        """Search the index, rebuilding it from ``load_apps`` when it no longer matches ``version``.
+
+        Only the first build happens before answering; later ones run in the
+        background while the stale index keeps answering.
+        """
+        if not self.search_index.is_current(version):
+            if not self.search_index.ready:
+                self.search_index.rebuild(load_apps(), version)
+            elif self.search_index.claim_refresh():
+                threading.Thread(target=self._refresh_search_index, args=(version, load_apps),
+                                 name="search-index-refresh", daemon=True).start()
+        return self.search_index.search(query, limit)
+
+    def _refresh_search_index(self, version: Dict[str, Any], load_apps: Callable[[], List[Dict]]) -> None:
+        try:
+            self.search_index.rebuild(load_apps(), version)
+        except Exception as e:
+            logger.error(f"Failed to rebuild search index: {e}")
+        finally:
+            self.search_index.release_refresh()
+
+    def ranking(self, load_scores: Callable[[], Dict[str, float]]) -> List[str]:
+        """The popularity top K, re-read from ``load_scores`` when the scores are too old.
+
+        Only the first load happens before answering; later ones run in the
+        background while the stale scores keep ranking.
+        """
+        if not self.popularity.is_current():
+            if not self.popularity.ready:
+                self._load_popularity(load_scores)
+            elif self.popularity.claim_refresh():
+                threading.Thread(target=self._refresh_popularity, args=(load_scores,),
+                                 name="popularity-refresh", daemon=True).start()
+        return self.popularity.ranking()
+
+    def _load_popularity(self, load_scores: Callable[[], Dict[str, float]]) -> None:
+        mark = self.popularity.begin_rebuild()
+        scores = None
+        try:
+            scores = load_scores()
+        finally:
+            self.popularity.end_rebuild(mark, scores)
+
+    def _refresh_popularity(self, load_scores: Callable[[], Dict[str, float]]) -> None:
+        try:
+            self._load_popularity(load_scores)
+        except Exception as e:
+            logger.error(f"Failed to refresh popularity scores: {e}")
+        finally:
+            self.popularity.release_refresh()
+
+    def category_facets(self, version: Dict[str, Any], load_facets: Callable[[], List[Dict]]) -> List[Dict]:
+        """Every category with its app count, rebuilt from ``load_facets`` when they no longer match ``version``.
+
+        The response is validated by that version, so the rebuild happens
+        before answering rather than in the background.
+        """
+        if not self.facets.is_current(version):
+            self.facets.rebuild(load_facets())
+        return self.facets.facets()
@@ -0,0 +1,73 @@
+import logging
+import os
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ClientRegistry:
+    """Lazily creates and hands out one shared client per process.
+
+    The client is created on first use under a lock, so concurrent threads in a
+    gunicorn threaded worker all receive the same instance, and importing the
+    app never opens a connection. The owning PID is
+    recorded: a worker forked from a master that already built a client gets a
+    fresh one instead of sharing the parent's sockets.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._client: Optional[Any] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Return the shared client, creating it on first use."""
+        client = self._client
+        if client is not None and self._pid == os.getpid():
+            return client
+        with self._lock:
+            if self._client is None or self._pid != os.getpid():
+                self._client = self._factory()
+                self._pid = os.getpid()
+                logger.debug("Created shared database client for pid %s", self._pid)
+            return self._client
+
+    def install(self, client: Any) -> None:
+        """Replace the shared client, e.g. with a local stand-in for benchmarks."""
+        with self._lock:
+            self._client = client
+            self._pid = os.getpid()
+
+    def reset(self) -> None:
+        """Close and forget the shared client so the next call builds a new one."""
+        with self._lock:
+            client, self._client, self._pid = self._client, None, None
+        close = getattr(client, "close", None)
+        if callable(close):
+            close()
+
+def _supabase_credentials() -> Tuple[str, str]:
+    from config import Config
+    if not Config.SUPABASE_URL or not Config.SUPABASE_KEY:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set for STORAGE_BACKEND=supabase")
+    return Config.SUPABASE_URL, Config.SUPABASE_KEY
+
+def _default_factory() -> Any:
+    from config import Config
+    if Config.STORAGE_BACKEND == "sqlite":
+        from .sqlite_backend import SQLiteClient
+        return SQLiteClient(Config.SQLITE_PATH)
+    if Config.STORAGE_BACKEND != "supabase":
+        raise ValueError(f"Unknown STORAGE_BACKEND {Config.STORAGE_BACKEND!r}")
+    # Imported here: supabase and its HTTP stack are the slowest imports in the app
+    from .pooled_client import create_pooled_client
+    return create_pooled_client(
+        *_supabase_credentials(),
+        pool_size=Config.SUPABASE_POOL_SIZE,
+        keepalive=Config.SUPABASE_POOL_KEEPALIVE,
+        connect_timeout=Config.SUPABASE_CONNECT_TIMEOUT,
+        read_timeout=Config.SUPABASE_READ_TIMEOUT
+    )
+
+registry = ClientRegistry(_default_factory)
@@ -1,61 +1,227 @@
+import json
+import re
 from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from json.encoder import encode_basestring  # type: ignore[attr-defined]  # C-accelerated, missing from typeshed
+from typing import Callable, Dict, Any, Iterable, List, Mapping, Optional, Sequence, Tuple
 from ..models.exceptions import AppError
+from ..utils.json_provider import fast_dumps
+from ..utils.metrics import timed_function
 from config import Config
 
+_CAMEL_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
+
+# Operations accepted by POST /api/apps/batch
+BATCH_OPERATIONS = ("delete", "recategorize", "update")
+
+@lru_cache(maxsize=256)
+def _to_camel_case(snake_str: str) -> str:
+    components = snake_str.split('_')
+    return components[0] + ''.join(x.title() for x in components[1:])
+
+@lru_cache(maxsize=256)
+def _camel_to_snake(camel_str: str) -> str:
+    return _CAMEL_BOUNDARY.sub('_', camel_str).lower()
+
+def _encode_json_value(value: Any, _encode_str: Callable[[str], str] = encode_basestring,
+                       _dumps: Callable[[Any], str] = json.dumps) -> str:
+    """Encode one JSON value, with fast paths for the types rows actually hold."""
+    value_type = value.__class__
+    if value_type is str:
+        return _encode_str(value)
+    if value is None:
+        return "null"
+    if value_type is int:
+        return str(value)
+    return _dumps(value)
+
+def compile_row_formatter(columns: Sequence[str]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Return a function mapping a snake_case row to a camelCase dict.
+
+    Key names are converted once, here, so formatting a row is a single
+    comprehension over precomputed ``(camel, snake)`` pairs.
+    """
+    pairs = tuple((_to_camel_case(column), column) for column in columns)
+
+    def format_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {camel: row[snake] for camel, snake in pairs}
+    return format_row
+
+def compile_row_encoder(columns: Sequence[str]) -> Callable[[Dict[str, Any]], str]:
+    """Return a function encoding a snake_case row straight to a camelCase JSON object.
+
+    Equivalent to ``json.dumps(format_row(row))`` but skips the intermediate
+    dict and the generic encoder's per-value type dispatch: each column's
+    ``{"key":`` or ``,"key":`` prefix is encoded once, here.
+    """
+    prefixes = tuple(
+        (("{" if i == 0 else ",") + json.dumps(_to_camel_case(column)) + ":", column)
+        for i, column in enumerate(columns)
+    )
+
+    def encode_row(row: Dict[str, Any], enc: Callable[[Any], str] = _encode_json_value) -> str:
+        return "".join([prefix + enc(row[column]) for prefix, column in prefixes]) + "}"
+    return encode_row
+
+_format_app = compile_row_formatter(Config.APP_COLUMNS)
+
+if fast_dumps is not None:
+    # The optional fast encoder beats the generated one on whole lists
+    _fast_dumps = fast_dumps
+
+    def _encode_app(row: Dict[str, Any], /) -> str:
+        return _fast_dumps(_format_app(row)).decode()
+
+    def _encode_apps(apps: Iterable[Dict[str, Any]]) -> str:
+        return _fast_dumps(list(map(_format_app, apps))).decode()
+else:
+    _encode_app = compile_row_encoder(Config.APP_COLUMNS)
+
+    def _encode_apps(apps: Iterable[Dict[str, Any]]) -> str:
+        return "[" + ",".join(map(_encode_app, apps)) + "]"
+
 class DataProcessor:
     """Service class for data processing and validation."""
 
     @staticmethod
     def to_camel_case(snake_str: str) -> str:
-        """Convert snake_case to camelCase."""
-        components = snake_str.split('_')
-        return components[0] + ''.join(x.title() for x in components[1:])
+        """Convert snake_case to camelCase (memoized)."""
+        return _to_camel_case(snake_str)
 
     @classmethod
     def snake_to_camel_dict(cls, data: Dict[str, Any]) -> Dict[str, Any]:
         """Convert all dictionary keys from snake_case to camelCase."""
         return {
-            cls.to_camel_case(key): value
+            _to_camel_case(key): value
             for key, value in data.items()
         }
 
     @staticmethod
     def camel_to_snake(camel_str: str) -> str:
-        """Convert camelCase to snake_case."""
-        snake_str = camel_str[0].lower()
-        for char in camel_str[1:]:
-            if char.isupper():
-                snake_str += '_' + char.lower()
-            else:
-                snake_str += char
-        return snake_str
+        """Convert camelCase to snake_case (memoized)."""
+        return _camel_to_snake(camel_str)
 
     @classmethod
     def camel_to_snake_dict(cls, data: Dict[str, Any]) -> Dict[str, Any]:
         """Convert all dictionary keys from camelCase to snake_case."""
         return {
-            cls.camel_to_snake(key): value
+            _camel_to_snake(key): value
             for key, value in data.items()
         }
 
     @staticmethod
     def format_app_response(app_data: Dict[str, Any]) -> Dict[str, Any]:
         """Format app data for API response."""
+        return _format_app(app_data)
+
+    @staticmethod
+    @timed_function("process")
+    def format_apps(apps: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Format a list of apps for API response."""
+        return list(map(_format_app, apps))
+
+    @classmethod
+    def format_facets(cls, facets: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Format ``get_category_facets`` rows for API response."""
+        return [cls.snake_to_camel_dict(facet) for facet in facets]
+
+    @staticmethod
+    def app_to_json(app_data: Dict[str, Any]) -> str:
+        """Encode one app as a JSON object in API format."""
+        return _encode_app(app_data)
+
+    @staticmethod
+    @timed_function("process")
+    def apps_to_json(apps: Iterable[Dict[str, Any]]) -> str:
+        """Encode a list of apps as a JSON array in API format."""
+        return _encode_apps(apps)
+
+    @classmethod
+    def page_to_json(cls, page: Dict[str, Any]) -> str:
+        """Encode a ``get_apps_page`` result as the ``/api/apps`` response body."""
+        return '{"apps":%s,"nextCursor":%s,"prevCursor":%s}' % (
+            cls.apps_to_json(page["apps"]),
+            json.dumps(page["next_cursor"]),
+            json.dumps(page["prev_cursor"])
+        )
+
+    @classmethod
+    def changes_to_json(cls, changes: Dict[str, Any]) -> str:
+        """Encode a ``get_changes`` result as the ``/api/apps/changes`` response body."""
+        return '{"apps":%s,"deleted":%s,"token":%s,"reset":%s}' % (
+            cls.apps_to_json(changes["apps"]),
+            json.dumps(changes["deleted"]),
+            json.dumps(changes["token"]),
+            json.dumps(changes["reset"])
+        )
+
+    @classmethod
+    def validate_list_args(cls, args: Mapping[str, str]) -> Dict[str, Any]:
+        """Validate ``/api/apps`` query args into ``get_apps_page`` keyword arguments."""
+        category = args.get('category')
+        sort_by = args.get('sort')
+        order = args.get('order', 'asc')
+        cursor = args.get('cursor')
+        try:
+            limit = int(args['limit']) if args.get('limit') is not None else None
+        except ValueError:
+            raise AppError("Invalid limit value")
+
+        # Build filters
+        filters = {}
+        if category:
+            filters['category'] = category.lower()
+
+        if limit is not None and not (1 <= limit <= Config.MAX_PAGE_SIZE):
+            raise AppError(f"Limit must be between 1 and {Config.MAX_PAGE_SIZE}")
+
         return {
-            "id": app_data["id"],
-            "name": app_data["name"],
-            "category": app_data["category"],
-            "iconUrl": app_data["icon_url"],
-            "appStoreLink": app_data["app_store_link"],
-            "launchCount": app_data["launch_count"],
-            "lastModified": app_data["last_modified"],
-            "lastLaunched": app_data["last_launched"]
+            "filters": filters,
+            "sort": cls.camel_to_snake(sort_by) if sort_by else None,
+            "descending": order.lower() == 'desc',
+            "limit": limit,
+            "cursor": cursor
         }
 
     @staticmethod
-    def validate_app_data(data: Dict[str, Any], for_update: bool = False) -> Dict[str, Any]:
+    def validate_search_args(args: Mapping[str, str]) -> Tuple[str, int]:
+        """Validate ``/api/apps/search`` query args into ``(query, limit)``."""
+        query = (args.get('q') or '').strip()
+        if len(query) > 100:
+            raise AppError("Search query is too long")
+        try:
+            limit = int(args.get('limit', Config.SEARCH_DEFAULT_LIMIT))
+        except ValueError:
+            raise AppError("Invalid limit value")
+        if not (1 <= limit <= Config.SEARCH_MAX_LIMIT):
+            raise AppError(f"Limit must be between 1 and {Config.SEARCH_MAX_LIMIT}")
+        return query, limit
+
+    @staticmethod
+    def default_settings() -> Dict[str, Any]:
+        """Build the default settings document."""
+        return {
+            "metadata": {
+                "lastUpdated": datetime.utcnow().isoformat(),
+                "version": "1.0"
+            },
+            "settings": {
+                "gridGap": "5",
+                "gridPadding": "0",
+                "iconSize": Config.DEFAULT_ICON_SIZE,
+                "theme": "dark",
+                "appNameColor": "#ffffff",
+                "paddingX": "2",
+                "paddingY": "6",
+                "safeAreaTop": "0"
+            }
+        }
+
+    @staticmethod
+    def validate_app_data(data: Optional[Dict[str, Any]], for_update: bool = False) -> Dict[str, Any]:
         """Validate and format app data for database operations."""
+        if not isinstance(data, dict):
+            raise AppError("Invalid app data - expected an object")
         if not for_update and not data.get("name"):
             raise AppError("App name is required")
 
@@ -102,4 +268,71 @@ class DataProcessor:
         if len(formatted_name) > 50:  # arbitrary limit
             raise AppError("Category name is too long")
         
-        return formatted_name 
\ No newline at end of file
+        return formatted_name 
+
+    @classmethod
+    def validate_batch(cls, data: Any) -> List[Tuple[str, List[str], Dict[str, Any]]]:
+        """Validate a batch body into ``(op, ids, values)`` operations.
+
+        The body is ``{"operations": [...]}`` where each operation is
+        ``{"op": "delete", "ids": [...]}``, ``{"op": "recategorize", "ids": [...],
+        "category": name}`` or ``{"op": "update", "ids": [...], "values": {...}}``
+        with the same fields as ``PUT /api/apps/<id>`` except ``iconUrl``. Any
+        invalid operation rejects the whole batch before anything is written.
+        """
+        operations = data.get("operations") if isinstance(data, dict) else None
+        if not isinstance(operations, list) or not operations:
+            raise AppError("Batch must contain a non-empty operations list")
+
+        validated = []
+        total_ids = 0
+        for index, operation in enumerate(operations):
+            if not isinstance(operation, dict):
+                raise AppError(f"Operation {index} must be an object")
+            op = operation.get("op")
+            if op not in BATCH_OPERATIONS:
+                raise AppError(f"Operation {index} has unknown op {op!r}, expected one of: {', '.join(BATCH_OPERATIONS)}")
+            ids = operation.get("ids")
+            if not isinstance(ids, list) or not ids or not all(isinstance(app_id, str) and app_id for app_id in ids):
+                raise AppError(f"Operation {index} needs a non-empty list of app IDs")
+            ids = list(dict.fromkeys(ids))
+            total_ids += len(ids)
+            if total_ids > Config.BATCH_MAX_IDS:
+                raise AppError(f"Batch exceeds the {Config.BATCH_MAX_IDS} app ID limit", 413)
+
+            if op == "delete":
+                values = {}
+            elif op == "recategorize":
+                category = operation.get("category")
+                values = {
+                    "category": cls.validate_category_name(category if isinstance(category, str) else ""),
+                    "last_modified": datetime.utcnow().isoformat()
+                }
+            else:
+                fields = operation.get("values")
+                if not isinstance(fields, dict):
+                    raise AppError(f"Operation {index} needs a values object")
+                if "iconUrl" in fields:
+                    # Icons are cached per URL, so they are changed one app at a time
+                    raise AppError(f"Operation {index}: iconUrl cannot be changed in a batch")
+                values = cls.validate_app_data(fields, for_update=True)
+                if values.keys() == {"last_modified"}:
+                    raise AppError(f"Operation {index} has no app fields to update")
+            validated.append((op, ids, values))
+        return validated
+
+    @staticmethod
+    def validate_settings(settings: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate settings data."""
+        if not isinstance(settings, dict):
+            raise AppError("Invalid settings - expected an object")
+        if "iconSize" in settings:
+            try:
+                icon_size = int(settings["iconSize"])
+                if not (24 <= icon_size <= 96):
+                    raise AppError("Icon size must be between 24 and 96 pixels")
+            except (TypeError, ValueError):
+                raise AppError("Invalid icon size value")
+        
+        # Add more validation as needed
+        return settings
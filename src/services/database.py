@@ -1,20 +1,405 @@
+import base64
+import json
 import logging
-from datetime import datetime
-from typing import List, Dict, Optional, Any
-from supabase import Client
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Any, Tuple, Iterator, Generator, Set, TypeVar, cast
 from ..models.exceptions import AppError
+from ..utils.metrics import instrumented
+from .data_processing import DataProcessor
 from config import Config
 
 logger = logging.getLogger(__name__)
 
-class DatabaseService:
+T = TypeVar("T")
+
+# A multi-step read: yields query builders, is sent each query's rows, returns the result
+QueryPlan = Generator[Any, List[Dict], T]
+
+def encode_cursor(sort_value: Any, app_id: str, direction: str) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor."""
+    raw = json.dumps({"v": sort_value, "id": app_id, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[Any, str, str]:
+    """Decode a cursor into (sort value, app id, direction)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if data["d"] not in ("next", "prev") or not isinstance(data["id"], str):
+            raise ValueError("bad direction")
+        return data["v"], data["id"], data["d"]
+    except Exception:
+        raise AppError("Invalid cursor")
+
+def encode_sync_token(timestamp: datetime) -> str:
+    """Encode a sync high-water mark as an opaque, URL-safe token."""
+    raw = json.dumps({"t": timestamp.isoformat()}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_sync_token(token: str) -> datetime:
+    """Decode a sync token into its (UTC) high-water mark."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return parse_timestamp(data["t"])
+    except Exception:
+        raise AppError("Invalid sync token")
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a stored timestamp as UTC; naive values are written as UTC."""
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+def run_plan(plan: QueryPlan[T]) -> T:
+    """Execute each query a plan yields, sending back its rows, and return the plan's result.
+
+    A failed query is raised inside the plan at its ``yield``, so a plan can
+    catch it and carry on; otherwise it propagates.
+    """
+    try:
+        query = next(plan)
+        while True:
+            try:
+                rows = query.execute().data or []
+            except Exception as e:
+                query = plan.throw(e)
+            else:
+                query = plan.send(rows)
+    except StopIteration as done:
+        return cast(T, done.value)
+
+class CatalogQueries:
+    """Query building for ``DatabaseService``.
+
+    Multi-step reads are written as plans: generators that yield query
+    builders and receive each query's rows, run by ``run_plan``.
+    """
+
+    client: Any
+    apps_table: str
+    settings_table: str
+    categories_table: str
+    tombstones_table: str
+    launches_table: str
+
+    # When this process last purged expired launch rollups (shared by all services)
+    _launches_purged_at: Optional[float] = None
+    _launch_purge_lock = threading.Lock()
+
+    def _filtered_query(self, filters: Optional[Dict[str, Any]]):
+        """Start an apps select with equality filters applied."""
+        query = self.client.table(self.apps_table).select("*")
+        for key, value in (filters or {}).items():
+            query = query.eq(key, value)
+        return query
+
+    def _ordered_query(self, filters: Optional[Dict[str, Any]], sort: str, descending: bool):
+        """Start an apps select ordered by (sort, id)."""
+        query = self._filtered_query(filters).order(sort, desc=descending)
+        if sort != "id":
+            query = query.order("id", desc=descending)
+        return query
+
+    def _page_plan(self, filters: Optional[Dict[str, Any]], sort: Optional[str], descending: bool,
+                   limit: Optional[int], cursor: Optional[str]) -> QueryPlan[Dict[str, Any]]:
+        """Plan one ``get_apps_page`` call."""
+        sort = sort or "id"
+        if sort != "id" and sort not in Config.SORTABLE_COLUMNS:
+            raise AppError(f"Cannot sort by {sort}")
+
+        if limit is None:
+            rows = yield self._ordered_query(filters, sort, descending)
+            return {"apps": rows, "next_cursor": None, "prev_cursor": None}
+
+        if not cursor:
+            rows = yield self._ordered_query(filters, sort, descending).limit(limit + 1)
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            return {
+                "apps": rows,
+                "next_cursor": self._cursor_for(rows[-1], sort, "next") if has_more else None,
+                "prev_cursor": None
+            }
+
+        value, after_id, direction = decode_cursor(cursor)
+        # Paging backwards scans in the opposite order, then restores it
+        scan_descending = descending if direction == "next" else not descending
+        rows = yield from self._rows_after_plan(filters, sort, scan_descending, value, after_id, limit + 1)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if direction == "prev":
+            rows.reverse()
+        if not rows:
+            return {"apps": [], "next_cursor": None, "prev_cursor": None}
+        return {
+            "apps": rows,
+            "next_cursor": self._cursor_for(rows[-1], sort, "next")
+            if direction == "prev" or has_more else None,
+            "prev_cursor": self._cursor_for(rows[0], sort, "prev")
+            if direction == "next" or has_more else None
+        }
+
+    def _rows_after_plan(self, filters: Optional[Dict[str, Any]], sort: str, descending: bool,
+                         value: Any, after_id: str, limit: int) -> QueryPlan[List[Dict]]:
+        """Plan a read of up to ``limit`` rows strictly after (value, after_id) in scan order.
+
+        PostgREST has no row-value comparison, so the keyset predicate
+        ``(sort, id) > (value, after_id)`` is split into index range scans: the
+        remaining ties on ``sort`` first, then rows past ``value``. Each later
+        query only runs when the earlier ones do not fill the page.
+
+        NULL sort values order after every value, as in Postgres (last when
+        ascending, first when descending). Comparisons never match NULL, so
+        NULL ties are read with ``is.null``, and the NULLs past a value (or
+        the values past a NULL) get a scan of their own.
+        """
+        past = "lt" if descending else "gt"
+        if sort == "id":
+            query = getattr(self._filtered_query(filters), past)("id", after_id)
+            return (yield query.order("id", desc=descending).limit(limit))
+
+        if value is None:
+            ties = self._filtered_query(filters).is_(sort, "null")
+        else:
+            ties = self._filtered_query(filters).eq(sort, value)
+        rows = yield getattr(ties, past)("id", after_id).order("id", desc=descending).limit(limit)
+        if value is None:
+            # Ascending, the NULLs are the last rows; descending, every value follows them
+            if descending and len(rows) < limit:
+                rest = self._ordered_query(filters, sort, descending).not_.is_(sort, "null")
+                rows += (yield rest.limit(limit - len(rows)))
+            return rows
+        if len(rows) < limit:
+            rest = getattr(self._ordered_query(filters, sort, descending), past)(sort, value)
+            rows += (yield rest.limit(limit - len(rows)))
+        if not descending and len(rows) < limit:
+            nulls = self._filtered_query(filters).is_(sort, "null").order("id")
+            rows += (yield nulls.limit(limit - len(rows)))
+        return rows
+
+    def _changes_plan(self, since_at: datetime) -> QueryPlan[Tuple[List[Dict], List[Dict]]]:
+        """Plan the incremental part of ``get_changes``: (changed apps, tombstone rows)."""
+        after = (since_at - timedelta(seconds=Config.SYNC_OVERLAP_SECONDS)).replace(tzinfo=None).isoformat()
+        # Launches only touch last_launched, so both columns are scanned
+        changed: Dict[str, Dict] = {}
+        for column in ("last_modified", "last_launched"):
+            rows = yield self.client.table(self.apps_table).select("*").gt(column, after)
+            changed.update((row["id"], row) for row in rows)
+        deleted = yield self.client.table(self.tombstones_table)\
+            .select("id", "deleted_at")\
+            .gt("deleted_at", after)
+        return list(changed.values()), deleted
+
+    def _tombstones_plan(self, app_ids: List[str]) -> QueryPlan[None]:
+        """Plan logging deleted app IDs for delta sync and purging entries past retention."""
+        now = datetime.utcnow()
+        yield self.client.table(self.tombstones_table)\
+            .upsert([{"id": app_id, "deleted_at": now.isoformat()} for app_id in app_ids],
+                    on_conflict="id", returning="minimal")
+        cutoff = now - timedelta(days=Config.TOMBSTONE_RETENTION_DAYS)
+        yield self.client.table(self.tombstones_table)\
+            .delete(returning="minimal")\
+            .lt("deleted_at", cutoff.isoformat())
+
+    @staticmethod
+    def _launch_cutoff() -> str:
+        """Oldest launch rollup bucket still inside the retention window."""
+        return (datetime.utcnow() - timedelta(days=Config.POPULARITY_RETENTION_DAYS)).isoformat()
+
+    def _launch_scores_plan(self) -> QueryPlan[Dict[str, float]]:
+        """Plan reading the decayed score of every app from rollups inside the retention window."""
+        rows = yield self.client.rpc(Config.POPULARITY_FN, {
+            "half_life_hours": Config.POPULARITY_HALF_LIFE_HOURS,
+            "since": self._launch_cutoff()
+        })
+        return {row["app_id"]: row["score"] for row in rows}
+
+    def _purge_launches_plan(self) -> QueryPlan[None]:
+        """Plan deleting launch rollups past retention."""
+        yield self.client.table(self.launches_table)\
+            .delete(returning="minimal")\
+            .lt("bucket", self._launch_cutoff())
+
+    def _launch_purge_due(self) -> bool:
+        """Claim this process's next launch purge, at most once per ``POPULARITY_PURGE_INTERVAL``."""
+        now = time.monotonic()
+        with CatalogQueries._launch_purge_lock:
+            last = CatalogQueries._launches_purged_at
+            if last is not None and now - last < Config.POPULARITY_PURGE_INTERVAL:
+                return False
+            CatalogQueries._launches_purged_at = now
+            return True
+
+    def _add_category_plan(self, name: str) -> QueryPlan[Dict]:
+        """Plan adding a category unless one with the same name exists.
+
+        A single upsert that ignores conflicts on ``UNIQUE(name)``, so concurrent
+        adds of the same name can't race; it returns a row only when it inserted one.
+        """
+        rows = yield self.client.table(self.categories_table)\
+            .upsert({"name": name}, on_conflict="name", ignore_duplicates=True)
+        if not rows:
+            return {"status": "exists", "category": name}
+        return {"status": "success", "category": rows[0]["name"]}
+
+    def _settings_plan(self) -> QueryPlan[Tuple[Dict, bool]]:
+        """Plan reading the settings row, saving the defaults first if there is none.
+
+        Returns ``(settings, created)``.
+        """
+        rows = yield self.client.table(self.settings_table).select("*")
+        if rows:
+            return rows[0], False
+        default_settings = DataProcessor.default_settings()
+        yield self.client.table(self.settings_table).insert(default_settings)
+        return default_settings, True
+
+    def _update_settings_plan(self, values: Dict[str, Any]) -> QueryPlan[Dict]:
+        """Plan merging validated values into the saved settings."""
+        rows = yield self.client.table(self.settings_table).select("*")
+        if not rows:
+            raise AppError("Settings not found")
+        settings_data = rows[0]
+        settings_data["settings"].update(values)
+        settings_data["metadata"]["lastUpdated"] = datetime.utcnow().isoformat()
+        rows = yield self.client.table(self.settings_table)\
+            .update(settings_data)\
+            .eq("id", settings_data["id"])
+        return rows[0]
+
+    def _reset_settings_plan(self) -> QueryPlan[Dict]:
+        """Plan replacing the saved settings with the defaults."""
+        default_settings = DataProcessor.default_settings()
+        current = yield self.client.table(self.settings_table).select("*")
+        if current:
+            # Update existing settings
+            rows = yield self.client.table(self.settings_table)\
+                .update(default_settings)\
+                .eq("id", current[0]["id"])
+        else:
+            # Create new settings
+            rows = yield self.client.table(self.settings_table).insert(default_settings)
+        return rows[0]
+
+    def _batch_plan(self, operations: List[Tuple[str, List[str], Dict[str, Any]]],
+                    chunk_size: int) -> QueryPlan[Tuple[Dict[str, Any], List[Dict], List[str]]]:
+        """Plan validated bulk mutations as one ``in_`` update or delete per chunk of IDs.
+
+        Operations run in order. A failed chunk marks its IDs as errors and the
+        batch carries on; deleted IDs get tombstones at the end. Returns
+        ``(report, changed_rows, deleted_ids)``.
+        """
+        results: List[Dict[str, Any]] = []
+        changed: Dict[str, Dict] = {}
+        deleted: List[str] = []
+        for index, (op, ids, values) in enumerate(operations):
+            done_status = "deleted" if op == "delete" else "updated"
+            statuses = {app_id: "missing" for app_id in ids}
+            # IDs that aren't UUIDs can't match a row, so they are never sent
+            requested: Dict[str, str] = {}
+            for app_id in ids:
+                canonical = self.parse_uuid(app_id)
+                if canonical:
+                    requested.setdefault(canonical, app_id)
+            canonical_ids = list(requested)
+            for start in range(0, len(canonical_ids), chunk_size):
+                chunk = canonical_ids[start:start + chunk_size]
+                table = self.client.table(self.apps_table)
+                try:
+                    if op == "delete":
+                        rows = yield table.delete().in_("id", chunk)
+                    else:
+                        rows = yield table.update(values).in_("id", chunk)
+                except Exception as e:
+                    logger.error(f"Failed to {op} {len(chunk)} apps: {e}")
+                    statuses.update(dict.fromkeys((requested[app_id] for app_id in chunk), "error"))
+                    continue
+                for row in rows:
+                    statuses[requested.get(row["id"], row["id"])] = done_status
+                    if op == "delete":
+                        changed.pop(row["id"], None)
+                        deleted.append(row["id"])
+                    else:
+                        changed[row["id"]] = row
+            results.append({"index": index, "op": op, "statuses": statuses})
+
+        if deleted:
+            yield from self._tombstones_plan(deleted)
+
+        counts = {"updated": 0, "deleted": 0, "missing": 0, "error": 0}
+        for result in results:
+            for status in result["statuses"].values():
+                counts[status] += 1
+        report = {
+            "updated": counts["updated"],
+            "deleted": counts["deleted"],
+            "missing": counts["missing"],
+            "failed": counts["error"],
+            "total": sum(counts.values()),
+            "results": results
+        }
+        return report, list(changed.values()), deleted
+
+    @staticmethod
+    def parse_uuid(value: Any) -> Optional[str]:
+        """Return a canonical UUID string, or None if the value is not a UUID."""
+        if not value:
+            return None
+        try:
+            return str(uuid.UUID(str(value)))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _sync_window(since: Optional[str]) -> Tuple[datetime, Optional[datetime]]:
+        """Return (now, since) for a sync token; ``since`` is None when a full resync is due."""
+        now = datetime.now(timezone.utc)
+        since_at = decode_sync_token(since) if since else None
+        if since_at and since_at < now - timedelta(days=Config.TOMBSTONE_RETENTION_DAYS):
+            since_at = None
+        return now, since_at
+
+    @staticmethod
+    def _changes_result(apps: List[Dict], deleted: List[Dict], now: datetime,
+                        since_at: Optional[datetime]) -> Dict[str, Any]:
+        return {
+            "apps": apps,
+            "deleted": [row["id"] for row in deleted],
+            "token": encode_sync_token(now),
+            "reset": since_at is None
+        }
+
+    @staticmethod
+    def _found(rows: List[Dict], app_id: str) -> Dict:
+        """The row a write to one app returned, or a 404 if it matched none."""
+        if not rows:
+            raise AppError(f"App {app_id} not found", 404)
+        return rows[0]
+
+    @staticmethod
+    def _cursor_for(row: Dict[str, Any], sort: str, direction: str) -> str:
+        """Build a cursor positioned at the given row."""
+        return encode_cursor(row.get(sort), row["id"], direction)
+
+@instrumented("db")
+class DatabaseService(CatalogQueries):
     """Service class for handling database operations."""
     
-    def __init__(self, client: Client):
-        self.client = client
+    def __init__(self, client: Optional[Any] = None):
+        self._client = client
         self.apps_table = Config.APPS_TABLE
         self.settings_table = Config.SETTINGS_TABLE
         self.categories_table = Config.CATEGORIES_TABLE
+        self.tombstones_table = Config.TOMBSTONES_TABLE
+        self.launches_table = Config.LAUNCHES_TABLE
+
+    @property
+    def client(self) -> Any:
+        """The client passed in, else the process-wide shared one (created on first use)."""
+        return self._client if self._client is not None else Config.get_supabase_client()
 
     def get_apps(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
         """Get all apps with optional filtering."""
@@ -31,6 +416,48 @@ class DatabaseService:
             logger.error(f"Failed to load apps: {e}")
             raise AppError("Failed to load apps", 500)
 
+    def get_apps_page(self, filters: Optional[Dict[str, Any]] = None, sort: Optional[str] = None,
+                      descending: bool = False, limit: Optional[int] = None,
+                      cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Get apps sorted and paginated by the database.
+
+        Ordering is on ``(sort, id)`` so ties are stable, and pagination is keyset
+        based: a cursor records the sort value and ID of a boundary row, and the
+        next page is the rows strictly after it. Without a ``limit`` every matching
+        row is returned in order. Returns ``{"apps", "next_cursor", "prev_cursor"}``.
+        """
+        try:
+            return run_plan(self._page_plan(filters, sort, descending, limit, cursor))
+        except AppError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to load apps page: {e}")
+            raise AppError("Failed to load apps", 500)
+
+    def iter_apps(self, filters: Optional[Dict[str, Any]] = None,
+                  page_size: Optional[int] = None) -> Iterator[Dict]:
+        """Yield every app in ID order, fetching one keyset page at a time.
+
+        Only one page is held in memory, whatever the catalog size. Pages bypass
+        any read cache so large scans do not evict hot entries.
+        """
+        page_size = page_size or Config.EXPORT_PAGE_SIZE
+        try:
+            rows = self._ordered_query(filters, "id", False).limit(page_size).execute().data or []
+            while rows:
+                yield from rows
+                if len(rows) < page_size:
+                    return
+                rows = self._rows_after(filters, "id", False, None, rows[-1]["id"], page_size)
+        except Exception as e:
+            logger.error(f"Failed to stream apps: {e}")
+            raise AppError("Failed to load apps", 500)
+
+    def _rows_after(self, filters: Optional[Dict[str, Any]], sort: str, descending: bool,
+                    value: Any, after_id: str, limit: int) -> List[Dict]:
+        """Return up to ``limit`` rows strictly after (value, after_id) in scan order."""
+        return run_plan(self._rows_after_plan(filters, sort, descending, value, after_id, limit))
+
     def get_app_by_id(self, app_id: str) -> Optional[Dict]:
         """Get a single app by ID."""
         try:
@@ -40,11 +467,26 @@ class DatabaseService:
             logger.error(f"Failed to load app {app_id}: {e}")
             raise AppError(f"Failed to load app {app_id}", 500)
 
+    def get_apps_by_ids(self, app_ids: List[str], chunk_size: Optional[int] = None) -> List[Dict]:
+        """Get the apps with the given IDs, one ``in_`` query per chunk."""
+        chunk_size = chunk_size or Config.IMPORT_CHUNK_SIZE
+        apps: List[Dict] = []
+        try:
+            for start in range(0, len(app_ids), chunk_size):
+                chunk = app_ids[start:start + chunk_size]
+                response = self.client.table(self.apps_table).select("*").in_("id", chunk).execute()
+                apps.extend(response.data or [])
+            return apps
+        except Exception as e:
+            logger.error(f"Failed to load {len(app_ids)} apps: {e}")
+            raise AppError("Failed to load apps", 500)
+
     def create_app(self, app_data: Dict) -> Dict:
         """Create a new app."""
         try:
             response = self.client.table(self.apps_table).insert(app_data).execute()
-            return response.data[0]
+            created: Dict = response.data[0]
+            return created
         except Exception as e:
             logger.error(f"Failed to create app: {e}")
             raise AppError("Failed to create app", 500)
@@ -53,9 +495,7 @@ class DatabaseService:
         """Update an existing app."""
         try:
             response = self.client.table(self.apps_table).update(app_data).eq("id", app_id).execute()
-            if not response.data:
-                raise AppError(f"App {app_id} not found", 404)
-            return response.data[0]
+            return self._found(response.data, app_id)
         except AppError:
             raise
         except Exception as e:
@@ -64,35 +504,156 @@ class DatabaseService:
 
     def delete_app(self, app_id: str) -> bool:
         """Delete an app."""
+        self._delete_app(app_id)
+        return True
+
+    def _delete_app(self, app_id: str) -> Dict:
+        """Delete an app and return its row as it was."""
         try:
             response = self.client.table(self.apps_table).delete().eq("id", app_id).execute()
-            if not response.data:
-                raise AppError(f"App {app_id} not found", 404)
-            return True
+            deleted = self._found(response.data, app_id)
+            self._record_tombstones([app_id])
+            return deleted
         except AppError:
             raise
         except Exception as e:
             logger.error(f"Failed to delete app {app_id}: {e}")
             raise AppError(f"Failed to delete app {app_id}", 500)
 
+    def _record_tombstones(self, app_ids: List[str]) -> None:
+        """Log deleted app IDs for delta sync and purge entries past retention."""
+        run_plan(self._tombstones_plan(app_ids))
+
+    def get_changes(self, since: Optional[str] = None) -> Dict[str, Any]:
+        """Get apps created, modified or launched since a sync token, and deleted app IDs.
+
+        Without a token, or with one older than the tombstone retention window,
+        the whole catalog is returned with ``reset`` set. Changes are re-sent
+        from ``SYNC_OVERLAP_SECONDS`` before the token, so replicas must apply
+        them idempotently (upsert apps, then delete IDs). The returned token is
+        the time of this read.
+        """
+        now, since_at = self._sync_window(since)
+        deleted: List[Dict] = []
+        try:
+            if since_at is None:
+                apps = self.get_apps()
+            else:
+                apps, deleted = run_plan(self._changes_plan(since_at))
+        except AppError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to load changes: {e}")
+            raise AppError("Failed to load changes", 500)
+
+        return self._changes_result(apps, deleted, now, since_at)
+
     def increment_launch_count(self, app_id: str) -> Dict:
-        """Increment the launch count for an app."""
+        """Atomically increment the launch count for an app in a single round trip."""
         try:
-            app = self.get_app_by_id(app_id)
-            if not app:
-                raise AppError(f"App {app_id} not found", 404)
-            
-            response = self.client.table(self.apps_table).update({
-                "launch_count": app["launch_count"] + 1,
-                "last_launched": datetime.utcnow().isoformat()
-            }).eq("id", app_id).execute()
-            
-            return response.data[0]
+            response = self.client.rpc(Config.INCREMENT_LAUNCH_FN, {
+                "app_id": app_id,
+                "amount": 1,
+                "launched_at": datetime.utcnow().isoformat()
+            }).execute()
+            app = self._found(response.data, app_id)
         except AppError:
             raise
         except Exception as e:
             logger.error(f"Failed to increment launch count for app {app_id}: {e}")
             raise AppError(f"Failed to update launch count", 500)
+        self._purge_launches()
+        return app
+
+    def increment_launch_counts(self, increments: Dict[str, Dict[str, Any]]) -> int:
+        """Apply merged launch increments for many apps in one round trip.
+
+        ``increments`` maps app ID to ``{"count": n, "last_launched": iso}``.
+        Returns the number of apps that were updated.
+        """
+        if not increments:
+            return 0
+        try:
+            response = self.client.rpc(Config.INCREMENT_LAUNCHES_FN, {
+                "increments": [
+                    {"id": app_id, "count": delta["count"], "last_launched": delta["last_launched"]}
+                    for app_id, delta in increments.items()
+                ]
+            }).execute()
+        except Exception as e:
+            logger.error(f"Failed to apply {len(increments)} launch increments: {e}")
+            raise AppError("Failed to update launch counts", 500)
+        self._purge_launches()
+        return response.data or 0
+
+    def _purge_launches(self) -> None:
+        """Delete launch rollups past retention when this process is due; failures are only logged."""
+        if not self._launch_purge_due():
+            return
+        try:
+            run_plan(self._purge_launches_plan())
+        except Exception as e:
+            logger.error(f"Failed to purge expired launches: {e}")
+
+    def get_launch_scores(self) -> Dict[str, float]:
+        """Get the decayed launch score of every app launched within the retention window.
+
+        Scores are summed from the hourly launch rollup by the ``app_popularity``
+        database function, which skips rows past ``POPULARITY_RETENTION_DAYS``; those
+        rows are purged after launches are written, not here.
+        """
+        try:
+            return run_plan(self._launch_scores_plan())
+        except Exception as e:
+            logger.error(f"Failed to load launch scores: {e}")
+            raise AppError("Failed to load launch scores", 500)
+
+    def get_settings(self) -> Optional[Dict]:
+        """Get the settings row, or None if none has been saved yet."""
+        try:
+            response = self.client.table(self.settings_table).select("*").execute()
+            return response.data[0] if response.data else None
+        except Exception as e:
+            logger.error(f"Failed to load settings: {e}")
+            raise AppError("Failed to load settings", 500)
+
+    def get_or_create_settings(self) -> Tuple[Dict, bool]:
+        """Get the settings row, saving the defaults first if there is none.
+
+        Returns the row and whether it had to be created.
+        """
+        try:
+            return run_plan(self._settings_plan())
+        except Exception as e:
+            logger.error(f"Failed to load settings: {e}")
+            raise AppError("Failed to load settings", 500)
+
+    def update_settings(self, values: Dict[str, Any]) -> Dict:
+        """Merge validated values into the saved settings and return the updated row."""
+        try:
+            return run_plan(self._update_settings_plan(values))
+        except AppError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to update settings: {e}")
+            raise AppError("Failed to update settings", 500)
+
+    def reset_settings(self) -> Dict:
+        """Replace the saved settings with the defaults and return the new row."""
+        try:
+            return run_plan(self._reset_settings_plan())
+        except Exception as e:
+            logger.error(f"Failed to reset settings: {e}")
+            raise AppError("Failed to reset settings", 500)
+
+    def get_catalog_version(self) -> Dict[str, Any]:
+        """Get the catalog version: row counts and newest timestamps of every table."""
+        try:
+            response = self.client.rpc(Config.CATALOG_VERSION_FN, {}).execute()
+            return response.data or {}
+        except Exception as e:
+            logger.error(f"Failed to load catalog version: {e}")
+            raise AppError("Failed to load catalog version", 500)
 
     def get_categories(self) -> List[str]:
         """Get all categories."""
@@ -104,17 +665,122 @@ class DatabaseService:
             logger.error(f"Failed to load categories: {e}")
             raise AppError("Failed to load categories", 500)
 
+    def get_category_facets(self) -> List[Dict]:
+        """Get every category with its app count and newest app modification.
+
+        One grouped query (the ``category_facets`` database function) covers
+        both listed categories and categories only used by apps; each row is
+        ``{"name", "app_count", "last_modified", "listed"}``.
+        """
+        try:
+            response = self.client.rpc(Config.CATEGORY_FACETS_FN, {}).execute()
+            return response.data or []
+        except Exception as e:
+            logger.error(f"Failed to load category facets: {e}")
+            raise AppError("Failed to load category facets", 500)
+
     def add_category(self, name: str) -> Dict:
         """Add a new category."""
         try:
-            # Check if category exists
-            existing = self.client.table(self.categories_table).select("*").eq("name", name).execute()
-            if existing.data:
-                return {"status": "exists", "category": name}
-            
-            # Add new category
-            response = self.client.table(self.categories_table).insert({"name": name}).execute()
-            return {"status": "success", "category": response.data[0]["name"]}
+            return run_plan(self._add_category_plan(name))
         except Exception as e:
             logger.error(f"Failed to add category: {e}")
-            raise AppError(f"Failed to add category: {str(e)}", 500) 
\ No newline at end of file
+            raise AppError(f"Failed to add category: {str(e)}", 500)
+
+    def batch_apps(self, operations: List[Tuple[str, List[str], Dict[str, Any]]],
+                   chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """Apply validated bulk deletes and updates and return a per-ID status report.
+
+        Each operation costs one round trip per ``chunk_size`` IDs rather than
+        one per app (see ``DataProcessor.validate_batch`` for the operations).
+        """
+        return self._apply_batch(operations, chunk_size)[0]
+
+    def _apply_batch(self, operations: List[Tuple[str, List[str], Dict[str, Any]]],
+                     chunk_size: Optional[int]) -> Tuple[Dict[str, Any], List[Dict], List[str]]:
+        """Run a batch, returning its report, the updated rows and the deleted IDs."""
+        try:
+            return run_plan(self._batch_plan(operations, chunk_size or Config.BATCH_CHUNK_SIZE))
+        except Exception as e:
+            logger.error(f"Failed to apply batch of {len(operations)} operations: {e}")
+            raise AppError("Failed to apply batch", 500)
+
+    def import_apps(self, apps: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """Import apps in bulk and return a per-row result report.
+
+        All rows are validated up front. Rows carrying an ``id`` are checked for
+        existence with one ``in_`` query per chunk; existing rows are updated and
+        everything else is created with a fresh ID. Writes go out as chunked
+        upserts grouped by column set, so the number of round trips grows with
+        ``len(apps) / chunk_size`` rather than with ``len(apps)``.
+        """
+        chunk_size = chunk_size or Config.IMPORT_CHUNK_SIZE
+        results: List[Dict[str, Any]] = [{"index": i} for i in range(len(apps))]
+        pending: List[Tuple[int, Dict[str, Any], Optional[str]]] = []
+
+        for index, app in enumerate(apps):
+            try:
+                if not isinstance(app, dict):
+                    raise AppError("Invalid app entry - expected an object")
+                app_data = DataProcessor.validate_app_data(app)
+                pending.append((index, app_data, self.parse_uuid(app.get("id"))))
+            except AppError as e:
+                results[index].update({"status": "error", "error": e.message})
+            except Exception as e:
+                results[index].update({"status": "error", "error": f"Invalid app data: {e}"})
+
+        existing = self._existing_app_ids(
+            [app_id for _, _, app_id in pending if app_id], chunk_size
+        )
+
+        # Later rows win when the same existing ID appears more than once
+        last_seen = {app_id: index for index, _, app_id in pending if app_id in existing}
+        groups: Dict[Tuple[str, ...], List[Tuple[int, Dict[str, Any]]]] = {}
+        for index, app_data, app_id in pending:
+            if app_id in existing:
+                if last_seen[app_id] != index:
+                    results[index].update({"id": app_id, "status": "skipped",
+                                           "error": "Superseded by a later row with the same id"})
+                    continue
+                status = "updated"
+            else:
+                app_id = str(uuid.uuid4())
+                status = "created"
+            app_data["id"] = app_id
+            results[index].update({"id": app_id, "status": status})
+            groups.setdefault(tuple(sorted(app_data)), []).append((index, app_data))
+
+        for rows in groups.values():
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                try:
+                    self.client.table(self.apps_table)\
+                        .upsert([app_data for _, app_data in chunk], on_conflict="id", returning="minimal")\
+                        .execute()
+                except Exception as e:
+                    logger.error(f"Failed to import chunk of {len(chunk)} apps: {e}")
+                    for index, _ in chunk:
+                        results[index].update({"status": "error", "error": "Failed to write app"})
+
+        return {
+            "imported": sum(1 for r in results if r.get("status") == "created"),
+            "updated": sum(1 for r in results if r.get("status") == "updated"),
+            "skipped": sum(1 for r in results if r.get("status") == "skipped"),
+            "failed": sum(1 for r in results if r.get("status") == "error"),
+            "total": len(apps),
+            "results": results
+        }
+
+    def _existing_app_ids(self, app_ids: List[str], chunk_size: int) -> Set[str]:
+        """Return the subset of IDs that already exist, one query per chunk."""
+        existing: Set[str] = set()
+        unique_ids = list(dict.fromkeys(app_ids))
+        for start in range(0, len(unique_ids), chunk_size):
+            chunk = unique_ids[start:start + chunk_size]
+            try:
+                response = self.client.table(self.apps_table).select("id").in_("id", chunk).execute()
+            except Exception as e:
+                logger.error(f"Failed to look up existing apps: {e}")
+                raise AppError("Failed to look up existing apps", 500)
+            existing.update(row["id"] for row in response.data or [])
+        return existing
@@ -0,0 +1,187 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+from .database import parse_timestamp
+from config import Config
+
+def _category(row: Dict[str, Any]) -> str:
+    """The category an app is counted under, as ``category_facets`` groups it."""
+    return row.get("category") or Config.DEFAULT_CATEGORY
+
+def _modified(row: Dict[str, Any]) -> Optional[datetime]:
+    return parse_timestamp(row["last_modified"]) if row.get("last_modified") else None
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+def group_facets(apps: Iterable[Dict[str, Any]], categories: Iterable[str]) -> List[Dict[str, Any]]:
+    """Compute ``category_facets`` rows from app rows and listed category names.
+
+    Used where there is no database to group for us (the catalog snapshot).
+    """
+    counts: Dict[str, int] = {}
+    newest: Dict[str, datetime] = {}
+    for row in apps:
+        category = _category(row)
+        counts[category] = counts.get(category, 0) + 1
+        modified = _modified(row)
+        if modified is not None and (category not in newest or modified > newest[category]):
+            newest[category] = modified
+    listed = set(categories)
+    return [
+        {
+            "name": name,
+            "app_count": counts.get(name, 0),
+            "last_modified": _isoformat(newest.get(name)),
+            "listed": name in listed
+        }
+        for name in sorted(listed | counts.keys())
+    ]
+
+class CategoryFacets:
+    """Per-category app counts and newest modification, kept current in process.
+
+    Built from one ``category_facets`` query and then updated by this
+    worker's writes: a create or delete adjusts one count, an update that
+    changes an app's category moves it between two. Deleting (or moving away)
+    the newest app of a category can't tell what the next newest is, so that
+    marks the facets for a rebuild instead. Writes by other workers are
+    noticed when the catalog's app count, newest modification time or
+    category count no longer match the facets, and they are rebuilt at least
+    every ``FACETS_MAX_AGE`` seconds.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+        self._newest: Dict[str, Optional[datetime]] = {}
+        self._listed: Set[str] = set()
+        self._apps = 0
+        self._built_at: Optional[float] = None
+        self._invalidated = False
+        self.builds = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether the facets have been built, even if stale."""
+        return self._built_at is not None
+
+    def is_current(self, version: Dict[str, Any]) -> bool:
+        """Whether the facets reflect the catalog described by a (database) catalog version."""
+        with self._lock:
+            if self._built_at is None or self._invalidated or time.monotonic() - self._built_at > self.max_age:
+                return False
+            if version.get("apps_count") != self._apps or version.get("categories_count") != len(self._listed):
+                return False
+            modified = version.get("apps_modified")
+            newest = max((value for value in self._newest.values() if value is not None), default=None)
+            return (parse_timestamp(modified) if modified else None) == newest
+
+    def rebuild(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Replace the facets with ``category_facets`` rows."""
+        counts, newest, listed = {}, {}, set()
+        for row in rows:
+            counts[row["name"]] = row["app_count"]
+            newest[row["name"]] = _modified(row)
+            if row["listed"]:
+                listed.add(row["name"])
+        with self._lock:
+            self._counts, self._newest, self._listed = counts, newest, listed
+            self._apps = sum(counts.values())
+            self._built_at = time.monotonic()
+            self._invalidated = False
+            self.builds += 1
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """Count a created app."""
+        with self._lock:
+            if self.ready:
+                self._add(row)
+
+    def update(self, row: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+        """Follow an updated app; pass its ``previous`` row when the write may have changed its category."""
+        with self._lock:
+            if not self.ready:
+                return
+            if previous is not None and _category(previous) != _category(row):
+                self._remove(previous)
+                self._add(row)
+            elif _category(row) in self._counts:
+                self._touch(_category(row), _modified(row))
+            else:
+                self._invalidated = True
+
+    def remove(self, row: Dict[str, Any]) -> None:
+        """Stop counting a deleted app."""
+        with self._lock:
+            if self.ready:
+                self._remove(row)
+
+    def add_category(self, name: str) -> None:
+        """List a created category."""
+        with self._lock:
+            if self.ready:
+                self._listed.add(name)
+                self._counts.setdefault(name, 0)
+                self._newest.setdefault(name, None)
+
+    def invalidate(self) -> None:
+        """Rebuild on the next read, after a write the facets can't follow row by row."""
+        with self._lock:
+            self._invalidated = True
+
+    def facets(self) -> List[Dict[str, Any]]:
+        """Every category, by name, with its ``app_count``, ``last_modified`` and whether it is ``listed``."""
+        with self._lock:
+            return [
+                {
+                    "name": name,
+                    "app_count": self._counts[name],
+                    "last_modified": _isoformat(self._newest[name]),
+                    "listed": name in self._listed
+                }
+                for name in sorted(self._counts)
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "categories": len(self._counts),
+                "apps": self._apps,
+                "builds": self.builds,
+                "current": not self._invalidated,
+                "age": round(time.monotonic() - self._built_at, 3) if self._built_at is not None else None
+            }
+
+    def _add(self, row: Dict[str, Any]) -> None:
+        category = _category(row)
+        self._counts[category] = self._counts.get(category, 0) + 1
+        self._apps += 1
+        self._touch(category, _modified(row))
+
+    def _touch(self, category: str, modified: Optional[datetime]) -> None:
+        newest = self._newest.get(category)
+        if modified is not None and (newest is None or modified > newest):
+            self._newest[category] = modified
+        else:
+            self._newest.setdefault(category, newest)
+
+    def _remove(self, row: Dict[str, Any]) -> None:
+        category = _category(row)
+        if not self._counts.get(category):
+            self._invalidated = True
+            return
+        self._counts[category] -= 1
+        self._apps -= 1
+        if not self._counts[category]:
+            self._newest[category] = None
+            if category not in self._listed:
+                del self._counts[category], self._newest[category]
+        elif _modified(row) == self._newest.get(category):
+            # Its next newest app is unknown
+            self._invalidated = True
+
+# Process-wide facets, kept current by CachedDatabaseService writes
+facets = CategoryFacets(Config.FACETS_MAX_AGE)
@@ -0,0 +1,331 @@
+import hashlib
+import io
+import ipaddress
+import logging
+import os
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import SplitResult, urljoin, urlsplit, urlunsplit
+from ..models.exceptions import AppError
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Source formats Pillow may decode. Everything is re-encoded as PNG, so markup
+# (SVG, HTML) never reaches the browser from this origin
+RASTER_FORMATS = ("PNG", "JPEG", "GIF", "WEBP", "ICO", "BMP")
+
+class _KeyLock:
+    """Serializes fetches of one cache key; ``users`` counts holders and waiters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+class IconCache:
+    """Disk cache of app icons fetched from their origin and downscaled to size buckets.
+
+    Files are named ``<url hash>-<bucket>``, so an entry is addressed by the
+    source URL it was built from: changing an app's ``icon_url`` changes the
+    address, and cached files are never stale. Every entry is a PNG re-encoded
+    from a decoded raster image; sources that are not one are refused. Total
+    size is capped; the least
+    recently served files are evicted first (recency survives restarts through
+    file mtimes). The cap covers the whole directory: every write rescans it,
+    so worker processes sharing a directory also share the cap.
+
+    Icon URLs are set by clients, so fetches only go to public addresses
+    unless ``allow_private_hosts`` is set: the host is resolved and rejected
+    if any address is loopback, private, link-local or otherwise non-global,
+    and redirects are followed by hand, re-checking every hop. The connection
+    goes to the address that was checked (with the URL's host name sent as
+    ``Host`` and for TLS), so a second DNS answer cannot redirect it.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, sizes: Sequence[int],
+                 fetch_timeout: float = 5.0, max_source_bytes: int = 5 * 1024 * 1024,
+                 max_redirects: int = 3, allow_private_hosts: bool = False,
+                 prefetch_workers: int = 2, max_pending_prefetches: int = 32):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.sizes = tuple(sorted(sizes))
+        self.fetch_timeout = fetch_timeout
+        self.max_source_bytes = max_source_bytes
+        self.max_redirects = max_redirects
+        self.allow_private_hosts = allow_private_hosts
+        # key -> (filename, bytes), least recently used first
+        self._index: Optional["OrderedDict[str, Tuple[str, int]]"] = None
+        self._total = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, _KeyLock] = {}
+        self.prefetch_workers = prefetch_workers
+        self._prefetcher: Optional[ThreadPoolExecutor] = None
+        self._prefetch_slots = threading.BoundedSemaphore(max_pending_prefetches)
+
+    @staticmethod
+    def version(icon_url: str) -> str:
+        """Return the short hash identifying an icon URL."""
+        return hashlib.sha256(icon_url.encode()).hexdigest()[:32]
+
+    def bucket(self, size: int) -> int:
+        """Round a requested size up to the nearest configured bucket."""
+        for bucket in self.sizes:
+            if bucket >= size:
+                return bucket
+        return self.sizes[-1]
+
+    def lookup(self, version: str, bucket: int) -> Optional[Tuple[bytes, str]]:
+        """Return ``(png, key)`` for a cached entry, or None."""
+        return self._read(f"{version}-{bucket}")
+
+    def get(self, icon_url: str, bucket: int) -> Tuple[bytes, str]:
+        """Return ``(png, key)`` for an icon, fetching and resizing it on a miss."""
+        key = f"{self.version(icon_url)}-{bucket}"
+        cached = self._read(key)
+        if cached:
+            return cached
+
+        # One fetch per key, however many requests miss at once. The lock is
+        # dropped only when no request holds or waits for it
+        with self._lock:
+            key_lock = self._key_locks.get(key)
+            if key_lock is None:
+                key_lock = self._key_locks[key] = _KeyLock()
+            key_lock.users += 1
+        try:
+            with key_lock.lock:
+                cached = self._read(key)
+                if cached:
+                    return cached
+                data = self._resize(self._fetch(icon_url), bucket)
+                self._write(key, data)
+        finally:
+            with self._lock:
+                key_lock.users -= 1
+                if not key_lock.users:
+                    del self._key_locks[key]
+        return data, key
+
+    def discard(self, icon_url: str) -> List[int]:
+        """Delete every cached size of an icon URL and return the buckets removed."""
+        prefix = f"{self.version(icon_url)}-"
+        removed = []
+        with self._lock:
+            index = self._load_index()
+            for key in [key for key in index if key.startswith(prefix)]:
+                self._remove(key)
+                removed.append(int(key[len(prefix):]))
+        return removed
+
+    def replace(self, old_url: str, new_url: Optional[str]) -> None:
+        """Drop cached sizes of a replaced icon and prefetch the same sizes of the new one.
+
+        Prefetches run on this cache's own small pool. When its backlog is
+        full the prefetch is skipped; the icon is then fetched on first request.
+        """
+        buckets = self.discard(old_url)
+        if not new_url or not buckets:
+            return
+        if not self._prefetch_slots.acquire(blocking=False):
+            logger.warning(f"Icon prefetch backlog is full, not prefetching {new_url}")
+            return
+
+        def prefetch():
+            try:
+                for bucket in buckets:
+                    try:
+                        self.get(new_url, bucket)
+                    except AppError as e:
+                        logger.warning(f"Failed to prefetch icon {new_url}: {e.message}")
+            finally:
+                self._prefetch_slots.release()
+        self._prefetch_executor().submit(prefetch)
+
+    def _prefetch_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._prefetcher is None:
+                self._prefetcher = ThreadPoolExecutor(
+                    max_workers=self.prefetch_workers,
+                    thread_name_prefix="icon-prefetch"
+                )
+            return self._prefetcher
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            index = self._load_index()
+            return {"entries": len(index), "bytes": self._total, "maxBytes": self.max_bytes}
+
+    def _load_index(self, rescan: bool = False) -> "OrderedDict[str, Tuple[str, int]]":
+        """Scan the cache directory (once, or again on ``rescan``), ordering entries by last use (mtime)."""
+        if self._index is None or rescan:
+            entries = []
+            os.makedirs(self.directory, exist_ok=True)
+            with os.scandir(self.directory) as listing:
+                for item in listing:
+                    key, ext = os.path.splitext(item.name)
+                    if ext != ".png":
+                        if ext and ext != ".tmp":
+                            # Unconverted originals cached by earlier versions
+                            self._discard_file(item.name)
+                        continue
+                    try:
+                        stat = item.stat()
+                    except FileNotFoundError:  # Evicted by another worker process mid-scan
+                        continue
+                    entries.append((stat.st_mtime_ns, key, item.name, stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, (filename, size)) for _, key, filename, size in entries)
+            self._total = sum(size for _, _, _, size in entries)
+        return self._index
+
+    def _read(self, key: str) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is None:
+                return None
+            index.move_to_end(key)
+        path = os.path.join(self.directory, entry[0])
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another worker process
+            with self._lock:
+                if key in self._load_index():
+                    self._remove(key)
+            return None
+        return data, key
+
+    def _write(self, key: str, data: bytes) -> None:
+        filename = key + ".png"
+        path = os.path.join(self.directory, filename)
+        with self._lock:
+            # Other workers write to the same directory, so count their files too
+            index = self._load_index(rescan=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            # Another worker may have cached this key meanwhile; keep the file just written
+            previous = index.pop(key, None)
+            if previous is not None:
+                self._total -= previous[1]
+                if previous[0] != filename:
+                    self._discard_file(previous[0])
+            index[key] = (filename, len(data))
+            self._total += len(data)
+            while self._total > self.max_bytes and len(index) > 1:
+                self._remove(next(iter(index)))
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and its file; the caller holds the lock."""
+        filename, size = self._load_index().pop(key)
+        self._total -= size
+        self._discard_file(filename)
+
+    def _discard_file(self, filename: str) -> None:
+        try:
+            os.remove(os.path.join(self.directory, filename))
+        except FileNotFoundError:
+            pass
+
+    def _fetch(self, icon_url: str) -> bytes:
+        """Download an icon from its origin, enforcing the address check and a size limit."""
+        import requests  # Deferred with Pillow: neither is needed until an icon misses
+        from requests.adapters import HTTPAdapter
+        url = icon_url
+        try:
+            for _ in range(self.max_redirects + 1):
+                parts = urlsplit(url)
+                address = self._check_url(parts)
+                host = f"[{parts.hostname}]" if ":" in (parts.hostname or "") else parts.hostname
+                netloc = f"[{address}]" if ":" in address else address
+                if parts.port:
+                    host, netloc = f"{host}:{parts.port}", f"{netloc}:{parts.port}"
+                # Connect to the checked address, presenting the host name for SNI and the certificate check
+                adapter = HTTPAdapter(max_retries=0)
+                adapter.poolmanager.connection_pool_kw.update(
+                    server_hostname=parts.hostname, assert_hostname=parts.hostname
+                )
+                with requests.Session() as session:
+                    session.mount(f"{parts.scheme}://", adapter)
+                    with session.get(urlunsplit(parts._replace(netloc=netloc)), headers={"Host": host},
+                                     timeout=self.fetch_timeout, stream=True,
+                                     allow_redirects=False) as response:
+                        if response.is_redirect:
+                            url = urljoin(url, response.headers["Location"])
+                            continue
+                        response.raise_for_status()
+                        data = bytearray()
+                        for chunk in response.iter_content(64 * 1024):
+                            data += chunk
+                            if len(data) > self.max_source_bytes:
+                                raise AppError("Icon is too large", 502)
+                        return bytes(data)
+            raise AppError("Icon URL redirected too many times", 502)
+        except AppError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to fetch icon {icon_url}: {e}")
+            raise AppError("Failed to fetch icon", 502)
+
+    def _check_url(self, parts: SplitResult) -> str:
+        """Resolve an http(s) URL's host and return the address to connect to.
+
+        Unless private hosts are allowed, every address the host resolves to
+        must be public.
+        """
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise AppError("Icon URL must be an http(s) URL", 400)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        try:
+            addresses = [info[4][0] for info in socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)]
+        except socket.gaierror as e:
+            logger.error(f"Failed to resolve icon host {parts.hostname}: {e}")
+            raise AppError("Failed to fetch icon", 502)
+        if not self.allow_private_hosts:
+            for address in addresses:
+                if not ipaddress.ip_address(address.split("%")[0]).is_global:
+                    logger.warning(f"Refused icon URL {parts.geturl()}: {parts.hostname} resolves to {address}")
+                    raise AppError("Icon URL points to a non-public address", 403)
+        return addresses[0]
+
+    @staticmethod
+    def _resize(data: bytes, bucket: int) -> bytes:
+        """Decode a raster icon and downscale it to fit ``bucket`` pixels, as PNG.
+
+        The result is served from this origin, so anything else (SVG, HTML,
+        formats outside ``RASTER_FORMATS``) is refused rather than passed through.
+        """
+        try:
+            from PIL import Image
+        except ImportError:
+            logger.error("Pillow is not installed; icons cannot be served")
+            raise AppError("Icon resizing is unavailable", 503)
+        try:
+            with Image.open(io.BytesIO(data), formats=RASTER_FORMATS) as image:
+                image.thumbnail((bucket, bucket), Image.Resampling.LANCZOS)
+                resized = image if image.mode in ("RGB", "RGBA") else image.convert("RGBA")
+                output = io.BytesIO()
+                resized.save(output, format="PNG", optimize=True)
+                return output.getvalue()
+        except Exception as e:
+            logger.warning(f"Refused icon that is not a supported image: {e}")
+            raise AppError("Icon URL did not return a supported image", 502)
+
+icon_cache = IconCache(
+    Config.ICON_CACHE_DIR,
+    Config.ICON_CACHE_MAX_BYTES,
+    Config.ICON_SIZES,
+    fetch_timeout=Config.ICON_FETCH_TIMEOUT,
+    max_source_bytes=Config.ICON_MAX_SOURCE_BYTES,
+    max_redirects=Config.ICON_MAX_REDIRECTS,
+    allow_private_hosts=Config.ICON_ALLOW_PRIVATE_HOSTS,
+    prefetch_workers=Config.ICON_PREFETCH_WORKERS,
+    max_pending_prefetches=Config.ICON_PREFETCH_MAX_PENDING
+)
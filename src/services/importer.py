@@ -0,0 +1,86 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from .database import DatabaseService
+from config import Config
+
+class ImportReport:
+    """Running totals for a streamed import.
+
+    Successful rows are only counted. Row results are kept for failed and
+    skipped rows (up to ``max_rows``), or for every row when ``full`` is set,
+    so a report for a huge import stays small by default.
+    """
+
+    def __init__(self, full: bool = False, max_rows: Optional[int] = None):
+        self.full = full
+        self.max_rows = max_rows if max_rows is not None else Config.IMPORT_MAX_REPORTED_ROWS
+        self.imported = 0
+        self.updated = 0
+        self.skipped = 0
+        self.failed = 0
+        self.total = 0
+        self.batches = 0
+        self.truncated = False
+        self.results: List[Dict[str, Any]] = []
+
+    def add(self, batch_report: Dict[str, Any], offset: int) -> None:
+        """Merge one batch's report, shifting its row indexes by ``offset``."""
+        self.batches += 1
+        self.imported += batch_report["imported"]
+        self.updated += batch_report["updated"]
+        self.failed += batch_report["failed"]
+        self.total += batch_report["total"]
+        self.skipped += batch_report["skipped"]
+        for result in batch_report["results"]:
+            status = result.get("status")
+            if not self.full and status in ("created", "updated"):
+                continue
+            if not self.full and len(self.results) >= self.max_rows:
+                self.truncated = True
+                continue
+            self.results.append({**result, "index": result["index"] + offset})
+
+    def progress(self) -> Dict[str, Any]:
+        """Return the counters without row results."""
+        return {
+            "imported": self.imported,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "processed": self.total,
+            "batches": self.batches
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the final report."""
+        return {
+            "imported": self.imported,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "total": self.total,
+            "results": self.results,
+            "resultsTruncated": self.truncated
+        }
+
+def import_in_batches(db: DatabaseService, rows: Iterable[Any], report: ImportReport,
+                      batch_size: Optional[int] = None) -> Iterator[ImportReport]:
+    """Feed rows to ``db.import_apps`` in fixed-size batches, yielding after each one.
+
+    Rows are pulled lazily from ``rows``, so at most one batch is held in
+    memory at a time. Each batch is validated and written with the bulk
+    import path; the report is yielded after every batch so callers can
+    surface progress.
+    """
+    batch_size = batch_size or Config.IMPORT_CHUNK_SIZE
+    batch: List[Any] = []
+    offset = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            report.add(db.import_apps(batch, batch_size), offset)
+            offset += len(batch)
+            batch = []
+            yield report
+    if batch:
+        report.add(db.import_apps(batch, batch_size), offset)
+        yield report
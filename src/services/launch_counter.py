@@ -0,0 +1,109 @@
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+from ..models.exceptions import AppError
+from .database import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+class LaunchCounter:
+    """Write-behind buffer for app launches.
+
+    Launches are merged per app in memory and written with a single
+    ``increment_launch_counts`` RPC when the buffer holds ``flush_threshold``
+    distinct apps, when ``flush_interval`` seconds have passed, or at process
+    exit. The number of DB writes grows with the number of distinct apps
+    launched per interval rather than with the number of launches.
+
+    Launches of IDs that ``db.get_app_by_id`` does not find are refused, so
+    recording one only reaches the network when the app is not cached; at most
+    ``max_pending`` distinct apps are buffered at a time.
+    """
+
+    def __init__(self, db: DatabaseService, flush_interval: float, flush_threshold: int,
+                 max_pending: int):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.max_pending = max_pending
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.launches = 0
+        self.flushes = 0
+        atexit.register(self.flush)
+
+    def record(self, app_id: str) -> int:
+        """Buffer one launch and return the number of launches pending for the app."""
+        canonical_id = DatabaseService.parse_uuid(app_id)
+        if not canonical_id:
+            raise AppError("Invalid app id", 404)
+        if self.db.get_app_by_id(canonical_id) is None:
+            raise AppError(f"App {canonical_id} not found", 404)
+        self._ensure_started()
+        launched_at = datetime.utcnow().isoformat()
+        with self._lock:
+            if canonical_id not in self._pending and len(self._pending) >= self.max_pending:
+                self._wakeup.set()
+                raise AppError("Too many launches pending, retry shortly", 503)
+            delta = self._pending.setdefault(canonical_id, {"count": 0, "last_launched": launched_at})
+            delta["count"] += 1
+            delta["last_launched"] = launched_at
+            self.launches += 1
+            pending: int = delta["count"]
+            should_flush = len(self._pending) >= self.flush_threshold
+        if should_flush:
+            self._wakeup.set()
+        return pending
+
+    def pending(self) -> Dict[str, int]:
+        """Return a snapshot of buffered launch counts by app ID."""
+        with self._lock:
+            return {app_id: delta["count"] for app_id, delta in self._pending.items()}
+
+    def flush(self) -> int:
+        """Write all buffered increments and return the number of apps flushed."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                self.db.increment_launch_counts(batch)
+                self.flushes += 1
+                return len(batch)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(batch)} launch increments, will retry: {e}")
+                self._requeue(batch)
+                return 0
+
+    def _requeue(self, batch: Dict[str, Dict[str, Any]]) -> None:
+        """Merge a failed batch back into the buffer."""
+        with self._lock:
+            for app_id, delta in batch.items():
+                current = self._pending.get(app_id)
+                if current is None:
+                    self._pending[app_id] = delta
+                else:
+                    current["count"] += delta["count"]
+                    current["last_launched"] = max(current["last_launched"], delta["last_launched"])
+
+    def _ensure_started(self) -> None:
+        """Start the flusher thread on first use, after any worker fork."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="launch-counter", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from ..models.exceptions import AppError
+from ..utils.metrics import run_in_context
+from .database import DatabaseService
+from .data_processing import DataProcessor
+from .popularity import POPULAR_SORT
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the bounded pool shared by all page loads, creating it on first use.
+
+    Only page-load fetches run here: anything slower (icon prefetches have
+    their own pool) would queue ahead of them and eat into their deadline.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=Config.PAGE_LOADER_WORKERS,
+                    thread_name_prefix="page-loader"
+                )
+    return _executor
+
+def page_query(args: Mapping[str, str]) -> Tuple[Optional[Dict[str, Any]], Optional[str], bool]:
+    """Return (filters, sort column, descending) for the ``category``/``sort``/``order`` args."""
+    category = args.get('category')
+    sort_by = args.get('sort')
+    order = args.get('order', 'asc')
+
+    # Unknown sort keys fall back to the default order
+    filters = {"category": category.lower()} if category else None
+    sort_column = DataProcessor.camel_to_snake(sort_by) if sort_by else None
+    if sort_column not in Config.SORTABLE_COLUMNS and sort_column != POPULAR_SORT:
+        sort_column = None
+    return filters, sort_column, order.lower() == 'desc'
+
+def assemble_page(apps: Optional[List[Dict]], settings_row: Optional[Dict], categories: List[str],
+                  facets: Optional[List[Dict]], errors: List[str]) -> Dict[str, Any]:
+    """Combine fetched page data, falling back to default settings; missing apps fail the load.
+
+    Without facets every category is listed with an unknown (None) app count.
+    """
+    if apps is None:
+        raise AppError("Failed to load apps", 500)
+    if not settings_row:
+        settings_row = DataProcessor.default_settings()
+    if facets is None:
+        facets = [{"name": name, "app_count": None, "last_modified": None, "listed": True} for name in categories]
+    return {
+        "apps": apps,
+        "settings": settings_row["settings"],
+        "metadata": settings_row["metadata"],
+        "categories": categories,
+        "facets": facets,
+        "errors": errors
+    }
+
+class PageLoader:
+    """Loads the apps, settings, categories and category facets behind a page concurrently.
+
+    The four fetches run on a shared bounded thread pool, so page latency is
+    the slowest round trip rather than the sum of all four. Each fetch has its
+    own timeout; settings, categories and facets fall back to defaults when they
+    fail or time out, while a failed apps fetch fails the whole load.
+    """
+
+    def __init__(self, db: DatabaseService, timeout: Optional[float] = None):
+        self.db = db
+        self.timeout = timeout if timeout is not None else Config.PAGE_LOAD_TIMEOUT
+
+    def page_data(self, args: Mapping[str, str]) -> Dict[str, Any]:
+        """Load and format page data for the ``category``/``sort``/``order`` query args."""
+        filters, sort_column, descending = page_query(args)
+        data = self.load(filters, sort=sort_column, descending=descending)
+        data["apps"] = DataProcessor.format_apps(data["apps"])
+        data["facets"] = DataProcessor.format_facets(data["facets"])
+        return data
+
+    def load(self, filters: Optional[Dict[str, Any]] = None, sort: Optional[str] = None,
+             descending: bool = False) -> Dict[str, Any]:
+        """Fetch everything a page needs and return the raw (unformatted) data."""
+        executor = get_executor()
+        deadline = time.monotonic() + self.timeout
+        # Workers run in a copy of the request's context so their DB timings
+        # land on the request's Server-Timing header
+        futures = {
+            "apps": executor.submit(run_in_context(
+                lambda: self.db.get_apps_page(filters, sort=sort, descending=descending)["apps"]
+            )),
+            "settings": executor.submit(run_in_context(self.db.get_settings)),
+            "categories": executor.submit(run_in_context(self.db.get_categories)),
+            "facets": executor.submit(run_in_context(self.db.get_category_facets))
+        }
+
+        errors: List[str] = []
+        apps = self._result("apps", futures["apps"], deadline, errors, fallback=None)
+        settings_row = self._result("settings", futures["settings"], deadline, errors, fallback=None)
+        categories = self._result(
+            "categories", futures["categories"], deadline, errors,
+            fallback=[Config.DEFAULT_CATEGORY]
+        )
+        facets = self._result("facets", futures["facets"], deadline, errors, fallback=None)
+        return assemble_page(apps, settings_row, categories, facets, errors)
+
+    @staticmethod
+    def _result(name: str, future: Future, deadline: float, errors: List[str], fallback: Any) -> Any:
+        """Wait for one fetch until the shared deadline, recording failures."""
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except TimeoutError:
+            # Frees the worker only if the fetch has not started; a running one finishes on its own
+            future.cancel()
+            logger.error(f"Timed out loading {name}")
+            errors.append(f"{name}: timed out")
+        except Exception as e:
+            logger.error(f"Failed to load {name}: {e}")
+            errors.append(f"{name}: {getattr(e, 'message', str(e))}")
+        return fallback
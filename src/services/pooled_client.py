@@ -0,0 +1,63 @@
+import threading
+from typing import Dict, Optional, Union, cast
+import httpx
+from postgrest import SyncPostgrestClient
+from postgrest.utils import SyncClient
+from supabase import Client
+from supabase.lib.client_options import ClientOptions
+
+class PooledClient(Client):
+    """Supabase client whose PostgREST calls share one keep-alive connection pool.
+
+    The stock client builds a fresh httpx session whenever its PostgREST client is
+    (re)created. This subclass owns a single session sized by ``limits`` and hands
+    it to every PostgREST client it builds, so connections and TLS sessions are
+    reused for the lifetime of the process.
+    """
+
+    def __init__(self, supabase_url: str, supabase_key: str, options: ClientOptions,
+                 limits: httpx.Limits):
+        self._limits = limits
+        self._session: Optional[SyncClient] = None
+        self._session_lock = threading.Lock()
+        super().__init__(supabase_url, supabase_key, options)
+
+    # The stock client's is a staticmethod; this one needs the instance's pool
+    def _init_postgrest_client(  # type: ignore[override]
+            self, rest_url: str, headers: Dict[str, str], schema: str,
+            timeout: Union[int, float, httpx.Timeout] = 5) -> SyncPostgrestClient:
+        """Build a PostgREST client bound to the shared pooled session."""
+        postgrest = SyncPostgrestClient(rest_url, headers=headers, schema=schema, timeout=timeout)
+        with self._session_lock:
+            if self._session is None:
+                self._session = SyncClient(
+                    base_url=postgrest.session.base_url,
+                    headers=postgrest.session.headers,
+                    timeout=timeout,
+                    limits=self._limits
+                )
+            else:
+                # Auth state changed: keep the pool but pick up the new headers
+                self._session.headers = postgrest.session.headers
+        cast(SyncClient, postgrest.session).close()
+        postgrest.session = self._session
+        return postgrest
+
+    def close(self) -> None:
+        """Close the pooled HTTP session."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+def create_pooled_client(url: str, key: str, pool_size: int, keepalive: int,
+                         connect_timeout: float, read_timeout: float) -> PooledClient:
+    """Create a Supabase client backed by a bounded keep-alive connection pool."""
+    options = ClientOptions(
+        postgrest_client_timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+    )
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=min(keepalive, pool_size)
+    )
+    return PooledClient(url, key, options, limits)
@@ -0,0 +1,287 @@
+import heapq
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from ..models.exceptions import AppError
+from .database import decode_cursor, encode_cursor
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Sort key for GET /api/apps and / that ranks apps by decayed launch score
+POPULAR_SORT = "popular"
+
+# Stored scores grow as e^(rate * (t - epoch)); past this exponent they are
+# rescaled to a new epoch, long before floats run out of range
+_REBASE_EXPONENT = 64.0
+
+def popular_start(cursor: Optional[str]) -> int:
+    """Position in the popular ordering that a ``sort=popular`` cursor points at."""
+    if not cursor:
+        return 0
+    position, _, _ = decode_cursor(cursor)
+    if not isinstance(position, int) or position < 0:
+        raise AppError("Invalid cursor")
+    return position
+
+def popular_page(apps: List[Dict[str, Any]], start: int, limit: Optional[int]) -> Dict[str, Any]:
+    """Cut a ``get_apps_page`` result from the popular ordering, starting at ``start``.
+
+    ``apps`` may stop short of the whole ordering as long as it reaches past
+    the page, so that a next page is known to exist.
+    """
+    if limit is None:
+        return {"apps": apps, "next_cursor": None, "prev_cursor": None}
+    rows = apps[start:start + limit]
+    if not rows:
+        return {"apps": [], "next_cursor": None, "prev_cursor": None}
+    return {
+        "apps": rows,
+        "next_cursor": encode_cursor(start + limit, rows[-1]["id"], "next")
+        if len(apps) > start + limit else None,
+        "prev_cursor": encode_cursor(max(0, start - limit), rows[0]["id"], "prev") if start else None
+    }
+
+class PopularityTracker:
+    """Exponentially decayed launch scores with an incrementally maintained top K.
+
+    An app's score sums ``2 ** (-age / half_life)`` over its launches. Every
+    score decays at the same rate, so the ranking only changes when an app is
+    launched: scores are stored relative to a fixed epoch (a launch at time
+    ``t`` adds ``e^(rate * (t - epoch))``), never need decaying and only ever
+    grow. The ``top_k`` highest sit in a min-heap indexed by app ID, so a
+    launch either raises an entry already in the heap or replaces its minimum,
+    in O(log K) either way; an app outside the heap can only overtake the
+    minimum by being launched itself. Removing a ranked app refills the heap
+    with one pass over the scores.
+
+    Scores are seeded from the launch rollup in the database and re-read every
+    ``max_age`` seconds to pick up launches written by other processes;
+    launches recorded while they are being read are replayed onto them.
+    """
+
+    def __init__(self, half_life_hours: float, top_k: int, max_age: float):
+        self.rate = math.log(2) / (half_life_hours * 3600)
+        self.top_k = top_k
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._epoch = time.time()
+        self._scores: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._positions: Dict[str, int] = {}
+        self._ranking: Optional[List[str]] = None
+        self._journal: Optional[List[Tuple[str, int, float]]] = None
+        self._rebuilds = 0
+        self._built_at: Optional[float] = None
+        self._refreshing = False
+        self.launches = 0
+        self.builds = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether scores have been read from the database, even if not recently."""
+        return self._built_at is not None
+
+    def is_current(self) -> bool:
+        """Whether scores were read from the database within ``max_age`` seconds."""
+        with self._lock:
+            return self._built_at is not None and time.monotonic() - self._built_at <= self.max_age
+
+    def claim_refresh(self) -> bool:
+        """Claim the background re-read of stale scores; False if one is already running."""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            return True
+
+    def release_refresh(self) -> None:
+        with self._lock:
+            self._refreshing = False
+
+    def record(self, app_id: str, count: int = 1) -> None:
+        """Add launches of one app, made now."""
+        self.record_many({app_id: count})
+
+    def record_many(self, counts: Mapping[str, int]) -> None:
+        """Add launches made now, given as counts by app ID."""
+        at = time.time()
+        with self._lock:
+            for app_id, count in counts.items():
+                self.launches += count
+                if self._journal is not None:
+                    self._journal.append((app_id, count, at))
+                self._add(app_id, count, at)
+
+    def remove(self, app_ids: Iterable[str]) -> None:
+        """Forget deleted apps."""
+        with self._lock:
+            refill = False
+            for app_id in app_ids:
+                if self._scores.pop(app_id, None) is None:
+                    continue
+                position = self._positions.pop(app_id, None)
+                if position is not None:
+                    self._remove_at(position)
+                    refill = True
+            if refill:
+                self._refill()
+                self._ranking = None
+
+    def ranking(self) -> List[str]:
+        """IDs of the top K apps, most popular first. The list must not be modified."""
+        with self._lock:
+            if self._ranking is None:
+                self._ranking = [app_id for _, app_id in sorted(self._heap, reverse=True)]
+            return self._ranking
+
+    def ranked_rows(self, ranking: List[str], rows: Iterable[Dict[str, Any]],
+                    filters: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Put the rows of ranked apps in ``ranking`` order, keeping those matching ``filters``.
+
+        Ranked IDs without a row (deleted by another process, or launches
+        recorded for an unknown ID) are forgotten.
+        """
+        by_id = {row["id"]: row for row in rows}
+        missing = [app_id for app_id in ranking if app_id not in by_id]
+        if missing:
+            self.remove(missing)
+        conditions = (filters or {}).items()
+        return [
+            by_id[app_id] for app_id in ranking
+            if app_id in by_id and all(by_id[app_id].get(key) == value for key, value in conditions)
+        ]
+
+    def begin_rebuild(self) -> int:
+        """Start journaling launches before scores are read; pass the result to ``end_rebuild``."""
+        with self._lock:
+            if self._journal is None:
+                self._journal = []
+            self._rebuilds += 1
+            return len(self._journal)
+
+    def end_rebuild(self, mark: int, scores: Optional[Dict[str, float]]) -> None:
+        """Replace every score with ``scores`` (decayed to now), replaying launches journaled since ``mark``.
+
+        ``scores`` is None when reading them failed, which just ends the journaling.
+        """
+        if scores is not None:
+            epoch = time.time()
+            heap = heapq.nlargest(self.top_k, ((score, app_id) for app_id, score in scores.items() if score > 0))
+            heapq.heapify(heap)
+            positions = {app_id: position for position, (_, app_id) in enumerate(heap)}
+        with self._lock:
+            journal = (self._journal or [])[mark:]
+            self._rebuilds -= 1
+            if not self._rebuilds:
+                self._journal = None
+            if scores is None:
+                return
+            self._epoch = epoch
+            self._scores = {app_id: score for app_id, score in scores.items() if score > 0}
+            self._heap, self._positions = heap, positions
+            self._ranking = None
+            for app_id, count, at in journal:
+                self._add(app_id, count, at)
+            self._built_at = time.monotonic()
+            self.builds += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "apps": len(self._scores),
+                "ranked": len(self._heap),
+                "topK": self.top_k,
+                "launches": self.launches,
+                "builds": self.builds,
+                "current": self._built_at is not None and time.monotonic() - self._built_at <= self.max_age,
+                "age": round(time.monotonic() - self._built_at, 3) if self._built_at is not None else None
+            }
+
+    def _add(self, app_id: str, count: int, at: float) -> None:
+        exponent = self.rate * (at - self._epoch)
+        if exponent > _REBASE_EXPONENT:
+            self._rebase(at)
+            exponent = 0.0
+        score = self._scores.get(app_id, 0.0) + count * math.exp(exponent)
+        self._scores[app_id] = score
+        entry = (score, app_id)
+        position = self._positions.get(app_id)
+        if position is not None:
+            # Scores only grow, so the entry can only move away from the root
+            self._heap[position] = entry
+            self._sift_down(position)
+        elif len(self._heap) < self.top_k:
+            self._heap.append(entry)
+            self._sift_up(len(self._heap) - 1)
+        elif entry > self._heap[0]:
+            del self._positions[self._heap[0][1]]
+            self._heap[0] = entry
+            self._sift_down(0)
+        else:
+            return
+        self._ranking = None
+
+    def _rebase(self, at: float) -> None:
+        """Rescale every score to a new epoch; a uniform scale keeps the heap ordered."""
+        factor = math.exp(-self.rate * (at - self._epoch))
+        self._scores = {app_id: score * factor for app_id, score in self._scores.items()}
+        self._heap = [(score * factor, app_id) for score, app_id in self._heap]
+        self._epoch = at
+
+    def _remove_at(self, position: int) -> None:
+        last = self._heap.pop()
+        if position < len(self._heap):
+            self._heap[position] = last
+            self._sift_up(position)
+            self._sift_down(self._positions[last[1]])
+
+    def _refill(self) -> None:
+        """Top the heap back up to K with the best apps outside it."""
+        missing = self.top_k - len(self._heap)
+        if missing <= 0:
+            return
+        positions = self._positions
+        for entry in heapq.nlargest(missing, (
+            (score, app_id) for app_id, score in self._scores.items() if app_id not in positions
+        )):
+            self._heap.append(entry)
+            self._sift_up(len(self._heap) - 1)
+
+    def _sift_up(self, position: int) -> None:
+        heap, positions = self._heap, self._positions
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if heap[parent] <= entry:
+                break
+            heap[position] = heap[parent]
+            positions[heap[position][1]] = position
+            position = parent
+        heap[position] = entry
+        positions[entry[1]] = position
+
+    def _sift_down(self, position: int) -> None:
+        heap, positions = self._heap, self._positions
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]:
+                break
+            heap[position] = heap[child]
+            positions[heap[position][1]] = position
+            position = child
+        heap[position] = entry
+        positions[entry[1]] = position
+
+# Process-wide tracker, fed by launches written through CachedDatabaseService
+popularity = PopularityTracker(
+    Config.POPULARITY_HALF_LIFE_HOURS, Config.POPULARITY_TOP_K, Config.POPULARITY_REFRESH_SECONDS
+)
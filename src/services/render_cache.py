@@ -0,0 +1,98 @@
+import gzip
+import logging
+from typing import Any, Dict, List, Mapping, NamedTuple, Tuple
+from flask import current_app, render_template
+from markupsafe import Markup
+from .cache import CachedDatabaseService, TTLCache
+from .page_loader import PageLoader
+from ..utils.conditional import catalog_etag
+from ..utils.metrics import timed
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class RenderedPage(NamedTuple):
+    """A rendered page with its precompressed variant."""
+    body: bytes
+    gzipped: bytes
+    etag: str
+
+# Whole pages, keyed by their catalog ETag (query args and catalog version),
+# so a write never makes one stale; pages of older versions age out by LRU.
+page_cache = TTLCache(
+    Config.RENDER_CACHE_TTL, Config.PAGE_CACHE_MAX_ENTRIES,
+    weigher=lambda page: len(page.body) + len(page.gzipped),
+    max_weight=Config.PAGE_CACHE_MAX_BYTES
+)
+
+# Per-app card fragments, keyed by the card's own inputs, so writes never make
+# them stale and a page re-render after one app changes re-renders one card
+card_cache = TTLCache(
+    Config.RENDER_CACHE_TTL, Config.CARD_CACHE_MAX_ENTRIES,
+    weigher=len,
+    max_weight=Config.CARD_CACHE_MAX_BYTES
+)
+
+def render_cards(apps: List[Dict[str, Any]], settings: Dict[str, Any]) -> List[Markup]:
+    """Render one ``app_card.html`` fragment per app, reusing cached fragments."""
+    template = None
+    icon_size = settings.get("iconSize")
+    data = {"settings": settings}
+    cards = []
+    with timed("render", "cards"):
+        for app in apps:
+            key = (icon_size, tuple(app.items()))
+            found, card = card_cache.get(key)
+            if not found:
+                if template is None:
+                    template = current_app.jinja_env.get_template("components/app_card.html")
+                card = Markup(template.render(app=app, data=data))
+                card_cache.set(key, card)
+            cards.append(card)
+    return cards
+
+class IndexRenderer:
+    """Renders ``index.html`` once per (query args, catalog version).
+
+    A warm hit returns the cached bytes and their gzip variant without loading
+    data or running any template. Pages rendered from fallback data (a
+    settings or categories fetch failed) are served but not cached.
+    """
+
+    def __init__(self, db: CachedDatabaseService):
+        self.db = db
+        self.loader = PageLoader(db)
+
+    def render(self, args: Mapping[str, str]) -> RenderedPage:
+        """Return the rendered page for the ``category``/``sort``/``order`` query args."""
+        try:
+            version = self.db.get_catalog_version()
+        except Exception as e:
+            logger.warning(f"Catalog version unavailable, rendering uncached: {e}")
+            return self._render(args, etag="")[0]
+
+        scope = "|".join((
+            "index",
+            (args.get('category') or '').lower(),
+            args.get('sort') or '',
+            args.get('order', 'asc').lower()
+        ))
+        etag = catalog_etag(version, scope)
+        page: RenderedPage
+        found, page = page_cache.get(etag)
+        if found:
+            return page
+
+        generation = page_cache.generation
+        page, complete = self._render(args, etag)
+        if complete:
+            page_cache.set(etag, page, generation)
+        return page
+
+    def _render(self, args: Mapping[str, str], etag: str) -> Tuple[RenderedPage, bool]:
+        """Render the page; the flag is False when it was built from fallback data."""
+        data = self.loader.page_data(args)
+        data["cards"] = render_cards(data["apps"], data["settings"])
+        body = render_template('index.html', data=data).encode()
+        page = RenderedPage(body, gzip.compress(body, Config.RENDER_GZIP_LEVEL), etag)
+        return page, not data["errors"]
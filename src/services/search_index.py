@@ -0,0 +1,330 @@
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from ..utils.metrics import timed_function
+from .database import parse_timestamp
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+# Smallest trigram similarity (Jaccard) for a fuzzy match
+FUZZY_MIN_SIMILARITY = 0.3
+# Trigrams shared by more apps than this are too common to tell names apart,
+# and are skipped so a fuzzy lookup stays cheap on large catalogs
+FUZZY_MAX_POSTINGS = 1000
+
+def normalize(text: str) -> str:
+    """Case-fold and strip accents, so "Café" and "cafe" index the same."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of a normalized string, padded so word starts and ends count."""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class IndexedApp(NamedTuple):
+    """The fields of an app the index searches and returns."""
+    serial: int
+    id: str
+    name: str
+    category: str
+    icon_url: str
+    key: str
+    words: Tuple[str, ...]
+    gram_count: int
+    modified: Optional[datetime]
+
+def _span(entries: Sequence[Tuple], prefix: str) -> range:
+    """Positions of the entries of a sorted list whose first element starts with ``prefix``."""
+    return range(bisect.bisect_left(entries, (prefix,)), bisect.bisect_left(entries, (prefix + "\U0010ffff",)))
+
+class SearchIndex:
+    """In-process typeahead index over app names and categories.
+
+    Three sorted lists answer prefix queries with a bisect and a short scan:
+    whole names, every word of every name, and categories. A trigram index
+    backs fuzzy matching when prefixes find too little; its postings hold
+    per-document serial numbers, so removing an app only forgets its serial. Writes made through
+    this process update the index in place; changes made by other workers
+    are noticed when the catalog's app count or newest modification time no
+    longer matches the index (with the snapshot, its app count or build), and
+    the index is rebuilt at least every ``SEARCH_INDEX_MAX_AGE`` seconds. Once
+    built, a stale index keeps answering while one rebuild runs in the
+    background (see ``claim_refresh``).
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._docs: Dict[str, IndexedApp] = {}
+        self._serials: Dict[int, IndexedApp] = {}
+        self._next_serial = 0
+        self._names: List[Tuple[str, str]] = []
+        self._words: List[Tuple[str, str, str]] = []
+        self._categories: List[Tuple[str, str, str]] = []
+        self._grams: Dict[str, List[int]] = {}
+        self._newest: Optional[datetime] = None
+        self._newest_stale = False
+        self._snapshot: Optional[float] = None
+        self._built_at: Optional[float] = None
+        self._invalidated = False
+        self._refreshing = False
+        self.builds = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been built and can answer, even if stale."""
+        return self._built_at is not None
+
+    def is_current(self, version: Dict[str, Any]) -> bool:
+        """Whether the index reflects the catalog described by ``version``."""
+        with self._lock:
+            if self._built_at is None or self._invalidated or time.monotonic() - self._built_at > self.max_age:
+                return False
+            if "snapshot" in version:
+                return version["snapshot"] == self._snapshot and version.get("apps") == len(self._docs)
+            if version.get("apps_count") != len(self._docs):
+                return False
+            modified = version.get("apps_modified")
+            return (parse_timestamp(modified) if modified else None) == self._newest_modified()
+
+    @timed_function("process", "search_index_build")
+    def rebuild(self, apps: Iterable[Dict[str, Any]], version: Dict[str, Any]) -> None:
+        """Replace the index with ``apps``, unless another thread already brought it up to date.
+
+        The new index is built aside and swapped in, so searches keep being
+        answered meanwhile; rebuilds themselves run one at a time.
+        """
+        with self._build_lock:
+            if self.is_current(version):
+                return
+            fresh = SearchIndex(self.max_age)
+            names: List[Tuple[str, str]] = []
+            words: List[Tuple[str, str, str]] = []
+            categories: List[Tuple[str, str, str]] = []
+            for row in apps:
+                doc = fresh._add(row)
+                names.append((doc.key, doc.id))
+                words.extend((word, doc.key, doc.id) for word in doc.words)
+                categories.append((doc.category, doc.key, doc.id))
+            names.sort()
+            words.sort()
+            categories.sort()
+            with self._lock:
+                self._docs, self._serials, self._grams = fresh._docs, fresh._serials, fresh._grams
+                self._next_serial = fresh._next_serial
+                self._names, self._words, self._categories = names, words, categories
+                self._newest, self._newest_stale = fresh._newest, False
+                self._snapshot = version.get("snapshot")
+                self._built_at = time.monotonic()
+                self._invalidated = False
+                self.builds += 1
+
+    def claim_refresh(self) -> bool:
+        """Claim the background rebuild of a stale index; False if one is already running."""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            return True
+
+    def release_refresh(self) -> None:
+        with self._lock:
+            self._refreshing = False
+
+    def upsert(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Add or replace apps after a write."""
+        with self._lock:
+            if not self.ready:
+                return
+            for row in rows:
+                current = self._docs.get(row["id"])
+                if current is not None and (current.name, current.category, current.icon_url) == self._fields(row):
+                    # Launches and other writes that leave the indexed fields alone
+                    modified = self._modified(row)
+                    self._docs[current.id] = self._serials[current.serial] = current._replace(modified=modified)
+                    self._track_newest(modified)
+                    continue
+                self._remove(row["id"])
+                doc = self._add(row)
+                bisect.insort(self._names, (doc.key, doc.id))
+                for word in doc.words:
+                    bisect.insort(self._words, (word, doc.key, doc.id))
+                bisect.insort(self._categories, (doc.category, doc.key, doc.id))
+
+    def remove(self, app_ids: Iterable[str]) -> None:
+        """Drop deleted apps."""
+        with self._lock:
+            if not self.ready:
+                return
+            for app_id in app_ids:
+                self._remove(app_id)
+
+    def invalidate(self) -> None:
+        """Rebuild on the next search, after a write the index can't follow row by row."""
+        with self._lock:
+            self._invalidated = True
+
+    @timed_function("process", "search")
+    def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` apps matching ``query``, best first.
+
+        Apps whose name starts with the query come first, then apps with a
+        word starting with each query word, then apps in a category starting
+        with the query, each group alphabetically; remaining slots are filled
+        with fuzzy (trigram) matches by similarity. Each result carries its
+        ``match`` kind.
+        """
+        key = " ".join(_WORD.findall(normalize(query)))
+        if not key:
+            return []
+        with self._lock:
+            matches: Dict[str, str] = {}
+            names = self._names
+            for i in _span(names, key):
+                matches.setdefault(names[i][1], "prefix")
+                if len(matches) >= limit:
+                    return self._results(matches)
+
+            # Scan the query word with the fewest matching words, checking the others per app
+            query_words = key.split()
+            words = self._words
+            span = min((_span(words, word) for word in query_words), key=len)
+            for i in span:
+                app_id = words[i][2]
+                if app_id in matches:
+                    continue
+                app_words = self._docs[app_id].words
+                if all(any(word.startswith(q) for word in app_words) for q in query_words):
+                    matches[app_id] = "word"
+                    if len(matches) >= limit:
+                        return self._results(matches)
+
+            categories = self._categories
+            for i in _span(categories, key):
+                matches.setdefault(categories[i][2], "category")
+                if len(matches) >= limit:
+                    return self._results(matches)
+
+            if len(key) >= 3:
+                self._fuzzy(key, limit - len(matches), matches)
+            return self._results(matches)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "apps": len(self._docs),
+                "words": len(self._words),
+                "trigrams": len(self._grams),
+                "builds": self.builds,
+                "current": not self._invalidated,
+                "age": round(time.monotonic() - self._built_at, 3) if self._built_at is not None else None
+            }
+
+    def _fuzzy(self, key: str, count: int, matches: Dict[str, str]) -> None:
+        grams = trigrams(key)
+        shared: Counter = Counter()
+        for gram in grams:
+            postings = self._grams.get(gram, ())
+            if len(postings) <= FUZZY_MAX_POSTINGS:
+                shared.update(postings)
+        scored = []
+        for serial, hits in shared.items():
+            doc = self._serials.get(serial)
+            if doc is None or doc.id in matches:
+                continue
+            similarity = hits / (len(grams) + doc.gram_count - hits)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                scored.append((similarity, doc.key, doc.id))
+        # Most similar first, then alphabetically
+        for _, _, app_id in heapq.nsmallest(count, scored, key=lambda item: (-item[0], item[1])):
+            matches[app_id] = "fuzzy"
+
+    def _results(self, matches: Dict[str, str]) -> List[Dict[str, Any]]:
+        results = []
+        for app_id, match in matches.items():
+            doc = self._docs[app_id]
+            results.append({
+                "id": doc.id,
+                "name": doc.name,
+                "category": doc.category,
+                "icon_url": doc.icon_url,
+                "match": match
+            })
+        return results
+
+    def _add(self, row: Dict[str, Any]) -> IndexedApp:
+        """Record an app's document and trigrams; the caller adds its sorted-list entries."""
+        name, category, icon_url = self._fields(row)
+        key = " ".join(_WORD.findall(normalize(name)))
+        grams = trigrams(key)
+        modified = self._modified(row)
+        serial = self._next_serial
+        self._next_serial += 1
+        doc = IndexedApp(serial, row["id"], name, category, icon_url, key,
+                         tuple(dict.fromkeys(key.split())), len(grams), modified)
+        self._docs[doc.id] = self._serials[serial] = doc
+        postings = self._grams
+        for gram in grams:
+            if gram in postings:
+                postings[gram].append(serial)
+            else:
+                postings[gram] = [serial]
+        self._track_newest(modified)
+        return doc
+
+    @staticmethod
+    def _fields(row: Dict[str, Any]) -> Tuple[str, str, str]:
+        """The name, normalized category and icon URL the index keeps for a row."""
+        return row.get("name") or "", normalize(row.get("category") or ""), row.get("icon_url") or ""
+
+    @staticmethod
+    def _modified(row: Dict[str, Any]) -> Optional[datetime]:
+        return parse_timestamp(row["last_modified"]) if row.get("last_modified") else None
+
+    def _track_newest(self, modified: Optional[datetime]) -> None:
+        if modified is not None and not self._newest_stale and (self._newest is None or modified > self._newest):
+            self._newest = modified
+
+    def _remove(self, app_id: str) -> None:
+        doc = self._docs.pop(app_id, None)
+        if doc is None:
+            return
+        self._delete(self._names, (doc.key, doc.id))
+        for word in doc.words:
+            self._delete(self._words, (word, doc.key, doc.id))
+        self._delete(self._categories, (doc.category, doc.key, doc.id))
+        # Its trigram postings go stale and are dropped at the next rebuild
+        del self._serials[doc.serial]
+        if doc.modified is not None and doc.modified == self._newest:
+            # Recomputed when next needed
+            self._newest_stale = True
+
+    @staticmethod
+    def _delete(entries: List[Tuple], entry: Tuple) -> None:
+        i = bisect.bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+
+    def _newest_modified(self) -> Optional[datetime]:
+        if self._newest_stale:
+            self._newest = max((doc.modified for doc in self._docs.values() if doc.modified is not None),
+                               default=None)
+            self._newest_stale = False
+        return self._newest
+
+# Process-wide index, kept current by CachedDatabaseService writes
+search_index = SearchIndex(Config.SEARCH_INDEX_MAX_AGE)
@@ -0,0 +1,764 @@
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple, TypeVar
+from .database import DatabaseService
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# File layout, all little-endian:
+#   header | records (fixed width, sorted by id) | string heap (UTF-8) | meta (JSON)
+# A record holds launch_count, an (offset, length) heap reference for each text
+# column and the two timestamps inline, so the launch columns can be patched in
+# place without moving anything else. The header's sequence doubles as a
+# seqlock for those patches: it is odd while one is being written, and every
+# published file starts at an even sequence.
+MAGIC = b"LCAT"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHQdIIQQQQQ")
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_OFFSET = 8
+RECORD = struct.Struct("<q10I40s40s")
+TEXT_COLUMNS = ("id", "name", "category", "icon_url", "app_store_link")
+# The only columns patched in place; every other column is fixed for a file's life
+LAUNCH_COLUMNS = ("launch_count", "last_launched")
+LAUNCH_COUNT = struct.Struct("<q")
+LAST_LAUNCHED_OFFSET = 88
+NULL_LENGTH = 0xFFFFFFFF
+NULL_COUNT = -(2 ** 63)
+TIMESTAMP_WIDTH = 40
+
+_REFERENCE = struct.Struct("<II")
+# Heaps smaller than this are never compacted
+MIN_COMPACT_HEAP = 64 * 1024
+# How long a reader waits out a launch patch before reading anyway
+SEQLOCK_TIMEOUT = 1.0
+
+T = TypeVar("T")
+
+def _text_reader(index: int) -> Callable[["CatalogSnapshot", int], Optional[str]]:
+    position = 8 + 8 * index
+
+    def read(snapshot: "CatalogSnapshot", offset: int) -> Optional[str]:
+        start, length = _REFERENCE.unpack_from(snapshot.buffer, offset + position)
+        if length == NULL_LENGTH:
+            return None
+        start += snapshot.heap_offset
+        return str(snapshot.buffer[start:start + length], "utf-8")
+    return read
+
+def _timestamp_reader(position: int) -> Callable[["CatalogSnapshot", int], Optional[str]]:
+    def read(snapshot: "CatalogSnapshot", offset: int) -> Optional[str]:
+        start = offset + position
+        if position == LAST_LAUNCHED_OFFSET:
+            raw = snapshot.consistent(lambda: snapshot.buffer[start:start + TIMESTAMP_WIDTH])
+        else:
+            raw = snapshot.buffer[start:start + TIMESTAMP_WIDTH]
+        raw = raw.rstrip(b"\0")
+        return raw.decode() if raw else None
+    return read
+
+def _read_launch_count(snapshot: "CatalogSnapshot", offset: int) -> Optional[int]:
+    value = snapshot.consistent(lambda: LAUNCH_COUNT.unpack_from(snapshot.buffer, offset)[0])
+    return None if value == NULL_COUNT else value
+
+_READERS: Dict[str, Callable[["CatalogSnapshot", int], Any]] = {
+    **{column: _text_reader(i) for i, column in enumerate(TEXT_COLUMNS)},
+    "launch_count": _read_launch_count,
+    "last_modified": _timestamp_reader(48),
+    "last_launched": _timestamp_reader(LAST_LAUNCHED_OFFSET)
+}
+
+class AppRecord:
+    """Read-only view of one app row inside a snapshot.
+
+    Supports the mapping operations rows are used with (``row[col]``, ``get``,
+    ``keys``, ``dict(row)``) and decodes a column only when it is read, so a
+    worker holds two references per app instead of a dict of strings.
+    """
+
+    __slots__ = ("_snapshot", "_offset")
+
+    def __init__(self, snapshot: "CatalogSnapshot", offset: int):
+        self._snapshot = snapshot
+        self._offset = offset
+
+    def __getitem__(self, column: str) -> Any:
+        try:
+            reader = _READERS[column]
+        except KeyError:
+            raise KeyError(column) from None
+        return reader(self._snapshot, self._offset)
+
+    def get(self, column: str, default: Any = None) -> Any:
+        reader = _READERS.get(column)
+        return reader(self._snapshot, self._offset) if reader else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return Config.APP_COLUMNS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(Config.APP_COLUMNS)
+
+    def __len__(self) -> int:
+        return len(Config.APP_COLUMNS)
+
+    def __contains__(self, column: object) -> bool:
+        return column in _READERS
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(column, self[column]) for column in Config.APP_COLUMNS]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"AppRecord({self.to_dict()!r})"
+
+class CatalogSnapshot:
+    """A published snapshot file, memory-mapped read-only.
+
+    The mapping is shared, so launch counts patched in place by any worker are
+    visible here immediately; a republished file is a new inode, which
+    ``SnapshotStore`` notices and maps instead.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.identity = (stat.st_dev, stat.st_ino)
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, _, self.built_at, self.count, record_size, self.rows_offset,
+         self.heap_offset, self.heap_size, meta_offset, meta_size) = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.size:
+            raise ValueError(f"Unsupported snapshot format in {path}")
+        meta = json.loads(self.buffer[meta_offset:meta_offset + meta_size])
+        self.categories: List[str] = meta["categories"]
+        self.settings: Optional[Dict[str, Any]] = meta["settings"]
+        self.meta = meta
+        self._records: Optional[List[AppRecord]] = None
+        # Decoded columns and record orders, keyed by the sequence they were read at
+        # when they involve a launch column and by None otherwise
+        self._columns: Dict[str, Tuple[Optional[int], List[Any]]] = {}
+        self._orders: Dict[Tuple, array] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def sequence(self) -> int:
+        """Version counter, bumped by every publish and in-place patch (odd during a patch)."""
+        sequence: int = SEQUENCE.unpack_from(self.buffer, SEQUENCE_OFFSET)[0]
+        return sequence
+
+    def consistent(self, read: Callable[[], T]) -> T:
+        """Run ``read`` over launch columns, retrying if a patch overlapped it.
+
+        Another worker may be patching the live file; reading only while the
+        sequence is even and unchanged afterwards means no half-written
+        launch count or timestamp is returned.
+        """
+        deadline = None
+        while True:
+            before = self.sequence
+            if not before % 2:
+                value = read()
+                if self.sequence == before:
+                    return value
+            if deadline is None:
+                deadline = time.monotonic() + SEQLOCK_TIMEOUT
+            elif time.monotonic() > deadline:
+                # A patcher that died mid-write; the next publish clears it
+                logger.warning(f"Snapshot sequence {before} stuck mid-patch, reading anyway")
+                return read()
+            time.sleep(0)
+
+    @property
+    def version(self) -> Dict[str, Any]:
+        return {"snapshot": self.built_at, "sequence": self.sequence, "apps": self.count}
+
+    def records(self) -> List[AppRecord]:
+        """Every app, in ID order; the views are created once per snapshot."""
+        if self._records is None:
+            with self._lock:
+                if self._records is None:
+                    self._records = [
+                        AppRecord(self, self.rows_offset + i * RECORD.size) for i in range(self.count)
+                    ]
+        return self._records
+
+    def column(self, column: str) -> List[Any]:
+        """Every record's value of one column, in ID order. The list must not be modified.
+
+        Decoded once per file, or once per patch for the launch columns.
+        """
+        # Read before decoding, so a patch landing meanwhile can only make the values newer than their key
+        sequence = self.sequence if column in LAUNCH_COLUMNS else None
+        cached = self._columns.get(column)
+        if cached is not None and cached[0] == sequence:
+            return cached[1]
+        values = self._decode_column(column)
+        with self._lock:
+            self._columns[column] = (sequence, values)
+        return values
+
+    def _decode_column(self, column: str) -> List[Any]:
+        """Decode one column for every record in a single pass over the file."""
+        fields = RECORD.iter_unpack(self.consistent(lambda: self.raw_records(0, self.count)))
+        if column == "launch_count":
+            return [None if f[0] == NULL_COUNT else f[0] for f in fields]
+        if column in ("last_modified", "last_launched"):
+            position = 11 if column == "last_modified" else 12
+            return [f[position].rstrip(b"\0").decode() or None for f in fields]
+        position = 1 + 2 * TEXT_COLUMNS.index(column)
+        heap = self.raw_heap()
+        return [
+            None if f[position + 1] == NULL_LENGTH
+            else str(heap[f[position]:f[position] + f[position + 1]], "utf-8")
+            for f in fields
+        ]
+
+    def ordered(self, order: Tuple[Tuple[str, bool], ...]) -> array:
+        """Record indexes sorted by ``(column, descending)`` keys.
+
+        Memoized for the file's life; orders over a launch column only until the next patch.
+        """
+        volatile = any(column in LAUNCH_COLUMNS for column, _ in order)
+        key = (order, self.sequence if volatile else None)
+        indexes = self._orders.get(key)
+        if indexes is None:
+            ordered = list(range(self.count))
+            if order == (("id", False),):
+                pass  # Records are stored in ID order
+            elif order == (("id", True),):
+                ordered.reverse()
+            else:
+                # Stable sorts from the last key to the first give a multi-column order
+                for column, desc in reversed(order):
+                    values = [(value is None, value) for value in self.column(column)]
+                    ordered.sort(key=values.__getitem__, reverse=desc)
+            indexes = array("I", ordered)
+            with self._lock:
+                if volatile:
+                    for stale in [cached for cached in self._orders if cached[1] not in (None, key[1])]:
+                        del self._orders[stale]
+                self._orders[key] = indexes
+        return indexes
+
+    def id_at(self, index: int) -> str:
+        app_id: str = _READERS["id"](self, self.rows_offset + index * RECORD.size)
+        return app_id
+
+    def bisect(self, app_id: str) -> int:
+        """Return the index of the first record whose ID is not less than ``app_id``."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.id_at(middle) < app_id:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find(self, app_id: str) -> Optional[AppRecord]:
+        index = self.bisect(app_id)
+        if index < self.count and self.id_at(index) == app_id:
+            return AppRecord(self, self.rows_offset + index * RECORD.size)
+        return None
+
+    def raw_records(self, start: int, end: int) -> bytes:
+        return self.buffer[self.rows_offset + start * RECORD.size:self.rows_offset + end * RECORD.size]
+
+    def raw_heap(self) -> bytes:
+        return self.buffer[self.heap_offset:self.heap_offset + self.heap_size]
+
+class _Builder:
+    """Accumulates records and the string heap for a new snapshot file."""
+
+    def __init__(self, heap: bytes = b""):
+        self.heap = bytearray(heap)
+        self._strings: Dict[bytes, Tuple[int, int]] = {}
+
+    def reference(self, value: Any) -> Tuple[int, int]:
+        if value is None:
+            return 0, NULL_LENGTH
+        return self.reference_bytes(str(value).encode())
+
+    def reference_bytes(self, data: bytes) -> Tuple[int, int]:
+        reference = self._strings.get(data)
+        if reference is None:
+            reference = self._strings[data] = (len(self.heap), len(data))
+            self.heap += data
+        return reference
+
+    def reuse(self, fields: Tuple[Any, ...]) -> None:
+        """Let new records point at the heap strings of an unpacked existing record."""
+        for position in range(1, 1 + 2 * len(TEXT_COLUMNS), 2):
+            start, length = fields[position], fields[position + 1]
+            if length != NULL_LENGTH:
+                self._strings.setdefault(bytes(self.heap[start:start + length]), (start, length))
+
+    def record(self, row: Dict[str, Any]) -> bytes:
+        references: List[int] = []
+        for column in TEXT_COLUMNS:
+            references.extend(self.reference(row.get(column)))
+        count = row.get("launch_count")
+        return RECORD.pack(
+            NULL_COUNT if count is None else int(count), *references,
+            _timestamp(row.get("last_modified")), _timestamp(row.get("last_launched"))
+        )
+
+def _compact(records: bytes, heap: bytes) -> Tuple[bytes, bytearray]:
+    """Rewrite records against a fresh heap holding only the strings they reference."""
+    heap = bytes(heap)
+    builder = _Builder()
+    packed = []
+    for fields in RECORD.iter_unpack(records):
+        references: List[int] = []
+        for position in range(1, 1 + 2 * len(TEXT_COLUMNS), 2):
+            start, length = fields[position], fields[position + 1]
+            if length == NULL_LENGTH:
+                references.extend((0, NULL_LENGTH))
+            else:
+                references.extend(builder.reference_bytes(heap[start:start + length]))
+        packed.append(RECORD.pack(fields[0], *references, fields[-2], fields[-1]))
+    return b"".join(packed), builder.heap
+
+def _next_sequence(previous: Optional[CatalogSnapshot]) -> int:
+    """The even sequence a newly published file starts at."""
+    return (previous.sequence // 2 + 1) * 2 if previous else 2
+
+def _timestamp(value: Any) -> bytes:
+    if value is None:
+        return b""
+    data: bytes = (value if isinstance(value, str) else value.isoformat()).encode()
+    if len(data) > TIMESTAMP_WIDTH:
+        raise ValueError(f"Timestamp too long for a snapshot: {value!r}")
+    return data
+
+def _launch_fields_only(record: AppRecord, row: Dict[str, Any]) -> bool:
+    """True when ``row`` differs from ``record`` at most in the launch columns."""
+    return all(record[column] == row.get(column) for column in TEXT_COLUMNS + ("last_modified",))
+
+class CatalogSource(Protocol):
+    """The reads a snapshot is built from; ``DatabaseService`` provides them."""
+
+    def iter_apps(self) -> Iterator[Dict]: ...
+
+    def get_categories(self) -> List[str]: ...
+
+    def get_settings(self) -> Optional[Dict]: ...
+
+class SnapshotStore:
+    """Publishes and maps the catalog snapshot shared by every worker process.
+
+    One file at ``path`` holds apps, categories and settings. Writers publish
+    under an exclusive ``flock``: launch count updates are patched into the
+    live file behind a seqlock (see ``CatalogSnapshot.consistent``), anything
+    else writes a new file and ``os.replace``-s it over the old one, so readers
+    see either version in full. Republishing reuses the heap strings of the
+    rows it replaces and compacts the heap once it has doubled. Each ``current()`` call
+    costs one ``stat``; a worker remaps only when the file was replaced. The
+    first reader builds the file from the database, and a snapshot older than
+    ``max_age`` is rebuilt in the background to pick up writes made outside
+    this app.
+    """
+
+    def __init__(self, path: str, source: Callable[[], CatalogSource], max_age: float):
+        self.path = path
+        self.source = source
+        self.max_age = max_age
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._refreshing = False
+        self.publishes = 0
+        self.patches = 0
+        self.rebuilds = 0
+
+    def current(self) -> CatalogSnapshot:
+        """Return the latest published snapshot, building it on first use."""
+        try:
+            stat = os.stat(self.path)
+            identity = (stat.st_dev, stat.st_ino)
+        except FileNotFoundError:
+            identity = None
+        snapshot = self._snapshot
+        if snapshot is None or identity != snapshot.identity:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None or identity != snapshot.identity:
+                    snapshot = self._snapshot = self._open_or_build()
+        if time.time() - snapshot.built_at > self.max_age:
+            self._refresh_in_background()
+        return snapshot
+
+    def apply(self, rows: Iterable[Dict[str, Any]] = (), deleted: Iterable[str] = (),
+              categories: Optional[List[str]] = None, settings: Optional[Dict[str, Any]] = None) -> None:
+        """Publish app upserts and deletions, and replaced categories or settings."""
+        changes = {row["id"]: row for row in rows}
+        deleted = set(deleted)
+        with self._exclusive():
+            snapshot = self._open_latest()
+            if snapshot is None:
+                # Nothing published yet: the first reader builds from the database
+                return
+            if not deleted and categories is None and settings is None and self._patch(snapshot, changes):
+                return
+
+            builder = _Builder(snapshot.raw_heap())
+            pieces: List[bytes] = []
+            start = 0
+            for app_id in sorted(changes.keys() | deleted):
+                index = snapshot.bisect(app_id)
+                pieces.append(snapshot.raw_records(start, index))
+                exists = index < snapshot.count and snapshot.id_at(index) == app_id
+                start = index + 1 if exists else index
+                if app_id in changes and app_id not in deleted:
+                    if exists:
+                        # Unchanged text columns keep pointing at the same strings
+                        builder.reuse(RECORD.unpack(snapshot.raw_records(index, index + 1)))
+                    pieces.append(builder.record(changes[app_id]))
+            pieces.append(snapshot.raw_records(start, snapshot.count))
+
+            meta = dict(snapshot.meta)
+            if categories is not None:
+                meta["categories"] = categories
+            if settings is not None:
+                meta["settings"] = settings
+            records, heap = b"".join(pieces), builder.heap
+            if len(heap) > 2 * max(meta.get("compacted_heap", 0), MIN_COMPACT_HEAP):
+                # Replaced and deleted rows leave their strings behind
+                records, heap = _compact(records, heap)
+                meta["compacted_heap"] = len(heap)
+            self._write(records, heap, meta, _next_sequence(snapshot), snapshot.built_at)
+            self.publishes += 1
+
+    def rebuild(self) -> None:
+        """Reload the whole catalog from the database and publish it."""
+        with self._exclusive():
+            self._build(_next_sequence(self._open_latest()))
+
+    def discard(self) -> None:
+        """Remove the published file so the next reader rebuilds it from the database."""
+        with self._exclusive():
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "path": self.path,
+            "apps": snapshot.count if snapshot else 0,
+            "bytes": len(snapshot.buffer) if snapshot else 0,
+            "sequence": snapshot.sequence if snapshot else 0,
+            "age": round(time.time() - snapshot.built_at, 3) if snapshot else None,
+            "publishes": self.publishes,
+            "patches": self.patches,
+            "rebuilds": self.rebuilds
+        }
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Serialize publishers across threads and worker processes."""
+        with self._publish_lock, open(self.path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _open_latest(self) -> Optional[CatalogSnapshot]:
+        try:
+            return CatalogSnapshot(self.path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable snapshot {self.path}: {e}")
+            return None
+
+    def _open_or_build(self) -> CatalogSnapshot:
+        snapshot = self._open_latest()
+        if snapshot is None:
+            with self._exclusive():
+                # Another worker may have built it while we waited for the lock
+                snapshot = self._open_latest()
+                if snapshot is None:
+                    self._build(_next_sequence(None))
+                    snapshot = CatalogSnapshot(self.path)
+        return snapshot
+
+    def _build(self, sequence: int) -> None:
+        """Publish a fresh snapshot from the database; the caller holds the lock."""
+        db = self.source()
+        rows = sorted(db.iter_apps(), key=lambda row: row["id"])
+        categories = db.get_categories()
+        settings = db.get_settings()
+        builder = _Builder()
+        records = b"".join(builder.record(row) for row in rows)
+        meta = {"categories": categories, "settings": settings, "compacted_heap": len(builder.heap)}
+        self._write(records, builder.heap, meta, sequence, time.time())
+        self.rebuilds += 1
+        logger.info(f"Published catalog snapshot {sequence} with {len(rows)} apps")
+
+    def _patch(self, snapshot: CatalogSnapshot, changes: Dict[str, Dict[str, Any]]) -> bool:
+        """Write launch columns into the live file when nothing else changed."""
+        targets = []
+        for app_id, row in changes.items():
+            record = snapshot.find(app_id)
+            if record is None or not _launch_fields_only(record, row):
+                return False
+            targets.append((record._offset, row))
+
+        sequence = snapshot.sequence
+        if sequence % 2:
+            # Left odd by a patcher that died mid-write; publish a clean file instead
+            return False
+        with open(self.path, "r+b") as f, mmap.mmap(f.fileno(), 0) as buffer:
+            SEQUENCE.pack_into(buffer, SEQUENCE_OFFSET, sequence + 1)
+            for offset, row in targets:
+                count = row.get("launch_count")
+                LAUNCH_COUNT.pack_into(buffer, offset, NULL_COUNT if count is None else int(count))
+                buffer[offset + LAST_LAUNCHED_OFFSET:offset + LAST_LAUNCHED_OFFSET + TIMESTAMP_WIDTH] = \
+                    _timestamp(row.get("last_launched")).ljust(TIMESTAMP_WIDTH, b"\0")
+            SEQUENCE.pack_into(buffer, SEQUENCE_OFFSET, sequence + 2)
+        self.patches += 1
+        return True
+
+    def _write(self, records: bytes, heap: bytes, meta: Dict[str, Any], sequence: int, built_at: float) -> None:
+        """Write a complete snapshot file next to the live one and swap it in."""
+        meta_bytes = json.dumps(meta, separators=(",", ":"), default=str).encode()
+        rows_offset = HEADER.size
+        heap_offset = rows_offset + len(records)
+        meta_offset = heap_offset + len(heap)
+        header = HEADER.pack(
+            MAGIC, FORMAT_VERSION, 0, sequence, built_at, len(records) // RECORD.size, RECORD.size,
+            rows_offset, heap_offset, len(heap), meta_offset, len(meta_bytes)
+        )
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(header)
+            f.write(records)
+            f.write(heap)
+            f.write(meta_bytes)
+        os.replace(temp_path, self.path)
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def refresh():
+            try:
+                with self._exclusive():
+                    latest = self._open_latest()
+                    # Another worker may have refreshed it already
+                    if latest is None or time.time() - latest.built_at > self.max_age:
+                        self._build(_next_sequence(latest))
+            except Exception as e:
+                logger.error(f"Failed to refresh catalog snapshot: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=refresh, name="snapshot-refresh", daemon=True).start()
+
+class SnapshotResponse:
+    def __init__(self, data: List[Any]):
+        self.data = data
+
+class SnapshotQuery:
+    """The select subset of the query builder, evaluated against a snapshot.
+
+    Comparisons follow SQL: they are false against NULL, and ordering puts
+    NULLs last ascending and first descending.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot, table: str):
+        self.snapshot = snapshot
+        self.table = table
+        self._columns: Optional[Tuple[str, ...]] = None
+        self._filters: List[Tuple[str, str, Any]] = []
+        self._negate_next = False
+        self._order: List[Tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+
+    def select(self, *columns: str) -> "SnapshotQuery":
+        if columns and columns != ("*",):
+            self._columns = tuple(c.strip() for column in columns for c in column.split(","))
+        return self
+
+    def _filter(self, column: str, op: str, value: Any) -> "SnapshotQuery":
+        if self._negate_next:
+            op, self._negate_next = f"not.{op}", False
+        self._filters.append((column, op, value))
+        return self
+
+    @property
+    def not_(self) -> "SnapshotQuery":
+        self._negate_next = True
+        return self
+
+    def eq(self, column: str, value: Any) -> "SnapshotQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "SnapshotQuery":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "SnapshotQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "SnapshotQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "SnapshotQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "SnapshotQuery":
+        return self._filter(column, "lte", value)
+
+    def is_(self, column: str, value: Any) -> "SnapshotQuery":
+        return self._filter(column, "is", None if value in (None, "null") else value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "SnapshotQuery":
+        return self._filter(column, "in", set(values))
+
+    def order(self, column: str, desc: bool = False) -> "SnapshotQuery":
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, size: int) -> "SnapshotQuery":
+        self._limit = size
+        return self
+
+    def execute(self) -> SnapshotResponse:
+        rows: List[Any]
+        if self.table == Config.APPS_TABLE:
+            rows = self._apps()
+        else:
+            rows = self._rows()
+            for column, op, value in self._filters:
+                rows = [row for row in rows if _matches(row.get(column), op, value)]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        if self._columns:
+            rows = [{column: row.get(column) for column in self._columns} for row in rows]
+        return SnapshotResponse(rows)
+
+    def _apps(self) -> List[AppRecord]:
+        """Filter and order app records by index, decoding only the columns involved."""
+        snapshot = self.snapshot
+        for column, op, value in self._filters:
+            # Point lookups use the ID order instead of a scan
+            if column == "id" and op == "eq":
+                record = snapshot.find(value)
+                return [record] if record and self._matches_all(record) else []
+
+        indexes: Sequence[int] = snapshot.ordered(tuple(self._order)) if self._order else range(snapshot.count)
+        for column, op, value in self._filters:
+            values = snapshot.column(column)
+            indexes = [i for i in indexes if _matches(values[i], op, value)]
+        if self._limit is not None:
+            indexes = indexes[:self._limit]
+        records = snapshot.records()
+        return [records[i] for i in indexes]
+
+    def _matches_all(self, row: AppRecord) -> bool:
+        return all(_matches(row.get(column), op, value) for column, op, value in self._filters)
+
+    def _rows(self) -> List[Any]:
+        if self.table == Config.CATEGORIES_TABLE:
+            return [{"name": name} for name in self.snapshot.categories]
+        if self.table == Config.SETTINGS_TABLE:
+            return [dict(self.snapshot.settings)] if self.snapshot.settings else []
+        raise ValueError(f"Table {self.table} is not part of the catalog snapshot")
+
+def _matches(actual: Any, op: str, value: Any) -> bool:
+    if op.startswith("not."):
+        # SQL NOT: a comparison with NULL stays unknown, so it still does not match
+        base = op[len("not."):]
+        return (base == "is" or actual is not None) and not _matches(actual, base, value)
+    if op == "is":
+        return actual is None if value is None else bool(actual == value)
+    if op == "eq":
+        return bool(actual == value)
+    if op == "neq":
+        return actual is not None and bool(actual != value)
+    if op == "in":
+        return actual in value
+    if actual is None or value is None:
+        return False
+    if op == "gt":
+        return bool(actual > value)
+    if op == "gte":
+        return bool(actual >= value)
+    if op == "lt":
+        return bool(actual < value)
+    return bool(actual <= value)
+
+class SnapshotClient:
+    """Read-only client over the current snapshot, for ``DatabaseService`` read methods."""
+
+    def __init__(self, store: SnapshotStore):
+        self.store = store
+
+    def table(self, name: str) -> SnapshotQuery:
+        return SnapshotQuery(self.store.current(), name)
+
+class SnapshotCatalog:
+    """A catalog service's side of the snapshot: scoped cache keys, reads and publishing."""
+
+    def __init__(self, store: SnapshotStore):
+        self.store = store
+        self.reader = DatabaseService(SnapshotClient(store))
+
+    def scope(self, key: Tuple) -> Tuple:
+        """Scope a cache key to the current snapshot version."""
+        snapshot = self.store.current()
+        return key + (snapshot.built_at, snapshot.sequence)
+
+    def version(self) -> Dict[str, Any]:
+        return self.store.current().version
+
+    def publish(self, **changes: Any) -> None:
+        """Publish a write; on failure drop the snapshot so it is rebuilt from the database."""
+        try:
+            self.store.apply(**changes)
+        except Exception as e:
+            logger.error(f"Failed to publish catalog snapshot, discarding it: {e}")
+            self.store.discard()
+
+    def rebuild(self, after: str) -> None:
+        """Republish the whole catalog from the database, discarding the snapshot on failure."""
+        try:
+            self.store.rebuild()
+        except Exception as e:
+            logger.error(f"Failed to rebuild catalog snapshot after {after}: {e}")
+            self.store.discard()
+
+_store: Optional[SnapshotStore] = None
+_store_lock = threading.Lock()
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Return the process-wide snapshot store, or None when snapshots are disabled."""
+    global _store
+    if not Config.SNAPSHOT_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SnapshotStore(
+                    Config.SNAPSHOT_PATH,
+                    DatabaseService,
+                    Config.SNAPSHOT_MAX_AGE
+                )
+    return _store
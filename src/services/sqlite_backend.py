@@ -0,0 +1,552 @@
+import json
+import logging
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Mirrors supabase_schema.sql; UUIDs and timestamps are stored as ISO text and
+# JSONB columns as JSON text
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS launcher_apps (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT DEFAULT 'uncategorized',
+    icon_url TEXT,
+    app_store_link TEXT,
+    launch_count INTEGER DEFAULT 0,
+    last_modified TEXT,
+    last_launched TEXT
+);
+
+-- (category, id) backs sort=category pages; it replaces the category-only index of older files
+DROP INDEX IF EXISTS idx_launcher_apps_category;
+CREATE INDEX IF NOT EXISTS idx_launcher_apps_category_id ON launcher_apps (category, id);
+CREATE INDEX IF NOT EXISTS idx_launcher_apps_name ON launcher_apps (name, id);
+CREATE INDEX IF NOT EXISTS idx_launcher_apps_launch_count ON launcher_apps (launch_count, id);
+CREATE INDEX IF NOT EXISTS idx_launcher_apps_last_modified ON launcher_apps (last_modified, id);
+CREATE INDEX IF NOT EXISTS idx_launcher_apps_last_launched ON launcher_apps (last_launched);
+
+CREATE TABLE IF NOT EXISTS launcher_settings (
+    id TEXT PRIMARY KEY,
+    metadata JSON NOT NULL CHECK (json_valid(metadata)),
+    settings JSON NOT NULL CHECK (json_valid(settings)),
+    created_at TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS launcher_categories (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS launcher_app_tombstones (
+    id TEXT PRIMARY KEY,
+    deleted_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_launcher_app_tombstones_deleted_at ON launcher_app_tombstones (deleted_at);
+
+CREATE TABLE IF NOT EXISTS launcher_app_launches (
+    app_id TEXT NOT NULL REFERENCES launcher_apps (id) ON DELETE CASCADE,
+    bucket TEXT NOT NULL,
+    launches INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (app_id, bucket)
+);
+
+CREATE INDEX IF NOT EXISTS idx_launcher_app_launches_bucket ON launcher_app_launches (bucket);
+"""
+
+JSON_COLUMNS = {"launcher_settings": ("metadata", "settings")}
+TIMESTAMP_COLUMNS = {
+    "launcher_apps": ("last_modified", "last_launched"),
+    "launcher_settings": ("created_at", "updated_at"),
+    "launcher_categories": ("created_at",),
+    "launcher_app_tombstones": ("deleted_at",),
+    "launcher_app_launches": ("bucket",)
+}
+# Columns filled on insert when missing (Postgres DEFAULT NOW())
+NOW_DEFAULTS = {
+    "launcher_apps": ("last_modified",),
+    "launcher_settings": ("created_at", "updated_at"),
+    "launcher_categories": ("created_at",),
+    "launcher_app_tombstones": ("deleted_at",)
+}
+# Columns refreshed on every update (Postgres BEFORE UPDATE trigger)
+NOW_ON_UPDATE = {"launcher_settings": ("updated_at",)}
+
+_OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _hour(timestamp: str) -> str:
+    """The start of the hour of a normalized timestamp, like ``date_trunc('hour', ...)``."""
+    return datetime.fromisoformat(timestamp).replace(minute=0, second=0, microsecond=0).isoformat()
+
+def _timestamp(value: Any) -> Any:
+    """Normalize an ISO timestamp to UTC with an explicit offset, like timestamptz."""
+    if not isinstance(value, str) or not value:
+        return value
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+class SQLiteResponse:
+    """Mimics postgrest's APIResponse."""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+class SQLiteQuery:
+    """Builds one SQL statement from the PostgREST query-builder chain.
+
+    Only the methods ``DatabaseService`` uses are supported. Column names are
+    checked against the table before being placed in SQL; values are always
+    bound as parameters, so the same call shape always produces the same SQL
+    text and reuses the connection's prepared statement.
+    """
+
+    def __init__(self, client: "SQLiteClient", table: str):
+        self.client = client
+        self.table = table
+        self.operation = "select"
+        self.columns: Optional[List[str]] = None
+        self.count: Optional[str] = None
+        self.payload: Any = None
+        self.returning = "representation"
+        self.on_conflict = "id"
+        self.ignore_duplicates = False
+        self.filters: List[Tuple[str, str, Any]] = []
+        self.negate_next = False
+        self.orders: List[Tuple[str, bool]] = []
+        self.limit_count: Optional[int] = None
+        self.offset_count = 0
+
+    def select(self, *columns: str, count: Optional[str] = None) -> "SQLiteQuery":
+        names = [name.strip() for column in columns for name in column.split(",")]
+        self.columns = None if not names or "*" in names else names
+        self.count = count
+        return self
+
+    def insert(self, json: Any, *, count: Optional[str] = None, returning: str = "representation",
+               upsert: bool = False) -> "SQLiteQuery":
+        return self._write("upsert" if upsert else "insert", json, returning)
+
+    def upsert(self, json: Any, *, count: Optional[str] = None, returning: str = "representation",
+               ignore_duplicates: bool = False, on_conflict: str = "") -> "SQLiteQuery":
+        self.ignore_duplicates = ignore_duplicates
+        self.on_conflict = on_conflict or "id"
+        return self._write("upsert", json, returning)
+
+    def update(self, json: Dict[str, Any], *, count: Optional[str] = None,
+               returning: str = "representation") -> "SQLiteQuery":
+        return self._write("update", json, returning)
+
+    def delete(self, *, count: Optional[str] = None, returning: str = "representation") -> "SQLiteQuery":
+        return self._write("delete", None, returning)
+
+    def _write(self, operation: str, payload: Any, returning: Any) -> "SQLiteQuery":
+        self.operation = operation
+        self.payload = payload
+        self.returning = str(getattr(returning, "value", returning))
+        return self
+
+    def _filter(self, column: str, op: str, value: Any) -> "SQLiteQuery":
+        if self.negate_next:
+            op, self.negate_next = f"not.{op}", False
+        self.filters.append((column, op, value))
+        return self
+
+    @property
+    def not_(self) -> "SQLiteQuery":
+        """Negate the next filter."""
+        self.negate_next = True
+        return self
+
+    def eq(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter(column, "lte", value)
+
+    def is_(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter(column, "is", value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "SQLiteQuery":
+        return self._filter(column, "in", list(values))
+
+    def order(self, column: str, *, desc: bool = False, nullsfirst: bool = False,
+              foreign_table: Optional[str] = None) -> "SQLiteQuery":
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, size: int, *, foreign_table: Optional[str] = None) -> "SQLiteQuery":
+        self.limit_count = size
+        return self
+
+    def offset(self, size: int) -> "SQLiteQuery":
+        self.offset_count = size
+        return self
+
+    def range(self, start: int, end: int) -> "SQLiteQuery":
+        self.offset_count = start
+        self.limit_count = end - start + 1
+        return self
+
+    def execute(self) -> SQLiteResponse:
+        response: SQLiteResponse = getattr(self.client, f"_{self.operation}")(self)
+        return response
+
+class SQLiteRPC:
+    """A pending database function call."""
+
+    def __init__(self, client: "SQLiteClient", name: str, params: Dict[str, Any]):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self) -> SQLiteResponse:
+        function = self.client.functions.get(self.name)
+        if function is None:
+            raise sqlite3.OperationalError(f"Could not find the function {self.name}")
+        return SQLiteResponse(function(**self.params))
+
+class SQLiteClient:
+    """Local SQLite storage exposing the subset of the Supabase client the app uses.
+
+    ``DatabaseService`` talks to ``table()`` query builders and ``rpc()``; this
+    class answers both from an embedded database, so switching backends needs
+    no change above the client. File databases run in WAL mode with one
+    connection per thread, so readers never block on the single writer. An
+    in-memory database (``":memory:"``) uses one shared connection behind a
+    lock.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.memory = path == ":memory:"
+        self._local = threading.local()
+        self._lock = threading.RLock() if self.memory else None
+        self._shared: Optional[sqlite3.Connection] = None
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self.functions: Dict[str, Callable[..., Any]] = {
+            "increment_launch_count": self._increment_launch_count,
+            "increment_launch_counts": self._increment_launch_counts,
+            "app_popularity": self._app_popularity,
+            "category_facets": self._category_facets,
+            "catalog_version": self._catalog_version
+        }
+
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        self.table_columns = {
+            table: [row["name"] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+            for table in TIMESTAMP_COLUMNS
+        }
+
+    # Client surface used by the app
+
+    def table(self, name: str) -> SQLiteQuery:
+        if name not in self.table_columns:
+            raise sqlite3.OperationalError(f"no such table: {name}")
+        return SQLiteQuery(self, name)
+
+    def from_(self, name: str) -> SQLiteQuery:
+        return self.table(name)
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> SQLiteRPC:
+        return SQLiteRPC(self, name, params)
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+        self._shared = None
+
+    # Connections and transactions
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout,
+            isolation_level=None,
+            check_same_thread=not self.memory,
+            cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        # Deleting an app drops its launch rollup, as in Postgres
+        conn.execute("PRAGMA foreign_keys=ON")
+        if not self.memory:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        if self.memory:
+            if self._shared is None:
+                self._shared = self._connect()
+            return self._shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        with self._lock or nullcontext():
+            yield self._connection()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock or nullcontext():
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # SQL building
+
+    def _column(self, table: str, column: str) -> str:
+        if column not in self.table_columns[table]:
+            raise sqlite3.OperationalError(f"no such column: {table}.{column}")
+        return f'"{column}"'
+
+    def _encode(self, table: str, column: str, value: Any) -> Any:
+        if column in JSON_COLUMNS.get(table, ()):
+            return json.dumps(value)
+        if column in TIMESTAMP_COLUMNS.get(table, ()):
+            return _timestamp(value)
+        return value
+
+    def _decode(self, table: str, row: sqlite3.Row) -> Dict[str, Any]:
+        data = dict(row)
+        for column in JSON_COLUMNS.get(table, ()):
+            if isinstance(data.get(column), str):
+                data[column] = json.loads(data[column])
+        return data
+
+    def _where(self, query: SQLiteQuery) -> Tuple[str, List[Any]]:
+        clauses = []
+        params: List[Any] = []
+        for column, op, value in query.filters:
+            name = self._column(query.table, column)
+            negated = op.startswith("not.")
+            if negated:
+                op = op[len("not."):]
+            if op == "in":
+                # One bound JSON array keeps the SQL text stable for any list length
+                clauses.append(f"{name} IN (SELECT value FROM json_each(?))")
+                params.append(json.dumps([self._encode(query.table, column, v) for v in value]))
+            elif op == "is":
+                if value in (None, "null"):
+                    clauses.append(f"{name} IS NULL")
+                else:
+                    clauses.append(f"{name} IS ?")
+                    params.append(value)
+            else:
+                clauses.append(f"{name} {_OPERATORS[op]} ?")
+                params.append(self._encode(query.table, column, value))
+            if negated:
+                clauses[-1] = f"NOT ({clauses[-1]})"
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _returning_sql(self, query: SQLiteQuery) -> str:
+        return "" if query.returning == "minimal" else " RETURNING *"
+
+    def _payload_rows(self, query: SQLiteQuery) -> List[Dict[str, Any]]:
+        payload = query.payload if isinstance(query.payload, list) else [query.payload]
+        return [dict(row) for row in payload]
+
+    def _with_defaults(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(row)
+        row.setdefault("id", str(uuid.uuid4()))
+        for column in NOW_DEFAULTS.get(table, ()):
+            if row.get(column) is None:
+                row[column] = _now()
+        return row
+
+    # Operations
+
+    def _select(self, query: SQLiteQuery) -> SQLiteResponse:
+        table = query.table
+        columns = ", ".join(self._column(table, c) for c in query.columns) if query.columns else "*"
+        where, params = self._where(query)
+        sql = f'SELECT {columns} FROM "{table}"{where}'
+        if query.orders:
+            # Match Postgres: NULLs sort last ascending and first descending
+            sql += " ORDER BY " + ", ".join(
+                f"{self._column(table, column)} {'DESC NULLS FIRST' if desc else 'ASC NULLS LAST'}"
+                for column, desc in query.orders
+            )
+        page_params = params
+        if query.limit_count is not None or query.offset_count:
+            sql += " LIMIT ? OFFSET ?"
+            page_params = params + [-1 if query.limit_count is None else query.limit_count, query.offset_count]
+
+        with self._read() as conn:
+            rows = [self._decode(table, row) for row in conn.execute(sql, page_params)]
+            count = None
+            if query.count:
+                count = conn.execute(f'SELECT COUNT(*) FROM "{table}"{where}', params).fetchone()[0]
+        return SQLiteResponse(rows, count)
+
+    def _insert(self, query: SQLiteQuery) -> SQLiteResponse:
+        return self._write_rows(query, upsert=False)
+
+    def _upsert(self, query: SQLiteQuery) -> SQLiteResponse:
+        return self._write_rows(query, upsert=True)
+
+    def _write_rows(self, query: SQLiteQuery, upsert: bool) -> SQLiteResponse:
+        table = query.table
+        written: List[Dict[str, Any]] = []
+        with self._transaction() as conn:
+            for payload in self._payload_rows(query):
+                row = self._with_defaults(table, payload)
+                columns = list(row)
+                sql = (
+                    f'INSERT INTO "{table}" ({", ".join(self._column(table, c) for c in columns)}) '
+                    f'VALUES ({", ".join("?" for _ in columns)})'
+                )
+                if upsert:
+                    conflict = self._column(table, query.on_conflict)
+                    # Only columns present in the payload overwrite an existing row
+                    updates = [c for c in payload if c not in ("id", query.on_conflict)]
+                    updates += [c for c in NOW_ON_UPDATE.get(table, ()) if c not in payload]
+                    if query.ignore_duplicates or not updates:
+                        sql += f" ON CONFLICT({conflict}) DO NOTHING"
+                    else:
+                        sql += f" ON CONFLICT({conflict}) DO UPDATE SET " + ", ".join(
+                            f"{self._column(table, c)} = excluded.{self._column(table, c)}"
+                            if c in payload else f"{self._column(table, c)} = ?"
+                            for c in updates
+                        )
+                params = [self._encode(table, c, row[c]) for c in columns]
+                if upsert and not query.ignore_duplicates:
+                    params += [_now() for c in NOW_ON_UPDATE.get(table, ()) if c not in payload]
+                cursor = conn.execute(sql + self._returning_sql(query), params)
+                written.extend(self._decode(table, r) for r in cursor.fetchall())
+        return SQLiteResponse(written)
+
+    def _update(self, query: SQLiteQuery) -> SQLiteResponse:
+        table = query.table
+        values = dict(query.payload)
+        for column in NOW_ON_UPDATE.get(table, ()):
+            values[column] = _now()
+        assignments = ", ".join(f"{self._column(table, c)} = ?" for c in values)
+        where, params = self._where(query)
+        sql = f'UPDATE "{table}" SET {assignments}{where}{self._returning_sql(query)}'
+        with self._transaction() as conn:
+            cursor = conn.execute(sql, [self._encode(table, c, v) for c, v in values.items()] + params)
+            rows = [self._decode(table, row) for row in cursor.fetchall()]
+        return SQLiteResponse(rows)
+
+    def _delete(self, query: SQLiteQuery) -> SQLiteResponse:
+        where, params = self._where(query)
+        sql = f'DELETE FROM "{query.table}"{where}{self._returning_sql(query)}'
+        with self._transaction() as conn:
+            rows = [self._decode(query.table, row) for row in conn.execute(sql, params).fetchall()]
+        return SQLiteResponse(rows)
+
+    # Database functions from supabase_schema.sql
+
+    _INCREMENT_SQL = (
+        'UPDATE launcher_apps SET launch_count = COALESCE(launch_count, 0) + ?, '
+        'last_launched = MAX(COALESCE(last_launched, ?), ?) WHERE id = ?'
+    )
+
+    _LOG_LAUNCHES_SQL = (
+        'INSERT INTO launcher_app_launches (app_id, bucket, launches) VALUES (?, ?, ?) '
+        'ON CONFLICT (app_id, bucket) DO UPDATE SET launches = launches + excluded.launches'
+    )
+
+    def _increment_launch_count(self, app_id: str, amount: int = 1,
+                                launched_at: Optional[str] = None) -> List[Dict[str, Any]]:
+        launched_at = _timestamp(launched_at) or _now()
+        with self._transaction() as conn:
+            cursor = conn.execute(self._INCREMENT_SQL + " RETURNING *", (amount, launched_at, launched_at, app_id))
+            rows = [self._decode("launcher_apps", row) for row in cursor.fetchall()]
+            if rows:
+                conn.execute(self._LOG_LAUNCHES_SQL, (rows[0]["id"], _hour(launched_at), amount))
+            return rows
+
+    def _increment_launch_counts(self, increments: List[Dict[str, Any]]) -> int:
+        with self._transaction() as conn:
+            updated = 0
+            for delta in increments:
+                launched_at = _timestamp(delta.get("last_launched")) or _now()
+                cursor = conn.execute(self._INCREMENT_SQL, (delta["count"], launched_at, launched_at, delta["id"]))
+                if cursor.rowcount:
+                    conn.execute(self._LOG_LAUNCHES_SQL, (delta["id"], _hour(launched_at), delta["count"]))
+                updated += cursor.rowcount
+            return updated
+
+    def _app_popularity(self, half_life_hours: float, since: str) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        scores: Dict[str, float] = {}
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT app_id, bucket, launches FROM launcher_app_launches WHERE bucket >= ?",
+                (_timestamp(since),)
+            ).fetchall()
+        for row in rows:
+            age_hours = (now - datetime.fromisoformat(row["bucket"])).total_seconds() / 3600
+            scores[row["app_id"]] = scores.get(row["app_id"], 0.0) + row["launches"] * 2 ** (-age_hours / half_life_hours)
+        return [{"app_id": app_id, "score": score} for app_id, score in scores.items()]
+
+    def _category_facets(self) -> List[Dict[str, Any]]:
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT COALESCE(c.name, a.category) AS name, COALESCE(a.app_count, 0) AS app_count, "
+                "a.last_modified AS last_modified, c.name IS NOT NULL AS listed "
+                "FROM launcher_categories c FULL OUTER JOIN ("
+                "SELECT COALESCE(category, 'uncategorized') AS category, COUNT(*) AS app_count, "
+                "MAX(last_modified) AS last_modified FROM launcher_apps GROUP BY 1"
+                ") a ON a.category = c.name ORDER BY 1"
+            ).fetchall()
+        return [{**row, "listed": bool(row["listed"])} for row in map(dict, rows)]
+
+    def _catalog_version(self) -> Dict[str, Any]:
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT "
+                "(SELECT COUNT(*) FROM launcher_apps) AS apps_count, "
+                "(SELECT MAX(last_modified) FROM launcher_apps) AS apps_modified, "
+                "(SELECT MAX(last_launched) FROM launcher_apps) AS apps_launched, "
+                "(SELECT COUNT(*) FROM launcher_categories) AS categories_count, "
+                "(SELECT MAX(created_at) FROM launcher_categories) AS categories_created, "
+                "(SELECT MAX(updated_at) FROM launcher_settings) AS settings_updated"
+            ).fetchone()
+        return dict(row)
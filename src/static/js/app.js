@@ -1,6 +1,8 @@
 // Core application functionality
 let iconSizeInputs;
 let shortcutUrlInput;
+let currentSettings = { iconSize: 60 };
+let currentSort = new URLSearchParams(window.location.search).get('sort') || '';
 
 // Function to update CSS variables based on settings
 function updateSettings(settings) {
@@ -9,6 +11,7 @@ function updateSettings(settings) {
         settings = { iconSize: 60 }; // Default fallback
     }
 
+    currentSettings = settings;
     document.documentElement.style.setProperty('--icon-size', `${settings.iconSize}px`);
 
     // Determine the number of grid columns based on icon size
@@ -22,7 +25,7 @@ function updateSettings(settings) {
     document.documentElement.style.setProperty('--grid-columns', columns);
 }
 
-// Function to fetch settings from the backend
+// Function to fetch settings from the backend (the app grid is server-rendered)
 async function fetchSettings() {
     try {
         const response = await fetch('/api/settings');
@@ -50,6 +53,15 @@ async function fetchSettings() {
 
 // Sort apps function
 function sortApps(sortBy) {
+    if (sortBy === 'popular') {
+        // Ranked by recent launches, which only the server knows
+        const params = new URLSearchParams(window.location.search);
+        params.set('sort', 'popular');
+        window.location.search = params.toString();
+        return;
+    }
+
+    currentSort = sortBy;
     const appGrid = document.querySelector('.app-grid');
     const apps = Array.from(appGrid.children);
 
@@ -66,6 +78,116 @@ function sortApps(sortBy) {
     apps.forEach(app => appGrid.appendChild(app));
 }
 
+// Proxied icon URL, versioned by the icon URL's hash like the server-rendered cards
+async function iconSource(app) {
+    if (!app.iconUrl) return '';
+    const size = (parseInt(currentSettings.iconSize) || 60) * 2;
+    let src = `/icons/${encodeURIComponent(app.id)}/${size}`;
+    if (window.crypto && crypto.subtle) {
+        const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(app.iconUrl));
+        const hex = Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, '0')).join('');
+        src += `?v=${hex.slice(0, 32)}`;
+    }
+    return src;
+}
+
+// Build an app card like components/app_card.html
+async function renderAppCard(app) {
+    const card = document.createElement('div');
+    card.className = 'app-card';
+    card.dataset.appStoreLink = app.appStoreLink || '';
+    card.dataset.appName = app.name || '';
+    card.dataset.appId = app.id;
+    card.dataset.category = (app.category || '').toLowerCase();
+    card.dataset.iconUrl = app.iconUrl || '';
+    card.dataset.launchCount = app.launchCount || 0;
+    card.dataset.lastLaunched = app.lastLaunched || '';
+    card.addEventListener('click', () => launchApp(card));
+    card.addEventListener('contextmenu', (e) => editApp(e, card));
+
+    const icon = document.createElement('img');
+    icon.src = (await iconSource(app)) || app.iconUrl || '';
+    icon.alt = app.name || '';
+    icon.className = 'app-icon';
+    icon.loading = 'lazy';
+    const name = document.createElement('h3');
+    name.className = 'app-name';
+    name.textContent = app.name || '';
+    card.append(icon, name);
+    return card;
+}
+
+// Whether an app belongs on this page (the server filters by ?category=)
+function isListed(app) {
+    const category = new URLSearchParams(window.location.search).get('category');
+    return !category || (app.category || '').toLowerCase() === category.toLowerCase();
+}
+
+// Patch the grid with a change set from the replica: replace changed cards,
+// drop deleted ones, and redraw everything from the replica after a reset
+async function applyChangesToGrid(changes) {
+    const appGrid = document.querySelector('.app-grid');
+    if (!appGrid) return;
+    const cardFor = id => appGrid.querySelector(`.app-card[data-app-id="${CSS.escape(id)}"]`);
+
+    if (changes.reset) {
+        const apps = (await getReplicaApps()).filter(isListed);
+        appGrid.replaceChildren(...await Promise.all(apps.map(renderAppCard)));
+    } else {
+        changes.deleted.forEach(id => cardFor(id)?.remove());
+        for (const app of changes.apps) {
+            const existing = cardFor(app.id);
+            if (!isListed(app)) {
+                existing?.remove();
+                continue;
+            }
+            const card = await renderAppCard(app);
+            if (existing) existing.replaceWith(card);
+            else appGrid.appendChild(card);
+        }
+    }
+
+    if (['name', 'category', 'launchCount'].includes(currentSort)) sortApps(currentSort);
+    filterByCategory();
+    refreshFacets();
+}
+
+// Update the per-category counts in the category filter
+async function refreshFacets() {
+    const filterSelect = document.getElementById('categoryFilter');
+    if (!filterSelect) return;
+    try {
+        const response = await fetch('/api/categories/facets');
+        if (!response.ok) return;
+        const { categories } = await response.json();
+        categories.forEach(facet => {
+            let option = Array.from(filterSelect.options).find(opt => opt.value === facet.name);
+            if (!option) {
+                option = new Option('', facet.name);
+                filterSelect.add(option);
+            }
+            const label = facet.name.charAt(0).toUpperCase() + facet.name.slice(1);
+            option.textContent = facet.appCount === null ? label : `${label} (${facet.appCount})`;
+        });
+    } catch (error) {
+        console.error('Failed to refresh categories:', error);
+    }
+}
+
+// After a write, pull only what changed into the replica and the grid
+async function refreshApps() {
+    if (!('indexedDB' in window)) {
+        window.location.reload();
+        return;
+    }
+    try {
+        await applyChangesToGrid(await syncApps());
+    } catch (error) {
+        console.error('Failed to sync apps, reloading:', error);
+        window.location.reload();
+    }
+}
+
 // Initialize app
 document.addEventListener('DOMContentLoaded', async () => {
     // Initialize DOM element references
@@ -92,10 +214,23 @@ document.addEventListener('DOMContentLoaded', async () => {
     // Initialize settings
     await fetchSettings();
 
+    // Bring the local app replica up to date with only what changed; the page
+    // may come from the service worker's cache, so patch the grid with it too
+    // (a first sync returns the whole catalog, which the page already shows)
+    if ('indexedDB' in window) {
+        syncApps()
+            .then(changes => changes.reset ? null : applyChangesToGrid(changes))
+            .catch(err => console.log('App sync failed:', err));
+    }
+
     // Register service worker for PWA
     if ('serviceWorker' in navigator) {
         navigator.serviceWorker.register('/static/sw.js')
-            .then(registration => console.log('ServiceWorker registration successful'))
+            .then(registration => {
+                console.log('ServiceWorker registration successful');
+                // Let the worker resync when connectivity returns
+                if (registration.sync) registration.sync.register('apps-sync').catch(() => {});
+            })
             .catch(err => console.log('ServiceWorker registration failed:', err));
     }
 }); 
\ No newline at end of file
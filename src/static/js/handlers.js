@@ -35,7 +35,8 @@ async function deleteApp() {
         });
 
         if (!response.ok) throw new Error('Failed to delete app');
-        window.location.reload();
+        document.getElementById('editOverlay').style.display = 'none';
+        await refreshApps();
     } catch (error) {
         console.error('Failed to delete app:', error);
     }
@@ -165,13 +166,13 @@ async function importData(input) {
     
     try {
         const file = input.files[0];
-        const text = await file.text();
-        const data = JSON.parse(text);
+        const isNdjson = /\.(ndjson|jsonl)(\.gz)?$/i.test(file.name);
         
+        // Upload the file as-is; the server parses it incrementally (gzip too)
         const response = await fetch('/api/apps/import', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(data)
+            headers: { 'Content-Type': isNdjson ? 'application/x-ndjson' : 'application/json' },
+            body: file
         });
         
         if (!response.ok) {
@@ -183,8 +184,9 @@ async function importData(input) {
         console.log('Import result:', result);
         
         if (result.status === 'success') {
-            alert(`Successfully imported ${result.imported} apps and updated ${result.updated} apps.`);
-            window.location.reload();
+            const failedNote = result.failed ? ` ${result.failed} rows could not be imported.` : '';
+            alert(`Successfully imported ${result.imported} apps and updated ${result.updated} apps.${failedNote}`);
+            await refreshApps();
         } else {
             throw new Error(result.error || 'Failed to import data');
         }
@@ -197,27 +199,27 @@ async function importData(input) {
     input.value = '';
 }
 
-// Export data
-async function exportData() {
-    try {
-        const response = await fetch('/api/apps');
-        if (!response.ok) throw new Error('Failed to fetch apps');
-        
-        const data = await response.json();
-        const blob = new Blob([JSON.stringify(data, null, 2)], { type: 'application/json' });
-        const url = URL.createObjectURL(blob);
-        
-        const a = document.createElement('a');
-        a.href = url;
-        a.download = `app_gallery_export_${new Date().toISOString().split('T')[0]}.json`;
-        document.body.appendChild(a);
-        a.click();
-        document.body.removeChild(a);
-        URL.revokeObjectURL(url);
-    } catch (error) {
-        console.error('Export error:', error);
-        alert(error.message || 'Failed to export data. Please try again.');
-    }
+// Export data (streamed by the server straight to a download)
+function exportData() {
+    const a = document.createElement('a');
+    a.href = '/api/apps/export';
+    a.download = `app_gallery_export_${new Date().toISOString().split('T')[0]}.json`;
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+}
+
+// Show only the cards of the selected category
+function filterByCategory() {
+    const categoryFilter = document.getElementById('categoryFilter');
+    const selectedCategory = categoryFilter ? categoryFilter.value.toLowerCase() : '';
+    document.querySelectorAll('.app-card').forEach(app => {
+        if (!selectedCategory || app.dataset.category === selectedCategory) {
+            app.style.display = '';
+        } else {
+            app.style.display = 'none';
+        }
+    });
 }
 
 // Initialize event handlers
@@ -288,7 +290,7 @@ document.addEventListener('DOMContentLoaded', () => {
             console.log('Submitting form data:', formData); // Debug log
 
             const isEdit = formData.id && formData.id.length > 0;
-            const url = '/api/apps';
+            const url = isEdit ? `/api/apps/${encodeURIComponent(formData.id)}` : '/api/apps';
             const method = isEdit ? 'PUT' : 'POST';
 
             try {
@@ -307,7 +309,8 @@ document.addEventListener('DOMContentLoaded', () => {
                 console.log('Server response:', result); // Debug log
 
                 if (result.status === 'success') {
-                    window.location.reload();
+                    editOverlay.style.display = 'none';
+                    await refreshApps();
                 } else {
                     throw new Error(result.error || 'Failed to save app');
                 }
@@ -320,18 +323,6 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // Handle category filter
     if (categoryFilter) {
-        categoryFilter.addEventListener('change', () => {
-            const selectedCategory = categoryFilter.value.toLowerCase();
-            const apps = document.querySelectorAll('.app-card');
-
-            apps.forEach(app => {
-                const appCategory = app.dataset.category;
-                if (!selectedCategory || appCategory === selectedCategory) {
-                    app.style.display = '';
-                } else {
-                    app.style.display = 'none';
-                }
-            });
-        });
+        categoryFilter.addEventListener('change', filterByCategory);
     }
 }); 
\ No newline at end of file
@@ -0,0 +1,67 @@
+// IndexedDB replica of the app catalog, kept current with /api/apps/changes.
+// Loaded by the page and by the service worker (no DOM access here).
+const SYNC_DB_NAME = 'app-gallery';
+const SYNC_DB_VERSION = 1;
+
+function openReplica() {
+    return new Promise((resolve, reject) => {
+        const request = indexedDB.open(SYNC_DB_NAME, SYNC_DB_VERSION);
+        request.onupgradeneeded = () => {
+            const db = request.result;
+            if (!db.objectStoreNames.contains('apps')) db.createObjectStore('apps', { keyPath: 'id' });
+            if (!db.objectStoreNames.contains('meta')) db.createObjectStore('meta');
+        };
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+function readSyncToken(db) {
+    return new Promise((resolve, reject) => {
+        const request = db.transaction('meta').objectStore('meta').get('syncToken');
+        request.onsuccess = () => resolve(request.result || null);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+// Apply one change set in a single transaction: upserts first, then deletions
+function applyChanges(db, changes) {
+    return new Promise((resolve, reject) => {
+        const tx = db.transaction(['apps', 'meta'], 'readwrite');
+        const apps = tx.objectStore('apps');
+        if (changes.reset) apps.clear();
+        changes.apps.forEach(app => apps.put(app));
+        changes.deleted.forEach(id => apps.delete(id));
+        tx.objectStore('meta').put(changes.token, 'syncToken');
+        tx.oncomplete = () => resolve(changes);
+        tx.onerror = () => reject(tx.error);
+    });
+}
+
+// Pull changes since the stored token; the first call downloads the full catalog
+async function syncApps() {
+    const db = await openReplica();
+    try {
+        const token = await readSyncToken(db);
+        const url = token ? `/api/apps/changes?since=${encodeURIComponent(token)}` : '/api/apps/changes';
+        const response = await fetch(url, { cache: 'no-store' });
+        if (!response.ok) throw new Error(`Sync failed with status ${response.status}`);
+        return await applyChanges(db, await response.json());
+    } finally {
+        db.close();
+    }
+}
+
+// Read every app from the replica
+async function getReplicaApps() {
+    const db = await openReplica();
+    try {
+        return await new Promise((resolve, reject) => {
+            const request = db.transaction('apps').objectStore('apps').getAll();
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+    } finally {
+        db.close();
+    }
+}
@@ -1,12 +1,17 @@
-const CACHE_NAME = 'app-gallery-v1';
+const CACHE_NAME = 'app-gallery-v2';
 const ASSETS = [
     '/',
     '/static/css/style.css',
-    '/static/js/main.js',
+    '/static/js/app.js',
+    '/static/js/handlers.js',
+    '/static/js/sync.js',
     '/static/icons/icon-192x192.png',
     '/static/icons/icon-512x512.png'
 ];
 
+// Keeps the IndexedDB app replica current (syncApps)
+importScripts('/static/js/sync.js');
+
 self.addEventListener('install', event => {
     event.waitUntil(
         caches.open(CACHE_NAME)
@@ -14,9 +19,26 @@ self.addEventListener('install', event => {
     );
 });
 
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys().then(names => Promise.all(
+            names.filter(name => name !== CACHE_NAME).map(name => caches.delete(name))
+        ))
+    );
+});
+
 self.addEventListener('fetch', event => {
     event.respondWith(
         caches.match(event.request)
             .then(response => response || fetch(event.request))
     );
-}); 
\ No newline at end of file
+});
+
+// Background Sync, and explicit requests from the page, pull catalog deltas
+self.addEventListener('sync', event => {
+    if (event.tag === 'apps-sync') event.waitUntil(syncApps());
+});
+
+self.addEventListener('message', event => {
+    if (event.data && event.data.type === 'sync-apps') event.waitUntil(syncApps());
+});
@@ -0,0 +1,175 @@
+import asyncio
+import contextvars
+import io
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from werkzeug.exceptions import ClientDisconnected
+from config import Config
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+def build_environ(scope: Scope, body: Any) -> Dict[str, Any]:
+    """Build a WSGI environ for an ASGI HTTP scope, reading the body from ``body``."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client")
+    environ: Dict[str, Any] = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin-1"),
+        "PATH_INFO": scope["path"].encode().decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+        # The body ends when the server says so, with or without Content-Length
+        "wsgi.input_terminated": True
+    }
+    if client:
+        environ["REMOTE_ADDR"] = client[0]
+        environ["REMOTE_PORT"] = str(client[1])
+    for raw_name, raw_value in scope.get("headers", ()):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        key = name if name in ("CONTENT_TYPE", "CONTENT_LENGTH") else f"HTTP_{name}"
+        value = raw_value.decode("latin-1")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+class ReceiveStream(io.RawIOBase):
+    """Blocking file object over an ASGI ``receive`` channel, for WSGI apps on a worker thread."""
+
+    def __init__(self, receive: Receive, loop: asyncio.AbstractEventLoop):
+        self._receive = receive
+        self._loop = loop
+        self._buffer = b""
+        self._done = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._buffer and not self._done:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message["type"] == "http.disconnect":
+                raise ClientDisconnected()
+            self._buffer = message.get("body", b"")
+            self._done = not message.get("more_body", False)
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+def _asgi_headers(headers: List[Tuple[str, str]]) -> List[Tuple[bytes, bytes]]:
+    return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the pool the Flask app runs on under ASGI, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=Config.ASGI_THREADS, thread_name_prefix="asgi")
+    return _executor
+
+class AsgiApp:
+    """Serves the Flask app under an ASGI server.
+
+    Every request runs through the Flask app, so both serving modes share one
+    implementation of each view and of the services behind it. The views run
+    on a pool of ``ASGI_THREADS`` threads next to the worker's event loop,
+    with request and response bodies streamed, so neither database round
+    trips nor CPU-bound work (rendering, facet grouping, index rebuilds) ever
+    block the loop.
+    """
+
+    def __init__(self, flask_app: "Flask",
+                 on_startup: Optional[Callable[[], Awaitable[None]]] = None,
+                 on_shutdown: Optional[Callable[[], Awaitable[None]]] = None):
+        self.flask_app = flask_app
+        self.on_startup = on_startup
+        self.on_shutdown = on_shutdown
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            raise ValueError(f"Unsupported ASGI scope type {scope['type']!r}")
+        await self._call_wsgi(build_environ(scope, io.BytesIO()), receive, send)
+
+    async def _call_wsgi(self, environ: Dict[str, Any], receive: Receive, send: Send) -> None:
+        """Serve a request through the Flask app on the thread pool.
+
+        The app and its response iterator run in one context copied from the
+        event loop, so streamed responses keep their request context across
+        the threads each chunk is produced on.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        environ["wsgi.input"] = ReceiveStream(receive, loop)
+        started: Dict[str, Any] = {}
+
+        def start_response(status: str, headers: List[Tuple[str, str]], exc_info: Any = None):
+            started["status"] = int(status.split(" ", 1)[0])
+            started["headers"] = headers
+
+        def run(fn: Callable, *args: Any) -> Awaitable[Any]:
+            return loop.run_in_executor(get_executor(), context.run, fn, *args)
+
+        iterable = await run(self.flask_app, environ, start_response)
+        try:
+            iterator = iter(iterable)
+            chunk = await run(next, iterator, None)
+            await send({
+                "type": "http.response.start",
+                "status": started["status"],
+                "headers": _asgi_headers(started["headers"])
+            })
+            while chunk is not None:
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                chunk = await run(next, iterator, None)
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                await run(close)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    if self.on_startup is not None:
+                        await self.on_startup()
+                except Exception as e:
+                    logger.exception(f"ASGI startup failed: {e}")
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                try:
+                    if self.on_shutdown is not None:
+                        await self.on_shutdown()
+                except Exception as e:
+                    logger.error(f"ASGI shutdown failed: {e}")
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,130 @@
+import gzip
+import logging
+from typing import Any, NamedTuple, Optional
+from flask import Flask, Response, request
+from werkzeug.datastructures import Accept
+from ..services.cache import TTLCache
+from .metrics import timed
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = frozenset((
+    "application/json", "application/x-ndjson", "application/javascript", "text/html",
+    "text/css", "text/plain", "text/javascript", "image/svg+xml"
+))
+
+class CompressedBody(NamedTuple):
+    """A compressed response body with its content type."""
+    data: bytes
+    content_type: str
+
+# Compressed bodies keyed by (ETag, encoding). Catalog ETags change with the
+# data version, so an entry never goes stale; older versions age out by LRU.
+compressed_cache = TTLCache(
+    Config.RENDER_CACHE_TTL, Config.COMPRESS_CACHE_MAX_ENTRIES,
+    weigher=lambda body: len(body.data),
+    max_weight=Config.COMPRESS_CACHE_MAX_BYTES
+)
+
+# ETag suffix for each content coding (the index page already uses "-gz")
+_ETAG_SUFFIXES = {"gzip": "gz", "br": "br"}
+
+_brotli: Any = None
+_brotli_checked = False
+
+def _load_brotli() -> Any:
+    """Return the brotli module if it is installed (imported on first use)."""
+    global _brotli, _brotli_checked
+    if not _brotli_checked:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = None
+        _brotli_checked = True
+    return _brotli
+
+def negotiate_encoding(accept_encodings: Accept) -> Optional[str]:
+    """Pick ``br`` or ``gzip`` from a parsed Accept-Encoding header, or None."""
+    if not Config.COMPRESS_ENABLED:
+        return None
+    if _load_brotli() is not None and accept_encodings["br"]:
+        return "br"
+    if accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a body with the given content coding."""
+    with timed("compress", encoding):
+        if encoding == "br":
+            compressed: bytes = _load_brotli().compress(data, quality=Config.COMPRESS_BROTLI_QUALITY)
+            return compressed
+        return gzip.compress(data, Config.COMPRESS_GZIP_LEVEL)
+
+def variant_etag(etag: str, encoding: str) -> str:
+    """ETag of the ``encoding`` variant of a representation."""
+    return f"{etag}-{_ETAG_SUFFIXES.get(encoding, encoding)}"
+
+def _apply(response: Response, body: CompressedBody, encoding: str, etag: Optional[str]) -> Response:
+    response.set_data(body.data)
+    response.headers["Content-Encoding"] = encoding
+    if etag:
+        response.set_etag(variant_etag(etag, encoding))
+    return response
+
+def cached_response(etag: str, accept_encodings: Accept) -> Optional[Response]:
+    """Return the cached compressed response for an ETag, if there is one for this client.
+
+    The response carries no ETag; ``conditional_response`` sets the variant tag.
+    """
+    encoding = negotiate_encoding(accept_encodings)
+    if encoding is None:
+        return None
+    found, body = compressed_cache.get((etag, encoding))
+    if not found:
+        return None
+    response = Response(content_type=body.content_type)
+    response.vary.add("Accept-Encoding")
+    return _apply(response, body, encoding, None)
+
+def compress_response(response: Response, accept_encodings: Accept) -> Response:
+    """Compress a finished response in place when it is worth it.
+
+    Only complete (non-streamed) 200 responses with a text or JSON body of at
+    least ``COMPRESS_MIN_SIZE`` bytes are compressed. When the response has a
+    strong ETag the compressed body is cached under it, and the ETag gets an
+    encoding suffix so each variant validates separately.
+    """
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    data = response.get_data()
+    if len(data) < Config.COMPRESS_MIN_SIZE:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    etag, weak = response.get_etag()
+    key = (etag, encoding) if etag and not weak else None
+    body: Optional[CompressedBody]
+    _, body = compressed_cache.get(key) if key else (False, None)
+    if body is None:
+        body = CompressedBody(compress(data, encoding), response.content_type)
+        if key:
+            compressed_cache.set(key, body)
+    return _apply(response, body, encoding, etag if key else None)
+
+def init_compression(app: Flask) -> None:
+    """Compress eligible responses after every request."""
+    if not Config.COMPRESS_ENABLED:
+        return
+
+    @app.after_request
+    def compress_after_request(response):
+        return compress_response(response, request.accept_encodings)
@@ -0,0 +1,68 @@
+import hashlib
+import json
+import logging
+from functools import wraps
+from typing import Any, Callable, Dict, Tuple
+from flask import Response, make_response, request
+from werkzeug.wrappers import Request
+from werkzeug.http import is_resource_modified
+from .compression import cached_response, negotiate_encoding, variant_etag
+
+logger = logging.getLogger(__name__)
+
+def catalog_etag(version: Dict[str, Any], scope: str) -> str:
+    """Derive a strong ETag for one resource from the catalog version."""
+    raw = json.dumps(version, sort_keys=True, default=str) + "|" + scope
+    return hashlib.sha1(raw.encode()).hexdigest()[:32]
+
+def _validators(version: Dict[str, Any], req: Request) -> Tuple[str, bool]:
+    """Return (etag, modified) for a request against the catalog version.
+
+    There is no Last-Modified: deleting an app that isn't the newest changes
+    the catalog without moving any timestamp, so only the ETag is reliable.
+    """
+    etag = catalog_etag(version, req.full_path)
+    modified = is_resource_modified(req.environ, etag=etag)
+    if modified and req.if_none_match:
+        # The compressed variant this request would get is just as fresh
+        encoding = negotiate_encoding(req.accept_encodings)
+        if encoding and req.if_none_match.contains_weak(variant_etag(etag, encoding)):
+            return variant_etag(etag, encoding), False
+    return etag, modified
+
+def _with_validators(response: Response, etag: str) -> Response:
+    encoding = response.headers.get("Content-Encoding")
+    response.set_etag(variant_etag(etag, encoding) if encoding else etag)
+    # Clients may store the response but must revalidate before reuse
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+def conditional_response(db: Any) -> Callable:
+    """Decorate a GET view with an ETag validator from the catalog version.
+
+    The version is looked up (usually from the cache) before the view runs.
+    When the request's ``If-None-Match`` matches, a 304 is returned without
+    calling the view, so neither the DB fetch nor the JSON serialization
+    happens. A compressed body already cached under the ETag is returned the
+    same way. Otherwise the ETag is attached to the view's response.
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                version = db.get_catalog_version()
+            except Exception as e:
+                # Validators are an optimization; serve the full response instead
+                logger.warning(f"Catalog version unavailable, skipping validators: {e}")
+                return view(*args, **kwargs)
+
+            etag, modified = _validators(version, request)
+            if not modified:
+                response = Response(status=304)
+            else:
+                response = cached_response(etag, request.accept_encodings) or make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            return _with_validators(response, etag)
+        return wrapper
+    return decorator
@@ -0,0 +1,50 @@
+import logging
+from typing import Any, Callable, Optional
+from flask.json.provider import DefaultJSONProvider
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def _load_fast_dumps() -> Optional[Callable[..., bytes]]:
+    """Return ``orjson.dumps`` when the configured encoder allows it and it is installed."""
+    if Config.JSON_ENCODER == "json":
+        return None
+    try:
+        import orjson
+    except ImportError:
+        if Config.JSON_ENCODER == "orjson":
+            logger.warning("JSON_ENCODER=orjson but orjson is not installed; using the json module")
+        return None
+    return orjson.dumps
+
+# Optional fast encoder shared by the JSON provider and DataProcessor; None means stdlib json
+fast_dumps = _load_fast_dumps()
+
+if fast_dumps is not None:
+    import orjson
+    # Datetimes go through Flask's default (HTTP dates) so output matches the stdlib provider
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    _SORTED_OPTIONS = _OPTIONS | orjson.OPT_SORT_KEYS
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson when it is available.
+
+    Output matches the default provider (sorted keys, Flask's handling of
+    dates, UUIDs and dataclasses), except that non-ASCII text is written as
+    UTF-8 rather than ``\\u`` escapes. Calls with extra ``json.dumps``
+    arguments, and pretty-printed debug responses, use the default provider.
+    """
+
+    def _encode(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, default=self.default, option=_SORTED_OPTIONS if self.sort_keys else _OPTIONS)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if fast_dumps is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode()
+
+    def response(self, *args: Any, **kwargs: Any) -> Any:
+        if fast_dumps is None or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj) + b"\n", mimetype=self.mimetype)
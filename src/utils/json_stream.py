@@ -0,0 +1,196 @@
+import codecs
+import json
+import zlib
+from typing import IO, Any, Iterator, Optional
+from ..models.exceptions import AppError
+
+_WHITESPACE = " \t\r\n"
+_GZIP_MAGIC = b"\x1f\x8b"
+# How close to the end of the buffer a decode error, or the end of a number,
+# must be for more input to possibly change the outcome ("-Infinit", "1e+")
+_EDGE = 9
+
+def read_body(stream: IO[bytes], max_bytes: int, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Yield a request body as text chunks, transparently gunzipping it.
+
+    Gzip is detected from the magic bytes, so it works with or without a
+    ``Content-Encoding`` header. ``max_bytes`` caps both the bytes received and
+    the bytes after decompression.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    decompressor = None
+    received = 0
+    produced = 0
+    head: Optional[bytes] = b""
+
+    def too_large():
+        return AppError(f"Import body exceeds the {max_bytes} byte limit", 413)
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        received += len(chunk)
+        if received > max_bytes:
+            raise too_large()
+
+        if head is not None:
+            # Sniff the first two bytes before deciding how to decode
+            head += chunk
+            if len(head) < 2:
+                continue
+            chunk, head = head, None
+            if chunk.startswith(_GZIP_MAGIC):
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        if decompressor is not None:
+            try:
+                chunk = decompressor.decompress(chunk)
+            except zlib.error:
+                raise AppError("Invalid gzip data")
+        produced += len(chunk)
+        if produced > max_bytes:
+            raise too_large()
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+
+    tail = head or b""
+    if decompressor is not None:
+        try:
+            tail += decompressor.flush()
+        except zlib.error:
+            raise AppError("Invalid gzip data")
+    text = decoder.decode(tail, final=True)
+    if text:
+        yield text
+
+def iter_ndjson(chunks: Iterator[str]) -> Iterator[Any]:
+    """Yield one decoded value per non-blank line of newline-delimited JSON."""
+    buffer = ""
+    line_number = 0
+    for chunk in chunks:
+        buffer += chunk
+        lines = buffer.split("\n")
+        buffer = lines.pop()
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield _loads(line, line_number)
+    if buffer.strip():
+        yield _loads(buffer, line_number + 1)
+
+def _loads(line: str, line_number: int) -> Any:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        raise AppError(f"Invalid JSON on line {line_number}: {e.msg}")
+
+class JsonArrayReader:
+    """Incrementally yields the elements of a JSON array from text chunks.
+
+    Accepts either a top-level array or an object whose ``key`` member is the
+    array (other members are skipped). Only the element being decoded is held
+    in memory, so memory use is bounded by the largest element rather than by
+    the size of the document.
+    """
+
+    def __init__(self, chunks: Iterator[str], key: str = "apps"):
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.key = key
+
+    def __iter__(self) -> Iterator[Any]:
+        first = self._peek()
+        if first == "[":
+            yield from self._array()
+        elif first == "{":
+            yield from self._member_array()
+        else:
+            raise AppError("Invalid data format - expected array of apps")
+
+    def _member_array(self) -> Iterator[Any]:
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            name = self._value()
+            if not isinstance(name, str):
+                raise AppError("Invalid JSON: expected an object key")
+            self._expect(":")
+            if name == self.key:
+                if self._peek() != "[":
+                    raise AppError("Invalid data format - expected array of apps")
+                # Anything after the array is irrelevant to the import
+                yield from self._array()
+                return
+            self._value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise AppError("Invalid JSON: expected ',' or '}'")
+
+    def _array(self) -> Iterator[Any]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise AppError("Invalid JSON: expected ',' or ']'")
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, discarding consumed text."""
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> Optional[str]:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise AppError("Invalid JSON: unexpected end of data")
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise AppError(f"Invalid JSON: expected '{char}'")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        """Decode one complete JSON value, reading more chunks as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A value ending at the buffer edge may continue in the next
+                # chunk, and a number ("1." before "5") even a little before it
+                edge = _EDGE if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+                if end < len(self._buffer) - edge or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                # Only an error near the end of the buffer, or a string running
+                # up to it, can be a value cut off by the chunk boundary;
+                # anything else is reported without reading the rest of the body
+                truncated = e.pos >= len(self._buffer) - _EDGE or e.msg.startswith("Unterminated string")
+                if self._eof or not truncated:
+                    raise AppError(f"Invalid JSON: {e.msg}")
+            self._fill()
@@ -0,0 +1,260 @@
+import bisect
+import contextvars
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union, cast
+from flask import Flask, g, request, template_rendered, before_render_template
+from config import Config
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow page loads
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, total in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, values)} {total:g}")
+        return lines
+
+class Histogram:
+    """Cumulative-bucket latency histogram with labels, in seconds."""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str],
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *label_values: str) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += seconds
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for values, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    labels = _format_labels(self.labels, values, 'le="%s"' % le)
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, values)} {total[0]:.6f}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, values)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """The process-wide set of metrics, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self.request_latency = Histogram(
+            "http_request_duration_seconds", "Time spent handling a request.",
+            ("endpoint", "method", "status")
+        )
+        self.requests = Counter(
+            "http_requests_total", "Requests handled.", ("endpoint", "method", "status")
+        )
+        self.operation_latency = Histogram(
+            "operation_duration_seconds", "Time spent in an instrumented operation.",
+            ("endpoint", "kind", "operation")
+        )
+        self.operation_errors = Counter(
+            "operation_errors_total", "Instrumented operations that raised.",
+            ("endpoint", "kind", "operation")
+        )
+
+    def expose(self) -> str:
+        lines: List[str] = []
+        collected: Tuple[Union[Histogram, Counter], ...] = (
+            self.request_latency, self.requests, self.operation_latency, self.operation_errors
+        )
+        for metric in collected:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+class RequestTimings:
+    """Operation timings collected while serving one request.
+
+    Shared by the request thread and any worker threads it fans out to (see
+    ``PageLoader``), so recording is locked.
+    """
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self._totals: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            total = self._totals.setdefault(name, [0.0, 0])
+            total[0] += seconds
+            total[1] += 1
+
+    def server_timing(self) -> str:
+        """Render the ``Server-Timing`` header value, in milliseconds."""
+        with self._lock:
+            entries = [
+                f'{name};dur={seconds * 1000:.2f}' + (f';desc="{count} calls"' if count > 1 else "")
+                for name, (seconds, count) in self._totals.items()
+            ]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(entries)
+
+_current: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+@contextmanager
+def timed(kind: str, operation: str) -> Iterator[None]:
+    """Time a block, feeding the operation histogram and the current request's timings."""
+    if not Config.METRICS_ENABLED:
+        yield
+        return
+    timings = _current.get()
+    endpoint = timings.endpoint if timings else "none"
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        metrics.operation_errors.inc(endpoint, kind, operation)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.operation_latency.observe(elapsed, endpoint, kind, operation)
+        if timings is not None:
+            timings.add(f"{kind}-{operation}", elapsed)
+
+def timed_function(kind: str, operation: Optional[str] = None) -> Callable[[F], F]:
+    """Decorate a function so every call is timed as ``kind``/``operation``."""
+    def decorator(fn: F) -> F:
+        name = operation or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(kind, name):
+                return fn(*args, **kwargs)
+        return cast(F, wrapper)
+    return decorator
+
+def instrumented(kind: str) -> Callable[[type], type]:
+    """Class decorator timing every public method defined on the class.
+
+    Coroutine methods are timed until they complete. Generators are left
+    alone, since timing them would only measure their creation.
+    """
+    def decorator(cls: type) -> type:
+        for name, member in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.isfunction(member):
+                continue
+            if inspect.isgeneratorfunction(member):
+                continue
+            setattr(cls, name, timed_function(kind, name)(member))
+        return cls
+    return decorator
+
+def run_in_context(fn: Callable, *args, **kwargs) -> Callable[[], Any]:
+    """Bind ``fn`` to a copy of the caller's context, for running on a worker thread."""
+    context = contextvars.copy_context()
+    return lambda: context.run(fn, *args, **kwargs)
+
+def start_request(endpoint: str) -> Tuple[RequestTimings, contextvars.Token]:
+    """Begin timing a request; pass the token back to ``finish_request``."""
+    timings = RequestTimings(endpoint)
+    return timings, _current.set(timings)
+
+def finish_request(timings: RequestTimings, method: str, status: int) -> str:
+    """Record a finished request and return its ``Server-Timing`` header value."""
+    elapsed = time.perf_counter() - timings.started
+    metrics.request_latency.observe(elapsed, timings.endpoint, method, str(status))
+    metrics.requests.inc(timings.endpoint, method, str(status))
+    return timings.server_timing()
+
+def reset_request(token: contextvars.Token) -> None:
+    """Detach a request's timings from the current context."""
+    _current.reset(token)
+
+def init_metrics(app: Flask) -> None:
+    """Install request hooks that time every request and add ``Server-Timing`` headers."""
+    if not Config.METRICS_ENABLED:
+        return
+
+    @app.before_request
+    def start_timing():
+        g.request_timings, g.request_timings_token = start_request(request.endpoint or "none")
+
+    @app.after_request
+    def finish_timing(response):
+        timings = g.pop("request_timings", None)
+        if timings is None:
+            return response
+        response.headers["Server-Timing"] = finish_request(timings, request.method, response.status_code)
+        return response
+
+    @app.teardown_request
+    def reset_timing(error=None):
+        token = g.pop("request_timings_token", None)
+        if token is not None:
+            reset_request(token)
+
+    def template_started(sender, template, context, **extra):
+        g.template_started = time.perf_counter()
+
+    def template_finished(sender, template, context, **extra):
+        started = g.pop("template_started", None)
+        timings = _current.get()
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        endpoint = timings.endpoint if timings else "none"
+        metrics.operation_latency.observe(elapsed, endpoint, "render", template.name or "template")
+        if timings is not None:
+            timings.add("render", elapsed)
+
+    # Strong references: the handlers are local functions
+    before_render_template.connect(template_started, app, weak=False)
+    template_rendered.connect(template_finished, app, weak=False)
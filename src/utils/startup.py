@@ -0,0 +1,179 @@
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+# Modules whose import is deferred to first use; the report shows whether startup loaded them
+DEFERRED_MODULES = ("supabase", "httpx", "postgrest", "requests", "PIL")
+
+def _process_started() -> float:
+    """Return when this process started on the ``perf_counter`` clock.
+
+    Read from ``/proc`` so interpreter start-up and the server's own boot are
+    included; elsewhere this module's import time is used instead.
+    """
+    now = time.perf_counter()
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        age = uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+        return now - max(age, 0.0)
+    except (OSError, ValueError, IndexError):
+        return now
+
+class StartupReport:
+    """Milestones from process start to the first response served.
+
+    ``mark`` closes a phase at the current time; the report lists each phase
+    with its own and cumulative duration, in the spirit of ``-X importtime``.
+    """
+
+    def __init__(self):
+        self.started = _process_started()
+        self.phases: List[Tuple[str, float]] = []
+        self.first_response: Optional[float] = None
+        self.prewarming = False
+        self._first_request_seen = False
+        self._lock = threading.Lock()
+
+    def mark(self, name: str) -> None:
+        with self._lock:
+            self.phases.append((name, time.perf_counter() - self.started))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record the block as its own phase, closing any time before it as ``waiting``."""
+        self._mark_gap("waiting")
+        try:
+            yield
+        finally:
+            self.mark(name)
+
+    def _mark_gap(self, name: str) -> None:
+        with self._lock:
+            last = self.phases[-1][1] if self.phases else 0.0
+            now = time.perf_counter() - self.started
+            if now - last > 0.001:
+                self.phases.append((name, now))
+
+    def request_started(self) -> None:
+        """Close the time until the first real request arrived as ``waiting``."""
+        with self._lock:
+            if self._first_request_seen or self.prewarming:
+                return
+            self._first_request_seen = True
+        self._mark_gap("waiting")
+
+    def responded(self) -> bool:
+        """Record the first real response; returns True only for that one."""
+        with self._lock:
+            if self.first_response is not None or self.prewarming:
+                return False
+            self.first_response = time.perf_counter() - self.started
+            self.phases.append(("first_response", self.first_response))
+        return True
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = list(self.phases)
+        previous = 0.0
+        rows = []
+        for name, at in phases:
+            rows.append({"phase": name, "ms": round((at - previous) * 1000, 1),
+                         "cumulativeMs": round(at * 1000, 1)})
+            previous = at
+        return {
+            "pid": os.getpid(),
+            "phases": rows,
+            "firstResponseMs": round(self.first_response * 1000, 1) if self.first_response else None,
+            "modules": len(sys.modules),
+            "deferredModulesLoaded": [name for name in DEFERRED_MODULES if name in sys.modules]
+        }
+
+    def format(self) -> str:
+        """Render the report as ``-X importtime``-style lines."""
+        lines = ["startup time:  self [ms] | cumulative | phase"]
+        for row in self.report()["phases"]:
+            lines.append(f"startup time: {row['ms']:>9.1f} | {row['cumulativeMs']:>10.1f} | {row['phase']}")
+        return "\n".join(lines)
+
+startup_report = StartupReport()
+startup_report.mark("boot")
+
+def init_startup(app: "Flask") -> None:
+    """Log the startup report once the first (non pre-warm) response is sent."""
+    @app.before_request
+    def record_first_request():
+        if startup_report.first_response is None:
+            startup_report.request_started()
+
+    @app.after_request
+    def record_first_response(response):
+        if startup_report.first_response is None and startup_report.responded():
+            logger.info("Startup report:\n%s", startup_report.format())
+        return response
+
+def prewarm(app: "Flask", paths: Sequence[str]) -> None:
+    """Serve ``paths`` in-process to open connections and fill the caches before traffic.
+
+    Failures are logged and skipped: a cold worker is better than one that
+    refuses to start.
+    """
+    client = app.test_client()
+    startup_report.prewarming = True
+    try:
+        with startup_report.phase("prewarm"):
+            for path in paths:
+                try:
+                    response = client.get(path)
+                    logger.info(f"Pre-warmed {path}: {response.status_code}")
+                except Exception as e:
+                    logger.warning(f"Pre-warming {path} failed: {e}")
+    finally:
+        startup_report.prewarming = False
+
+async def prewarm_asgi(app: Callable, paths: Sequence[str]) -> None:
+    """``prewarm`` for the ASGI app: serve ``paths`` in-process on the worker's event loop."""
+    startup_report.prewarming = True
+    try:
+        with startup_report.phase("prewarm"):
+            for path in paths:
+                try:
+                    status = await _asgi_get(app, path)
+                    logger.info(f"Pre-warmed {path}: {status}")
+                except Exception as e:
+                    logger.warning(f"Pre-warming {path} failed: {e}")
+    finally:
+        startup_report.prewarming = False
+
+async def _asgi_get(app: Callable, path: str) -> int:
+    """Send one GET through an ASGI app, discarding the body, and return the status."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "root_path": "", "query_string": query.encode(),
+        "headers": [(b"host", b"localhost"), (b"accept-encoding", b"gzip")],
+        "server": ("localhost", 80), "client": None
+    }
+    status: List[int] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
@@ -0,0 +1,37 @@
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+def ndjson_lines(rows: Iterable[Dict[str, Any]], encode: Callable[[Dict[str, Any]], str]) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON; ``encode`` turns one row into JSON text."""
+    for row in rows:
+        yield (encode(row) + "\n").encode()
+
+def json_array(rows: Iterable[Dict[str, Any]], encode: Callable[[Dict[str, Any]], str],
+               key: str) -> Iterator[bytes]:
+    """Encode rows as ``{"<key>": [...]}`` incrementally, one row at a time."""
+    yield ('{"%s":[' % key).encode()
+    separator = ""
+    for row in rows:
+        yield (separator + encode(row)).encode()
+        separator = ","
+    yield b"]}"
+
+def batched(chunks: Iterable[bytes], size: int) -> Iterator[bytes]:
+    """Coalesce small chunks into writes of at least ``size`` bytes."""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip a byte stream incrementally, sync-flushing so each chunk goes out promptly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
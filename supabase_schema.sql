@@ -10,6 +10,13 @@ CREATE TABLE launcher_apps (
     last_launched TIMESTAMPTZ
 );
 
+-- Indexes backing category filters and keyset pagination on (sort column, id)
+CREATE INDEX idx_launcher_apps_category ON launcher_apps (category, id);
+CREATE INDEX idx_launcher_apps_name ON launcher_apps (name, id);
+CREATE INDEX idx_launcher_apps_launch_count ON launcher_apps (launch_count, id);
+CREATE INDEX idx_launcher_apps_last_modified ON launcher_apps (last_modified, id);
+CREATE INDEX idx_launcher_apps_last_launched ON launcher_apps (last_launched);
+
 -- Create launcher_settings table
 CREATE TABLE launcher_settings (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -26,6 +33,27 @@ CREATE TABLE launcher_categories (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Deleted app IDs, read by GET /api/apps/changes so replicas can drop them.
+-- Rows older than TOMBSTONE_RETENTION_DAYS are purged by the app.
+CREATE TABLE launcher_app_tombstones (
+    id UUID PRIMARY KEY,
+    deleted_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX idx_launcher_app_tombstones_deleted_at ON launcher_app_tombstones (deleted_at);
+
+-- Launches per app per hour, written by the launch counting functions below and
+-- summed into decayed popularity scores (sort=popular). Rows older than
+-- POPULARITY_RETENTION_DAYS are purged by the app.
+CREATE TABLE launcher_app_launches (
+    app_id UUID NOT NULL REFERENCES launcher_apps (id) ON DELETE CASCADE,
+    bucket TIMESTAMPTZ NOT NULL,
+    launches INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (app_id, bucket)
+);
+
+CREATE INDEX idx_launcher_app_launches_bucket ON launcher_app_launches (bucket);
+
 -- Create updated_at trigger function
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -39,4 +67,97 @@ $$ language 'plpgsql';
 CREATE TRIGGER update_launcher_settings_updated_at
     BEFORE UPDATE ON launcher_settings
     FOR EACH ROW
-    EXECUTE FUNCTION update_updated_at_column(); 
\ No newline at end of file
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Atomically increment one app's launch count and its hourly launch bucket
+-- (single round trip, no lost updates)
+CREATE OR REPLACE FUNCTION increment_launch_count(
+    app_id UUID,
+    amount INTEGER DEFAULT 1,
+    launched_at TIMESTAMPTZ DEFAULT NOW()
+)
+RETURNS SETOF launcher_apps AS $$
+    WITH updated AS (
+        UPDATE launcher_apps
+        SET launch_count = launch_count + amount,
+            last_launched = GREATEST(COALESCE(last_launched, launched_at), launched_at)
+        WHERE id = app_id
+        RETURNING *
+    ), logged AS (
+        INSERT INTO launcher_app_launches (app_id, bucket, launches)
+        SELECT id, date_trunc('hour', launched_at), amount FROM updated
+        ON CONFLICT (app_id, bucket)
+        DO UPDATE SET launches = launcher_app_launches.launches + EXCLUDED.launches
+    )
+    SELECT * FROM updated;
+$$ LANGUAGE sql;
+
+-- Apply merged launch increments for many apps at once (write-behind flushes).
+-- increments: [{"id": uuid, "count": int, "last_launched": timestamptz}, ...]
+CREATE OR REPLACE FUNCTION increment_launch_counts(increments JSONB)
+RETURNS INTEGER AS $$
+    WITH deltas AS (
+        SELECT (e->>'id')::UUID AS id,
+               (e->>'count')::INTEGER AS amount,
+               (e->>'last_launched')::TIMESTAMPTZ AS launched_at
+        FROM jsonb_array_elements(increments) AS e
+    ), updated AS (
+        UPDATE launcher_apps a
+        SET launch_count = a.launch_count + d.amount,
+            last_launched = GREATEST(COALESCE(a.last_launched, d.launched_at), d.launched_at)
+        FROM deltas d
+        WHERE a.id = d.id
+        RETURNING a.id, d.amount, d.launched_at
+    ), logged AS (
+        -- A flush spans seconds, so its merged launches share the last one's bucket
+        INSERT INTO launcher_app_launches (app_id, bucket, launches)
+        SELECT id, date_trunc('hour', launched_at), amount FROM updated
+        ON CONFLICT (app_id, bucket)
+        DO UPDATE SET launches = launcher_app_launches.launches + EXCLUDED.launches
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$ LANGUAGE sql;
+
+-- Decayed popularity score of every app launched since a given time: each
+-- launch counts 2^(-age / half_life), its age taken from the start of its hour
+CREATE OR REPLACE FUNCTION app_popularity(half_life_hours DOUBLE PRECISION, since TIMESTAMPTZ)
+RETURNS TABLE (app_id UUID, score DOUBLE PRECISION) AS $$
+    SELECT l.app_id,
+           SUM(l.launches * power(2, -EXTRACT(EPOCH FROM NOW() - l.bucket) / 3600 / half_life_hours))
+    FROM launcher_app_launches l
+    WHERE l.bucket >= since
+    GROUP BY l.app_id;
+$$ LANGUAGE sql STABLE;
+
+-- App count and newest modification of every category, listed or only used by
+-- apps (listed is false for those), in one grouped scan of launcher_apps
+CREATE OR REPLACE FUNCTION category_facets()
+RETURNS TABLE (name TEXT, app_count INTEGER, last_modified TIMESTAMPTZ, listed BOOLEAN) AS $$
+    SELECT COALESCE(c.name, a.category),
+           COALESCE(a.app_count, 0)::INTEGER,
+           a.last_modified,
+           c.name IS NOT NULL
+    FROM launcher_categories c
+    FULL OUTER JOIN (
+        SELECT COALESCE(category, 'uncategorized') AS category,
+               COUNT(*) AS app_count,
+               MAX(last_modified) AS last_modified
+        FROM launcher_apps
+        GROUP BY 1
+    ) a ON a.category = c.name
+    ORDER BY 1;
+$$ LANGUAGE sql STABLE;
+
+-- Catalog version behind ETag / Last-Modified validators: any insert, update,
+-- delete or launch changes at least one of these values
+CREATE OR REPLACE FUNCTION catalog_version()
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'apps_count', (SELECT COUNT(*) FROM launcher_apps),
+        'apps_modified', (SELECT MAX(last_modified) FROM launcher_apps),
+        'apps_launched', (SELECT MAX(last_launched) FROM launcher_apps),
+        'categories_count', (SELECT COUNT(*) FROM launcher_categories),
+        'categories_created', (SELECT MAX(created_at) FROM launcher_categories),
+        'settings_updated', (SELECT MAX(updated_at) FROM launcher_settings)
+    );
+$$ LANGUAGE sql STABLE;
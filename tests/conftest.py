@@ -0,0 +1,111 @@
+import io
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+import pytest
+
+# The app reads its configuration at import time: point it at throwaway
+# storage before anything imports config
+_STATE_DIR = tempfile.mkdtemp(prefix="launcher-tests-")
+os.environ.update(
+    {
+        "STORAGE_BACKEND": "sqlite",
+        "SQLITE_PATH": os.path.join(_STATE_DIR, "launcher.db"),
+        "ICON_CACHE_DIR": os.path.join(_STATE_DIR, "icons"),
+        # The icon origin below listens on loopback
+        "ICON_ALLOW_PRIVATE_HOSTS": "true",
+        "PREWARM": "false",
+    }
+)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_png(size: int = 300, color: tuple = (200, 40, 40, 255)) -> bytes:
+    from PIL import Image
+
+    output = io.BytesIO()
+    Image.new("RGBA", (size, size), color).save(output, format="PNG")
+    return output.getvalue()
+
+
+SVG = (
+    b'<svg xmlns="http://www.w3.org/2000/svg" width="300" height="300">'
+    b"<script>alert(document.cookie)</script></svg>"
+)
+
+
+class Origin:
+    """Local HTTP icon origin.
+
+    ``/icon/<n>.png`` serves a PNG, ``/svg/<n>.svg`` an SVG with a script in it
+    and ``/redirect?to=<path>`` a 302.
+    """
+
+    def __init__(self):
+        self.hits: Dict[str, int] = {}
+        origin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path, _, query = self.path.partition("?")
+                origin.hits[path] = origin.hits.get(path, 0) + 1
+                if path == "/redirect":
+                    self.send_response(302)
+                    self.send_header("Location", query.partition("=")[2])
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if path.startswith("/svg/"):
+                    body, mimetype = SVG, "image/svg+xml"
+                elif path.startswith("/icon/"):
+                    # Each icon gets its own colour, so different icons differ in content
+                    seed = sum(path.encode())
+                    body = make_png(color=(seed % 256, seed * 7 % 256, seed * 13 % 256, 255))
+                    mimetype = "image/png"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", mimetype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture(scope="session")
+def origin():
+    server = Origin()
+    yield server
+    server.close()
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app import app as flask_app
+
+    flask_app.config["TESTING"] = True
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
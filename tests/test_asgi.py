@@ -0,0 +1,110 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def asgi_app(app):
+    from asgi import create_asgi_app
+
+    return create_asgi_app(app)
+
+
+def call(asgi_app, method, path, body_chunks=(b"",), headers=()):
+    """Send one request through the ASGI app; return (status, headers, body)."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"localhost")] + [(k.encode(), v.encode()) for k, v in headers],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 5000),
+    }
+    chunks = list(body_chunks)
+    messages = []
+
+    async def receive():
+        body = chunks.pop(0)
+        return {"type": "http.request", "body": body, "more_body": bool(chunks)}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(asgi_app(scope, receive, send))
+    start = messages[0]
+    response_headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return start["status"], response_headers, body
+
+
+def test_json_views_answer_with_validators(asgi_app):
+    status, headers, body = call(asgi_app, "GET", "/api/apps?limit=5")
+    assert status == 200
+    assert "apps" in json.loads(body)
+
+    status, _, body = call(
+        asgi_app, "GET", "/api/apps?limit=5", headers=[("if-none-match", headers["etag"])]
+    )
+    assert status == 304
+    assert body == b""
+
+
+def test_streamed_request_bodies_reach_the_view(asgi_app):
+    payload = json.dumps({"name": "ASGI app", "category": "tools"}).encode()
+    status, _, body = call(
+        asgi_app,
+        "POST",
+        "/api/apps",
+        body_chunks=(payload[:10], payload[10:]),
+        headers=[("content-type", "application/json")],
+    )
+    assert status == 201
+    created = json.loads(body)["app"]
+
+    status, _, body = call(asgi_app, "GET", f"/api/apps/{created['id']}")
+    assert status == 200
+    assert json.loads(body)["name"] == "ASGI app"
+
+
+def test_views_run_off_the_event_loop(asgi_app, monkeypatch):
+    from src.routes import categories
+
+    threads = []
+    get_categories = categories.db.get_categories
+
+    def recording_get_categories():
+        threads.append(threading.current_thread().name)
+        return get_categories()
+
+    monkeypatch.setattr(categories.db, "get_categories", recording_get_categories)
+    status, _, _ = call(asgi_app, "GET", "/api/categories")
+    assert status == 200
+    assert threads and all(name.startswith("asgi") for name in threads)
+
+
+def test_unknown_paths_are_answered_by_flask(asgi_app):
+    status, headers, _ = call(asgi_app, "GET", "/api/nothing-here")
+    assert status == 404
+    assert headers["content-type"] == "application/json"
+
+
+def test_lifespan_completes(asgi_app):
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    asyncio.run(asgi_app({"type": "lifespan"}, receive, send))
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
@@ -0,0 +1,135 @@
+import pytest
+
+from config import Config
+from src.models.exceptions import AppError
+from src.services.cache import CachedDatabaseService, TTLCache
+from src.services.catalog_indexes import CatalogIndexes
+from src.services.data_processing import DataProcessor
+from src.services.database import DatabaseService
+from src.services.facets import CategoryFacets
+from src.services.popularity import PopularityTracker
+from src.services.search_index import SearchIndex
+from src.services.sqlite_backend import SQLiteClient
+
+APP_IDS = [f"00000000-0000-0000-0000-{n:012d}" for n in range(5)]
+MISSING_ID = "11111111-1111-1111-1111-111111111111"
+
+
+def make_client():
+    client = SQLiteClient(":memory:")
+    rows = [
+        {"id": app_id, "name": f"App {n}", "category": "tools", "launch_count": 0}
+        for n, app_id in enumerate(APP_IDS)
+    ]
+    client.table(Config.APPS_TABLE).insert(rows).execute()
+    return client
+
+
+@pytest.fixture
+def db():
+    return DatabaseService(make_client())
+
+
+def count_tables(db, monkeypatch, fail_call=None):
+    """Count ``client.table`` calls, failing the ``fail_call``-th query if given."""
+    calls = []
+    table = db.client.table
+
+    def counting_table(name):
+        calls.append(name)
+        query = table(name)
+        if len(calls) == fail_call:
+
+            def failing_execute():
+                raise RuntimeError("database unavailable")
+
+            monkeypatch.setattr(query, "execute", failing_execute)
+        return query
+
+    monkeypatch.setattr(db.client, "table", counting_table)
+    return calls
+
+
+def test_invalid_operations_reject_the_whole_batch():
+    with pytest.raises(AppError):
+        DataProcessor.validate_batch({"operations": [{"op": "rename", "ids": APP_IDS}]})
+    with pytest.raises(AppError):
+        DataProcessor.validate_batch(
+            {"operations": [{"op": "update", "ids": APP_IDS, "values": {"iconUrl": "https://x"}}]}
+        )
+    with pytest.raises(AppError):
+        DataProcessor.validate_batch({"operations": [{"op": "delete", "ids": []}]})
+
+    operations = DataProcessor.validate_batch(
+        {"operations": [{"op": "delete", "ids": [APP_IDS[0], APP_IDS[0]]}]}
+    )
+    assert operations == [("delete", [APP_IDS[0]], {})]
+
+
+def test_each_chunk_of_ids_is_one_query(db, monkeypatch):
+    operations = DataProcessor.validate_batch(
+        {"operations": [{"op": "recategorize", "ids": APP_IDS, "category": "games"}]}
+    )
+    calls = count_tables(db, monkeypatch)
+
+    report = db.batch_apps(operations, chunk_size=2)
+
+    assert len(calls) == 3
+    assert report["updated"] == 5
+    assert {app["category"] for app in db.get_apps()} == {"games"}
+
+
+def test_statuses_are_reported_per_id(db):
+    operations = DataProcessor.validate_batch(
+        {
+            "operations": [
+                {"op": "delete", "ids": [APP_IDS[0], MISSING_ID, "not-a-uuid"]},
+                {"op": "update", "ids": [APP_IDS[0], APP_IDS[1]], "values": {"name": "Renamed"}},
+            ]
+        }
+    )
+    report = db.batch_apps(operations)
+
+    assert report["results"][0]["statuses"] == {
+        APP_IDS[0]: "deleted",
+        MISSING_ID: "missing",
+        "not-a-uuid": "missing",
+    }
+    # Deleted by the earlier operation
+    assert report["results"][1]["statuses"] == {APP_IDS[0]: "missing", APP_IDS[1]: "updated"}
+    assert (report["deleted"], report["updated"], report["missing"]) == (1, 1, 3)
+    assert db.get_changes(db.get_changes()["token"])["deleted"] == [APP_IDS[0]]
+
+
+def test_a_failed_chunk_is_reported_and_the_batch_carries_on(db, monkeypatch):
+    operations = DataProcessor.validate_batch(
+        {"operations": [{"op": "update", "ids": APP_IDS, "values": {"name": "Renamed"}}]}
+    )
+    count_tables(db, monkeypatch, fail_call=2)
+
+    report = db.batch_apps(operations, chunk_size=2)
+
+    statuses = report["results"][0]["statuses"]
+    assert [statuses[app_id] for app_id in APP_IDS] == ["updated"] * 2 + ["error"] * 2 + ["updated"]
+    assert report["failed"] == 2
+
+
+def test_cached_reads_follow_a_batch():
+    indexes = CatalogIndexes(SearchIndex(300), PopularityTracker(72, 10, 300), CategoryFacets(300))
+    db = CachedDatabaseService(make_client(), cache=TTLCache(300, 128), indexes=indexes)
+    assert db.get_category_facets()[0]["app_count"] == 5
+    db.get_apps({"category": "tools"})
+
+    operations = DataProcessor.validate_batch(
+        {
+            "operations": [
+                {"op": "recategorize", "ids": APP_IDS[:2], "category": "games"},
+                {"op": "delete", "ids": [APP_IDS[4]]},
+            ]
+        }
+    )
+    db.batch_apps(operations)
+
+    assert len(db.get_apps({"category": "tools"})) == 2
+    counts = {row["name"]: row["app_count"] for row in db.get_category_facets()}
+    assert (counts["games"], counts["tools"]) == (2, 2)
@@ -0,0 +1,122 @@
+from datetime import datetime
+
+import pytest
+
+from config import Config
+from src.services.cache import CachedDatabaseService, TTLCache
+from src.services.catalog_indexes import CatalogIndexes
+from src.services.facets import CategoryFacets
+from src.services.popularity import PopularityTracker
+from src.services.render_cache import RenderedPage, page_cache
+from src.services.search_index import SearchIndex
+from src.services.sqlite_backend import SQLiteClient
+from src.utils.compression import CompressedBody, compressed_cache
+
+GAMES = [f"00000000-0000-0000-0000-{n:012d}" for n in range(3)]
+TOOLS = [f"00000000-0000-0000-0001-{n:012d}" for n in range(3)]
+
+
+@pytest.fixture
+def db():
+    client = SQLiteClient(":memory:")
+    rows = [
+        {"id": app_id, "name": f"{category} {n}", "category": category, "launch_count": 0}
+        for category, ids in (("games", GAMES), ("tools", TOOLS))
+        for n, app_id in enumerate(ids)
+    ]
+    client.table(Config.APPS_TABLE).insert(rows).execute()
+    indexes = CatalogIndexes(SearchIndex(300), PopularityTracker(72, 10, 300), CategoryFacets(300))
+    return CachedDatabaseService(client, cache=TTLCache(300, 128), indexes=indexes)
+
+
+def cached(db, *key):
+    found, _ = db.cache.get(key)
+    return found
+
+
+def games_key():
+    return (("category", "games"),)
+
+
+def tools_key():
+    return (("category", "tools"),)
+
+
+def warm(db):
+    db.get_apps({"category": "games"})
+    db.get_apps({"category": "tools"})
+    db.get_apps_page({"category": "tools"}, "name", False, 2)
+    db.get_apps_page({"category": "games"}, "name", False, 2)
+    db.get_apps_page(None, "launch_count", True, 2)
+    db.get_app_by_id(GAMES[0])
+    db.get_app_by_id(TOOLS[0])
+    db.get_categories()
+    db.get_catalog_version()
+
+
+def test_a_launch_drops_only_the_reads_it_touched(db):
+    warm(db)
+    db.increment_launch_count(GAMES[0])
+
+    assert not cached(db, "apps", games_key())
+    assert not cached(db, "page", games_key(), "name", False, 2, None)
+    assert not cached(db, "app", GAMES[0])
+    assert not cached(db, "version")
+    # Sorted by launches, so any launch may reorder it
+    assert not cached(db, "page", (), "launch_count", True, 2, None)
+
+    assert cached(db, "apps", tools_key())
+    assert cached(db, "page", tools_key(), "name", False, 2, None)
+    assert cached(db, "app", TOOLS[0])
+    assert cached(db, "categories")
+
+    assert db.get_app_by_id(GAMES[0])["launch_count"] == 1
+    page = db.get_apps_page(None, "launch_count", True, 2)
+    assert page["apps"][0]["id"] == GAMES[0]
+
+
+def test_a_flush_drops_the_reads_of_every_launched_app(db):
+    warm(db)
+    now = datetime.utcnow().isoformat()
+    db.increment_launch_counts({TOOLS[0]: {"count": 3, "last_launched": now}})
+
+    assert not cached(db, "apps", tools_key())
+    assert not cached(db, "app", TOOLS[0])
+    assert cached(db, "apps", games_key())
+    assert cached(db, "app", GAMES[0])
+    assert db.get_app_by_id(TOOLS[0])["launch_count"] == 3
+
+
+def test_other_writes_drop_every_cached_read(db):
+    warm(db)
+    db.update_app(TOOLS[1], {"name": "renamed"})
+
+    assert not cached(db, "apps", games_key())
+    assert not cached(db, "categories")
+    assert [app["name"] for app in db.get_apps({"category": "tools"})].count("renamed") == 1
+
+
+def test_writes_leave_etag_keyed_responses_alone(db):
+    page_cache.set("page-etag", RenderedPage(b"<html></html>", b"", "page-etag"))
+    compressed_cache.set(("body-etag", "gzip"), CompressedBody(b"gzipped", "application/json"))
+
+    db.update_app(TOOLS[1], {"name": "renamed"})
+    db.increment_launch_count(GAMES[0])
+
+    assert page_cache.get("page-etag")[0]
+    assert compressed_cache.get(("body-etag", "gzip"))[0]
+
+
+def test_discard_drops_picked_entries_and_loads_in_flight():
+    cache = TTLCache(300, 16)
+    cache.set("keep", 1)
+    cache.set("drop", 2)
+    generation = cache.generation
+
+    cache.discard(lambda key, value: key == "drop")
+
+    assert cache.get("keep") == (True, 1)
+    assert cache.get("drop") == (False, None)
+    # A load that started before the discard may have read what it dropped
+    cache.set("drop", 2, generation)
+    assert cache.get("drop") == (False, None)
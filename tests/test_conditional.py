@@ -0,0 +1,43 @@
+def seed_apps(client, count=30):
+    for n in range(count):
+        client.post("/api/apps", json={"name": f"Conditional app {n:02d}", "category": "games"})
+
+
+def test_compressed_etag_only_matches_requests_accepting_it(client):
+    seed_apps(client)
+    compressed = client.get("/api/apps", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    etag = compressed.headers["ETag"]
+
+    revalidated = client.get(
+        "/api/apps", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+
+    for header in ("identity", "gzip;q=0"):
+        plain = client.get("/api/apps", headers={"Accept-Encoding": header, "If-None-Match": etag})
+        assert plain.status_code == 200, header
+        assert "Content-Encoding" not in plain.headers
+        assert plain.headers["ETag"] != etag
+
+
+def test_deleting_an_older_app_invalidates_cached_responses(client):
+    older = client.post("/api/apps", json={"name": "Older app", "category": "tools"}).get_json()[
+        "app"
+    ]["id"]
+    client.post("/api/apps", json={"name": "Newer app", "category": "tools"})
+    first = client.get("/api/apps")
+    assert "Last-Modified" not in first.headers
+
+    assert client.delete(f"/api/apps/{older}").status_code == 200
+
+    after = client.get(
+        "/api/apps",
+        headers={
+            "If-None-Match": first.headers["ETag"],
+            "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT",
+        },
+    )
+    assert after.status_code == 200
+    assert older not in [app["id"] for app in after.get_json()["apps"]]
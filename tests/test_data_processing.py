@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from config import Config
+from src.services.data_processing import (
+    DataProcessor,
+    _encode_json_value,
+    compile_row_encoder,
+    compile_row_formatter,
+)
+
+ROW = {
+    "id": "6f1c3c1e-0000-4000-8000-000000000001",
+    "name": 'Quote " and \\ backslash é  ',
+    "category": "games",
+    "icon_url": "https://example.com/icon.png",
+    "app_store_link": None,
+    "launch_count": 12,
+    "last_modified": "2026-01-01T00:00:00+00:00",
+    "last_launched": None,
+}
+
+
+def test_formatter_maps_columns_to_camel_case():
+    format_row = compile_row_formatter(Config.APP_COLUMNS)
+    assert format_row(ROW) == DataProcessor.snake_to_camel_dict(ROW)
+    assert list(format_row(ROW)) == [DataProcessor.to_camel_case(c) for c in Config.APP_COLUMNS]
+
+
+@pytest.mark.parametrize("value", [None, 0, -3, 1.5, True, "", "text", "café", {"a": [1]}])
+def test_encoder_round_trips_through_json(value):
+    encode_row = compile_row_encoder(("only_column", "other"))
+    row = {"only_column": value, "other": "x"}
+    assert json.loads(encode_row(row)) == {"onlyColumn": value, "other": "x"}
+    assert json.loads(_encode_json_value(value)) == value
+
+
+def test_encoder_matches_formatter():
+    encode_row = compile_row_encoder(Config.APP_COLUMNS)
+    assert json.loads(encode_row(ROW)) == compile_row_formatter(Config.APP_COLUMNS)(ROW)
+
+
+def test_column_names_are_data_not_code():
+    column = "x']; import os #"
+    assert compile_row_formatter((column,))({column: 1}) == {column: 1}
+    assert json.loads(compile_row_encoder((column,))({column: 1})) == {column: 1}
+
+
+def test_apps_json_round_trips():
+    assert (
+        json.loads(DataProcessor.apps_to_json([ROW, ROW]))
+        == [DataProcessor.format_app_response(ROW)] * 2
+    )
+
+
+def test_key_conversions():
+    assert DataProcessor.to_camel_case("app_store_link") == "appStoreLink"
+    assert DataProcessor.camel_to_snake("appStoreLink") == "app_store_link"
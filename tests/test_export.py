@@ -0,0 +1,14 @@
+import gzip
+import json
+
+
+def test_export_respects_refused_gzip(client):
+    client.post("/api/apps", json={"name": "Exported", "category": "tools"})
+
+    compressed = client.get("/api/apps/export", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(compressed.data))["apps"]
+
+    plain = client.get("/api/apps/export", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in plain.headers
+    assert json.loads(plain.data)["apps"]
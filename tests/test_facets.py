@@ -0,0 +1,110 @@
+import pytest
+
+from config import Config
+from src.services.cache import CachedDatabaseService, TTLCache
+from src.services.catalog_indexes import CatalogIndexes
+from src.services.facets import CategoryFacets, group_facets
+from src.services.popularity import PopularityTracker
+from src.services.search_index import SearchIndex
+from src.services.sqlite_backend import SQLiteClient
+
+APPS = [
+    {"id": "a", "category": "games", "last_modified": "2026-01-01T00:00:00"},
+    {"id": "b", "category": "games", "last_modified": "2026-01-03T00:00:00"},
+    {"id": "c", "category": "tools", "last_modified": "2026-01-02T00:00:00"},
+]
+
+
+def built():
+    facets = CategoryFacets(300)
+    facets.rebuild(group_facets(APPS, ["games", "social"]))
+    return facets
+
+
+def counts(rows):
+    return {row["name"]: row["app_count"] for row in rows}
+
+
+def version(facets):
+    rows = facets.facets()
+    newest = max(row["last_modified"] for row in rows if row["last_modified"])
+    return {
+        "apps_count": sum(row["app_count"] for row in rows),
+        "apps_modified": newest,
+        "categories_count": sum(row["listed"] for row in rows),
+    }
+
+
+def test_grouping_counts_listed_and_used_categories():
+    assert group_facets(APPS, ["games", "social"]) == [
+        {
+            "name": "games",
+            "app_count": 2,
+            "last_modified": "2026-01-03T00:00:00+00:00",
+            "listed": True,
+        },
+        {"name": "social", "app_count": 0, "last_modified": None, "listed": True},
+        {
+            "name": "tools",
+            "app_count": 1,
+            "last_modified": "2026-01-02T00:00:00+00:00",
+            "listed": False,
+        },
+    ]
+
+
+def test_writes_move_counts_between_categories():
+    facets = built()
+    facets.add({"id": "d", "category": "social", "last_modified": "2026-01-04T00:00:00"})
+    facets.update({**APPS[0], "category": "tools"}, APPS[0])
+
+    assert counts(facets.facets()) == {"games": 1, "social": 1, "tools": 2}
+    assert facets.is_current(version(facets))
+
+
+def test_an_unlisted_category_goes_with_its_last_app():
+    facets = built()
+    facets.remove(APPS[2])
+    assert "tools" not in counts(facets.facets())
+
+
+def test_removing_a_categorys_newest_app_forces_a_rebuild():
+    facets = built()
+    current = version(facets)
+    facets.remove(APPS[1])
+    assert not facets.is_current({**current, "apps_count": 2})
+
+
+def test_other_workers_writes_are_noticed_by_the_version():
+    facets = built()
+    current = version(facets)
+    assert facets.is_current(current)
+    assert not facets.is_current({**current, "apps_count": 4})
+    assert not facets.is_current({**current, "categories_count": 3})
+    assert not facets.is_current({**current, "apps_modified": "2026-02-01T00:00:00"})
+
+
+@pytest.fixture
+def db():
+    client = SQLiteClient(":memory:")
+    rows = [
+        {**app, "id": f"00000000-0000-0000-0000-{n:012d}", "name": f"App {n}"}
+        for n, app in enumerate(APPS)
+    ]
+    client.table(Config.APPS_TABLE).insert(rows).execute()
+    indexes = CatalogIndexes(SearchIndex(300), PopularityTracker(72, 10, 300), CategoryFacets(300))
+    return CachedDatabaseService(client, cache=TTLCache(300, 128), indexes=indexes)
+
+
+def test_the_service_answers_like_the_grouped_query(db):
+    assert db.get_category_facets() == db.client.rpc(Config.CATEGORY_FACETS_FN, {}).execute().data
+
+
+def test_writes_through_the_service_keep_the_facets_without_a_rebuild(db):
+    db.get_category_facets()
+    created = db.create_app({"name": "New", "category": "social"})
+    db.update_app(created["id"], {"category": "games"})
+    db.add_category("music")
+
+    assert counts(db.get_category_facets()) == {"games": 3, "music": 0, "tools": 1}
+    assert db.indexes.facets.builds == 1
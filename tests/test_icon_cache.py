@@ -0,0 +1,260 @@
+import io
+import socket
+import threading
+import time
+from typing import List
+
+import pytest
+from PIL import Image
+
+from src.models.exceptions import AppError
+from src.services.icon_cache import IconCache, icon_cache
+
+
+def make_cache(directory, max_bytes=10 * 1024 * 1024, **kwargs):
+    kwargs.setdefault("allow_private_hosts", True)
+    return IconCache(str(directory), max_bytes, (24, 48, 64, 96), **kwargs)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def test_resizes_to_nearest_bucket(tmp_path, origin):
+    cache = make_cache(tmp_path)
+    bucket = cache.bucket(50)
+    assert bucket == 64
+    assert cache.bucket(500) == 96
+
+    data, key = cache.get(origin.url("/icon/resize.png"), bucket)
+
+    assert key == f"{cache.version(origin.url('/icon/resize.png'))}-64"
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.size == (64, 64)
+    # Served from disk the second time
+    hits = origin.hits["/icon/resize.png"]
+    assert cache.get(origin.url("/icon/resize.png"), bucket)[0] == data
+    assert origin.hits["/icon/resize.png"] == hits
+
+
+def test_evicts_least_recently_served_under_byte_cap(tmp_path, origin):
+    cache = make_cache(tmp_path)
+    first, second, third = (origin.url(f"/icon/lru-{n}.png") for n in range(3))
+    cache.get(first, 48)
+    size = cache.stats()["bytes"]
+    # Room for two icons but not three
+    cache.max_bytes = int(size * 2.5)
+
+    cache.get(second, 48)
+    time.sleep(0.01)
+    assert cache.lookup(cache.version(first), 48) is not None  # first is now the most recent
+    cache.get(third, 48)
+
+    assert cache.lookup(cache.version(second), 48) is None
+    assert cache.lookup(cache.version(first), 48) is not None
+    assert cache.lookup(cache.version(third), 48) is not None
+    assert cache.stats()["bytes"] <= cache.max_bytes
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_byte_cap_counts_files_of_other_workers(tmp_path, origin):
+    # Two caches over one directory stand in for two worker processes
+    worker, other = make_cache(tmp_path), make_cache(tmp_path)
+    worker.get(origin.url("/icon/shared-0.png"), 48)
+    size = worker.stats()["bytes"]
+    worker.max_bytes = other.max_bytes = int(size * 2.5)
+
+    other.get(origin.url("/icon/shared-1.png"), 48)
+    other.get(origin.url("/icon/shared-2.png"), 48)
+    worker.get(origin.url("/icon/shared-3.png"), 48)
+
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= worker.max_bytes
+
+
+def test_follows_redirects(tmp_path, origin):
+    cache = make_cache(tmp_path)
+    data, _ = cache.get(origin.url("/redirect?to=/icon/target.png"), 24)
+    assert data.startswith(b"\x89PNG")
+    assert origin.hits["/icon/target.png"] >= 1
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://127.0.0.1:9/icon.png",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://10.0.0.1/icon.png",
+        "http://[::1]/icon.png",
+        "http://localhost/icon.png",
+    ],
+)
+def test_refuses_non_public_hosts(tmp_path, url):
+    cache = make_cache(tmp_path, allow_private_hosts=False)
+    with pytest.raises(AppError) as error:
+        cache.get(url, 48)
+    assert error.value.status_code == 403
+
+
+def test_rechecks_every_redirect_hop(tmp_path, origin):
+    cache = make_cache(tmp_path)
+    with pytest.raises(AppError) as error:
+        cache.get(origin.url("/redirect?to=file:///etc/passwd"), 48)
+    assert error.value.status_code == 400
+
+
+def resolve_as(monkeypatch, hostname, *answers):
+    """Make ``hostname`` resolve to each of ``answers`` in turn; return the lookups made."""
+    real_getaddrinfo = socket.getaddrinfo
+    lookups: List[str] = []
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host != hostname:
+            return real_getaddrinfo(host, port, *args, **kwargs)
+        address = answers[min(len(lookups), len(answers) - 1)]
+        lookups.append(address)
+        return real_getaddrinfo(address, port, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    return lookups
+
+
+def test_connects_to_the_address_it_checked(tmp_path, origin, monkeypatch):
+    lookups = resolve_as(monkeypatch, "icons.test", "127.0.0.1")
+    cache = make_cache(tmp_path)
+    port = origin.server.server_address[1]
+
+    data, _ = cache.get(f"http://icons.test:{port}/icon/pinned.png", 48)
+
+    assert data.startswith(b"\x89PNG")
+    assert lookups == ["127.0.0.1"]
+    assert origin.hits["/icon/pinned.png"] == 1
+
+
+def test_a_second_dns_answer_is_never_used(tmp_path, origin, monkeypatch):
+    # Public when checked, loopback if it were looked up again
+    lookups = resolve_as(monkeypatch, "rebind.test", "8.8.8.8", "127.0.0.1")
+    cache = make_cache(tmp_path, fetch_timeout=0.5, allow_private_hosts=False)
+    port = origin.server.server_address[1]
+
+    with pytest.raises(AppError):
+        cache.get(f"http://rebind.test:{port}/icon/rebound.png", 48)
+
+    assert lookups == ["8.8.8.8"]
+    assert "/icon/rebound.png" not in origin.hits
+
+
+def test_concurrent_misses_fetch_once(tmp_path, origin):
+    cache = make_cache(tmp_path)
+    url = origin.url("/icon/stampede.png")
+    start = threading.Barrier(8)
+    results = []
+
+    def get():
+        start.wait()
+        results.append(cache.get(url, 48))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8 and len({data for data, _ in results}) == 1
+    assert origin.hits["/icon/stampede.png"] == 1
+    assert cache._key_locks == {}
+
+
+def test_refuses_images_that_are_not_raster(tmp_path, origin):
+    cache = make_cache(tmp_path)
+    with pytest.raises(AppError) as error:
+        cache.get(origin.url("/svg/script.svg"), 48)
+    assert error.value.status_code == 502
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_drops_unconverted_files_of_earlier_versions(tmp_path, origin):
+    (tmp_path / f"{IconCache.version('http://example.com/a.svg')}-48.svg").write_bytes(b"<svg/>")
+    cache = make_cache(tmp_path)
+    assert cache.stats()["entries"] == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def create_app(client, icon_url):
+    response = client.post(
+        "/api/apps", json={"name": "Icon test", "category": "tools", "iconUrl": icon_url}
+    )
+    assert response.status_code == 201
+    return response.get_json()["app"]["id"]
+
+
+def test_versioned_icons_are_immutable_and_unversioned_revalidate(client, origin):
+    icon_url = origin.url("/icon/headers.png")
+    app_id = create_app(client, icon_url)
+
+    versioned = client.get(f"/icons/{app_id}/48?v={icon_cache.version(icon_url)}")
+    assert versioned.status_code == 200
+    assert "immutable" in versioned.headers["Cache-Control"]
+
+    unversioned = client.get(f"/icons/{app_id}/48")
+    assert unversioned.status_code == 200
+    assert unversioned.headers["Cache-Control"] == "public, no-cache"
+
+    assert versioned.mimetype == "image/png"
+    assert versioned.headers["X-Content-Type-Options"] == "nosniff"
+    assert versioned.headers["Content-Security-Policy"] == "default-src 'none'; sandbox"
+
+    stale = client.get(f"/icons/{app_id}/48?v={icon_cache.version('http://example.com/old.png')}")
+    assert stale.headers["Cache-Control"] == "public, no-cache"
+
+
+def test_svg_icons_are_not_served(client, origin):
+    app_id = create_app(client, origin.url("/svg/app.svg"))
+    response = client.get(f"/icons/{app_id}/48")
+    assert response.status_code == 502
+    assert b"<script>" not in response.data
+
+
+def test_update_discards_old_icon_and_prefetches_new(client, origin):
+    old_url, new_url = origin.url("/icon/before.png"), origin.url("/icon/after.png")
+    app_id = create_app(client, old_url)
+    for size in (48, 96):
+        assert client.get(f"/icons/{app_id}/{size}").status_code == 200
+
+    response = client.put(f"/api/apps/{app_id}", json={"iconUrl": new_url})
+    assert response.status_code == 200
+
+    assert icon_cache.lookup(icon_cache.version(old_url), 48) is None
+    assert icon_cache.lookup(icon_cache.version(old_url), 96) is None
+    assert wait_for(
+        lambda: icon_cache.lookup(icon_cache.version(new_url), 48) is not None
+        and icon_cache.lookup(icon_cache.version(new_url), 96) is not None
+    )
+    assert origin.hits["/icon/after.png"] == 2
+
+
+def test_prefetches_beyond_the_backlog_are_skipped(tmp_path, origin, monkeypatch):
+    cache = make_cache(tmp_path, prefetch_workers=1, max_pending_prefetches=1)
+    for name in ("old-a", "old-b"):
+        cache.get(origin.url(f"/icon/{name}.png"), 48)
+    release = threading.Event()
+    fetched = []
+
+    def slow_get(icon_url, bucket):
+        release.wait(5)
+        fetched.append(icon_url)
+
+    monkeypatch.setattr(cache, "get", slow_get)
+    cache.replace(origin.url("/icon/old-a.png"), origin.url("/icon/new-a.png"))
+    cache.replace(origin.url("/icon/old-b.png"), origin.url("/icon/new-b.png"))
+    release.set()
+
+    assert wait_for(lambda: fetched == [origin.url("/icon/new-a.png")])
+    time.sleep(0.05)
+    assert fetched == [origin.url("/icon/new-a.png")]
+    # The slot is free again once the prefetch finished
+    assert cache._prefetch_slots.acquire(blocking=False)
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from config import Config
+from src.services.database import DatabaseService
+from src.services.importer import ImportReport, import_in_batches
+from src.services.sqlite_backend import SQLiteClient
+
+EXISTING_ID = "00000000-0000-0000-0000-000000000001"
+
+
+@pytest.fixture
+def db():
+    client = SQLiteClient(":memory:")
+    row = {"id": EXISTING_ID, "name": "Existing", "category": "tools", "launch_count": 0}
+    client.table(Config.APPS_TABLE).insert([row]).execute()
+    return DatabaseService(client)
+
+
+def run(db, rows, report, batch_size=2):
+    return [progress.progress() for progress in import_in_batches(db, rows, report, batch_size)]
+
+
+def test_batches_are_reported_with_row_indexes_of_the_whole_import(db):
+    rows = [
+        {"name": "One"},
+        {"name": "Two"},
+        {"name": "Renamed", "id": EXISTING_ID},
+        {"category": "no name"},
+        {"name": "Five"},
+    ]
+    report = ImportReport()
+    progress = run(db, rows, report)
+
+    assert [step["processed"] for step in progress] == [2, 4, 5]
+    assert report.to_dict() == {
+        "imported": 3,
+        "updated": 1,
+        "skipped": 0,
+        "failed": 1,
+        "total": 5,
+        "results": [{"index": 3, "status": "error", "error": "App name is required"}],
+        "resultsTruncated": False,
+    }
+    assert db.get_app_by_id(EXISTING_ID)["name"] == "Renamed"
+
+
+def test_later_rows_with_the_same_id_win(db):
+    rows = [{"name": "First", "id": EXISTING_ID}, {"name": "Second", "id": EXISTING_ID}]
+    report = ImportReport()
+    run(db, rows, report)
+
+    assert (report.updated, report.skipped) == (1, 1)
+    assert report.results[0]["index"] == 0
+    assert report.results[0]["status"] == "skipped"
+    assert db.get_app_by_id(EXISTING_ID)["name"] == "Second"
+
+
+def test_reported_rows_are_capped_unless_the_full_report_is_asked_for(db):
+    rows = [{"category": "no name"}] * 5 + [{"name": "Fine"}]
+
+    capped = ImportReport(max_rows=2)
+    run(db, rows, capped)
+    assert [result["index"] for result in capped.results] == [0, 1]
+    assert capped.truncated
+    assert capped.failed == 5
+
+    full = ImportReport(full=True)
+    run(db, rows, full)
+    assert [result["status"] for result in full.results] == ["error"] * 5 + ["created"]
+    assert not full.truncated
+
+
+def test_progress_is_streamed_as_ndjson(client):
+    body = "\n".join(json.dumps({"name": f"Streamed {n}"}) for n in range(3))
+    response = client.post(
+        "/api/apps/import?progress=1",
+        data=body,
+        content_type="application/x-ndjson",
+    )
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert response.mimetype == "application/x-ndjson"
+    assert {line["status"] for line in lines[:-1]} == {"progress"}
+    assert lines[-1]["status"] == "success"
+    assert (lines[-1]["imported"], lines[-1]["total"]) == (3, 3)
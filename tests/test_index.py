@@ -0,0 +1,12 @@
+import gzip
+
+
+def test_index_is_gzipped_only_when_accepted(client):
+    compressed = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert b"app-grid" in gzip.decompress(compressed.data)
+
+    for header in ("gzip;q=0", "identity", ""):
+        plain = client.get("/", headers={"Accept-Encoding": header})
+        assert "Content-Encoding" not in plain.headers, header
+        assert b"app-grid" in plain.data
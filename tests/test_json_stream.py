@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from src.models.exceptions import AppError
+from src.utils.json_stream import JsonArrayReader
+
+DOCUMENT = json.dumps(
+    {
+        "version": 2,
+        "apps": [
+            {
+                "name": 'Café "quoted" \\ slash',
+                "launchCount": 12,
+                "score": -1.5e3,
+                "hidden": False,
+                "icon": None,
+            },
+            {
+                "name": "Tabs\tand ☃",
+                "launchCount": 0,
+                "ratio": 0.25,
+                "tags": ["a", "b"],
+                "pinned": True,
+            },
+        ],
+    }
+)
+
+
+def chunked(text, size):
+    return (text[i : i + size] for i in range(0, len(text), size))
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_parses_across_any_chunk_boundary(size):
+    assert list(JsonArrayReader(chunked(DOCUMENT, size))) == json.loads(DOCUMENT)["apps"]
+
+
+def test_numbers_split_mid_token():
+    assert list(JsonArrayReader(iter(["[1.", "5, 2e", "+3, -", "7]"]))) == [1.5, 2000.0, -7]
+
+
+def test_syntax_error_is_reported_without_reading_the_rest():
+    consumed = []
+
+    def chunks():
+        yield '[{"name": "ok"}, {"name": oops}, '
+        for n in range(10000):
+            consumed.append(n)
+            yield '{"name": "filler"}, '
+        yield '{"name": "last"}]'
+
+    reader = iter(JsonArrayReader(chunks()))
+    assert next(reader) == {"name": "ok"}
+    with pytest.raises(AppError):
+        next(reader)
+    assert len(consumed) <= 1
@@ -0,0 +1,97 @@
+import pytest
+
+from config import Config
+from src.models.exceptions import AppError
+from src.services.database import DatabaseService
+from src.services.launch_counter import LaunchCounter
+from src.services.sqlite_backend import SQLiteClient
+
+APP_IDS = [f"00000000-0000-0000-0000-{n:012d}" for n in range(4)]
+UNKNOWN_ID = "11111111-1111-1111-1111-111111111111"
+
+
+@pytest.fixture
+def db():
+    client = SQLiteClient(":memory:")
+    rows = [
+        {"id": app_id, "name": f"App {n}", "launch_count": 0} for n, app_id in enumerate(APP_IDS)
+    ]
+    client.table(Config.APPS_TABLE).insert(rows).execute()
+    return DatabaseService(client)
+
+
+def make_counter(db, max_pending=100):
+    # A long interval keeps the flusher thread out of the way; tests flush explicitly
+    return LaunchCounter(db, flush_interval=3600, flush_threshold=100, max_pending=max_pending)
+
+
+def launch_count(db, app_id):
+    return db.get_app_by_id(app_id)["launch_count"]
+
+
+def test_launches_are_merged_into_one_write_per_flush(db, monkeypatch):
+    counter = make_counter(db)
+    writes = []
+    increment = db.increment_launch_counts
+
+    def counting_increment(increments):
+        writes.append(dict(increments))
+        return increment(increments)
+
+    monkeypatch.setattr(db, "increment_launch_counts", counting_increment)
+
+    for _ in range(3):
+        counter.record(APP_IDS[0])
+    assert counter.record(APP_IDS[1]) == 1
+    assert counter.pending() == {APP_IDS[0]: 3, APP_IDS[1]: 1}
+    assert launch_count(db, APP_IDS[0]) == 0
+
+    assert counter.flush() == 2
+    assert len(writes) == 1
+    assert counter.pending() == {}
+    assert launch_count(db, APP_IDS[0]) == 3
+    assert launch_count(db, APP_IDS[1]) == 1
+
+
+def test_unknown_apps_are_not_buffered(db):
+    counter = make_counter(db)
+    with pytest.raises(AppError) as error:
+        counter.record(UNKNOWN_ID)
+    assert error.value.status_code == 404
+    with pytest.raises(AppError):
+        counter.record("not-a-uuid")
+    assert counter.pending() == {}
+
+
+def test_distinct_pending_apps_are_capped(db):
+    counter = make_counter(db, max_pending=2)
+    counter.record(APP_IDS[0])
+    counter.record(APP_IDS[1])
+    # Apps already pending keep counting
+    assert counter.record(APP_IDS[0]) == 2
+
+    with pytest.raises(AppError) as error:
+        counter.record(APP_IDS[2])
+    assert error.value.status_code == 503
+
+    # The refusal wakes the flusher; whichever flush runs first writes the buffer
+    counter.flush()
+    assert launch_count(db, APP_IDS[0]) == 2
+    assert counter.record(APP_IDS[2]) == 1
+
+
+def test_a_failed_flush_is_retried(db, monkeypatch):
+    counter = make_counter(db)
+    counter.record(APP_IDS[0])
+
+    def failing_increment(increments):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(db, "increment_launch_counts", failing_increment)
+    assert counter.flush() == 0
+    counter.record(APP_IDS[0])
+    assert counter.pending() == {APP_IDS[0]: 2}
+
+    monkeypatch.undo()
+    assert counter.flush() == 1
+    assert launch_count(db, APP_IDS[0]) == 2
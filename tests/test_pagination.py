@@ -0,0 +1,124 @@
+from typing import Any
+
+import pytest
+
+from benchmarks.fake_supabase import FakeSupabaseClient
+from config import Config
+from src.models.exceptions import AppError
+from src.services.data_processing import DataProcessor
+from src.services.database import DatabaseService
+from src.services.snapshot import SnapshotClient, SnapshotStore
+from src.services.sqlite_backend import SQLiteClient
+
+
+def make_rows():
+    """Apps whose sort columns repeat values and are NULL for every fourth app."""
+    rows = []
+    for n in range(23):
+        missing = n % 4 == 0
+        rows.append(
+            {
+                "id": f"00000000-0000-0000-0000-{n:012d}",
+                "name": f"App {n % 7}",
+                "category": None if missing else ["games", "tools", "social"][n % 3],
+                "icon_url": None,
+                "app_store_link": None,
+                "launch_count": None if missing else n % 5,
+                "last_modified": None if missing else f"2026-01-{n % 9 + 1:02d}T00:00:00+00:00",
+                "last_launched": None,
+            }
+        )
+    return rows
+
+
+class Catalog:
+    """Just the reads SnapshotStore builds from."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def iter_apps(self):
+        return iter(self.rows)
+
+    def get_categories(self):
+        return ["games", "tools", "social"]
+
+    def get_settings(self):
+        return {"id": "settings"}
+
+
+@pytest.fixture(params=["sqlite", "postgrest", "snapshot"])
+def db(request, tmp_path):
+    rows = make_rows()
+    client: Any
+    if request.param == "sqlite":
+        client = SQLiteClient(":memory:")
+        client.table(Config.APPS_TABLE).insert(rows).execute()
+    elif request.param == "postgrest":
+        client = FakeSupabaseClient()
+        client.seed(Config.APPS_TABLE, rows)
+    else:
+        store = SnapshotStore(str(tmp_path / "catalog.snapshot"), lambda: Catalog(rows), 3600)
+        client = SnapshotClient(store)
+    return DatabaseService(client)
+
+
+def expected_ids(sort, descending):
+    # NULLs order after every value, as in Postgres: last ascending, first descending
+    rows = sorted(
+        make_rows(),
+        key=lambda row: (row[sort] is None, row[sort] if row[sort] is not None else 0, row["id"]),
+    )
+    ids = [row["id"] for row in rows]
+    return ids[::-1] if descending else ids
+
+
+def walk(db, sort, descending, limit, direction="next_cursor", cursor=None):
+    pages = []
+    while True:
+        page = db.get_apps_page(sort=sort, descending=descending, limit=limit, cursor=cursor)
+        pages.append([app["id"] for app in page["apps"]])
+        cursor = page[direction]
+        if cursor is None:
+            return pages, page
+
+
+@pytest.mark.parametrize("sort", Config.SORTABLE_COLUMNS)
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("limit", [1, 4, 6])
+def test_cursors_visit_every_app_once_in_order(db, sort, descending, limit):
+    pages, last = walk(db, sort, descending, limit)
+
+    assert [app_id for page in pages for app_id in page] == expected_ids(sort, descending)
+    assert all(0 < len(page) <= limit for page in pages)
+
+    # Paging back from the last page retraces the same pages
+    back, _ = walk(db, sort, descending, limit, "prev_cursor", last["prev_cursor"])
+    assert back[::-1] == pages[:-1]
+
+
+def test_unpaginated_listing_has_no_cursors(db):
+    page = db.get_apps_page(sort="name")
+    assert len(page["apps"]) == 23
+    assert page["next_cursor"] is None and page["prev_cursor"] is None
+
+
+def test_rejects_unsortable_columns_and_bad_cursors(db):
+    with pytest.raises(AppError):
+        db.get_apps_page(sort="icon_url", limit=5)
+    with pytest.raises(AppError):
+        db.get_apps_page(sort="name", limit=5, cursor="not-a-cursor")
+
+
+@pytest.mark.parametrize("limit", ["abc", "0", str(Config.MAX_PAGE_SIZE + 1)])
+def test_invalid_limits_are_rejected(limit):
+    with pytest.raises(AppError) as error:
+        DataProcessor.validate_list_args({"limit": limit})
+    assert error.value.status_code == 400
+
+
+def test_list_args(client):
+    assert DataProcessor.validate_list_args(
+        {"sort": "launchCount", "order": "desc", "limit": "20"}
+    ) == {"filters": {}, "sort": "launch_count", "descending": True, "limit": 20, "cursor": None}
+    assert client.get("/api/apps?limit=abc").status_code == 400
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from config import Config
+from src.services.database import CatalogQueries, DatabaseService
+from src.services.popularity import PopularityTracker, popular_page, popular_start
+from src.services.sqlite_backend import SQLiteClient
+
+APP_IDS = [f"00000000-0000-0000-0000-{n:012d}" for n in range(6)]
+
+
+def make_db():
+    client = SQLiteClient(":memory:")
+    rows = [{"id": app_id, "name": f"App {n}"} for n, app_id in enumerate(APP_IDS)]
+    client.table(Config.APPS_TABLE).insert(rows).execute()
+    return DatabaseService(client)
+
+
+def buckets(db):
+    rows = db.client.table(Config.LAUNCHES_TABLE).select("*").execute().data
+    return sorted((row["app_id"], row["launches"]) for row in rows)
+
+
+def launch_at(db, app_id, age_days, launches=1):
+    """Record launches made ``age_days`` ago, without going through the service."""
+    launched_at = datetime.utcnow() - timedelta(days=age_days)
+    params = {"app_id": app_id, "amount": launches, "launched_at": launched_at.isoformat()}
+    db.client.rpc(Config.INCREMENT_LAUNCH_FN, params).execute()
+
+
+@pytest.fixture(autouse=True)
+def purge_due(monkeypatch):
+    """Every test starts with this process's launch purge due."""
+    monkeypatch.setattr(CatalogQueries, "_launches_purged_at", None)
+
+
+def test_ranking_follows_launches():
+    tracker = PopularityTracker(half_life_hours=72, top_k=3, max_age=300)
+    tracker.end_rebuild(tracker.begin_rebuild(), {})
+    tracker.record_many({APP_IDS[0]: 1, APP_IDS[1]: 5, APP_IDS[2]: 3, APP_IDS[3]: 2})
+    assert tracker.ranking() == [APP_IDS[1], APP_IDS[2], APP_IDS[3]]
+
+    tracker.record(APP_IDS[0], 10)
+    assert tracker.ranking() == [APP_IDS[0], APP_IDS[1], APP_IDS[2]]
+
+
+def test_removing_a_ranked_app_refills_the_top_k():
+    tracker = PopularityTracker(half_life_hours=72, top_k=2, max_age=300)
+    scores = {APP_IDS[0]: 3.0, APP_IDS[1]: 2.0, APP_IDS[2]: 1.0}
+    tracker.end_rebuild(tracker.begin_rebuild(), scores)
+    tracker.remove([APP_IDS[0]])
+    assert tracker.ranking() == [APP_IDS[1], APP_IDS[2]]
+
+
+def test_launches_during_a_rebuild_are_replayed():
+    tracker = PopularityTracker(half_life_hours=72, top_k=3, max_age=300)
+    mark = tracker.begin_rebuild()
+    tracker.record(APP_IDS[2], 5)
+    tracker.end_rebuild(mark, {APP_IDS[0]: 2.0, APP_IDS[1]: 1.0})
+    assert tracker.ranking() == [APP_IDS[2], APP_IDS[0], APP_IDS[1]]
+
+
+def test_popular_pages_chain_by_position():
+    apps = [{"id": app_id} for app_id in APP_IDS]
+    first = popular_page(apps, 0, 4)
+    assert [app["id"] for app in first["apps"]] == APP_IDS[:4]
+    assert first["prev_cursor"] is None
+
+    second = popular_page(apps, popular_start(first["next_cursor"]), 4)
+    assert [app["id"] for app in second["apps"]] == APP_IDS[4:]
+    assert second["next_cursor"] is None
+    assert popular_start(second["prev_cursor"]) == 0
+
+
+def test_reading_scores_skips_but_keeps_expired_rollups():
+    db = make_db()
+    launch_at(db, APP_IDS[0], age_days=1, launches=2)
+    launch_at(db, APP_IDS[1], age_days=Config.POPULARITY_RETENTION_DAYS + 1, launches=50)
+
+    scores = db.get_launch_scores()
+
+    assert set(scores) == {APP_IDS[0]}
+    assert buckets(db) == [(APP_IDS[0], 2), (APP_IDS[1], 50)]
+
+
+def test_writing_launches_purges_expired_rollups_once_per_interval():
+    db = make_db()
+    launch_at(db, APP_IDS[1], age_days=Config.POPULARITY_RETENTION_DAYS + 1)
+
+    db.increment_launch_count(APP_IDS[0])
+    assert buckets(db) == [(APP_IDS[0], 1)]
+
+    launch_at(db, APP_IDS[2], age_days=Config.POPULARITY_RETENTION_DAYS + 1)
+    now = datetime.utcnow().isoformat()
+    db.increment_launch_counts({APP_IDS[0]: {"count": 2, "last_launched": now}})
+    assert buckets(db) == [(APP_IDS[0], 3), (APP_IDS[2], 1)]
+
+
+def test_a_failed_purge_does_not_fail_the_launch(monkeypatch):
+    db = make_db()
+
+    def failing_plan():
+        raise RuntimeError("database unavailable")
+        yield
+
+    monkeypatch.setattr(db, "_purge_launches_plan", failing_plan)
+    assert db.increment_launch_count(APP_IDS[0])["launch_count"] == 1
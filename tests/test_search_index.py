@@ -0,0 +1,100 @@
+import pytest
+
+from config import Config
+from src.services.cache import CachedDatabaseService, TTLCache
+from src.services.catalog_indexes import CatalogIndexes
+from src.services.facets import CategoryFacets
+from src.services.popularity import PopularityTracker
+from src.services.search_index import SearchIndex
+from src.services.sqlite_backend import SQLiteClient
+
+MODIFIED = "2026-01-01T00:00:00"
+APPS = [
+    {"id": "a", "name": "Camera Plus", "category": "photo", "last_modified": MODIFIED},
+    {"id": "b", "name": "Café Finder", "category": "travel", "last_modified": MODIFIED},
+    {"id": "c", "name": "Pocket Calculator", "category": "tools", "last_modified": MODIFIED},
+    {"id": "d", "name": "Weather", "category": "calendar", "last_modified": MODIFIED},
+]
+VERSION = {"apps_count": len(APPS), "apps_modified": MODIFIED}
+
+
+def built(apps=APPS):
+    index = SearchIndex(300)
+    index.rebuild(apps, {"apps_count": len(apps), "apps_modified": MODIFIED})
+    return index
+
+
+def found(results):
+    return [(result["id"], result["match"]) for result in results]
+
+
+def test_name_prefixes_come_before_words_categories_and_fuzzy_matches():
+    results = built().search("ca", 10)
+    assert found(results) == [("b", "prefix"), ("a", "prefix"), ("c", "word"), ("d", "category")]
+
+
+def test_accents_and_case_are_ignored():
+    assert found(built().search("CAFE", 10)) == [("b", "prefix")]
+
+
+def test_misspellings_fall_back_to_trigrams():
+    assert found(built().search("calculatr", 10)) == [("c", "fuzzy")]
+
+
+def test_writes_are_followed_without_a_rebuild():
+    index = built()
+    index.upsert([{"id": "c", "name": "Converter", "category": "tools"}])
+    index.remove(["a"])
+
+    assert found(index.search("con", 10)) == [("c", "prefix")]
+    assert index.search("pocket", 10) == []
+    assert index.search("camera", 10) == []
+    assert index.builds == 1
+
+
+def test_the_index_is_current_until_the_catalog_moves():
+    index = built()
+    assert index.is_current(VERSION)
+    assert not index.is_current({**VERSION, "apps_count": len(APPS) + 1})
+    assert not index.is_current({**VERSION, "apps_modified": "2026-02-01T00:00:00"})
+
+    index.invalidate()
+    assert not index.is_current(VERSION)
+
+
+def test_one_background_refresh_at_a_time():
+    index = built()
+    assert index.claim_refresh()
+    assert not index.claim_refresh()
+    index.release_refresh()
+    assert index.claim_refresh()
+
+
+@pytest.fixture
+def db():
+    client = SQLiteClient(":memory:")
+    rows = [{**app, "id": f"00000000-0000-0000-0000-{n:012d}"} for n, app in enumerate(APPS)]
+    client.table(Config.APPS_TABLE).insert(rows).execute()
+    indexes = CatalogIndexes(SearchIndex(300), PopularityTracker(72, 10, 300), CategoryFacets(300))
+    return CachedDatabaseService(client, cache=TTLCache(300, 128), indexes=indexes)
+
+
+def test_searching_reads_the_database_only_to_build(db, monkeypatch):
+    assert [app["name"] for app in db.search_apps("weather", 5)] == ["Weather"]
+
+    def no_queries(name, *args):
+        raise AssertionError(f"queried {name}")
+
+    monkeypatch.setattr(db.client, "table", no_queries)
+    monkeypatch.setattr(db.client, "rpc", no_queries)
+    for query in ("w", "we", "wea"):
+        assert [app["name"] for app in db.search_apps(query, 5)] == ["Weather"]
+
+
+def test_apps_written_through_the_service_are_found_at_once(db):
+    db.search_apps("weather", 5)
+    created = db.create_app({"name": "Weather Radar", "category": "weather"})
+    db.delete_app(db.search_apps("weather", 1)[0]["id"])
+
+    assert [app["id"] for app in db.search_apps("weather", 5)] == [created["id"]]
+    assert db.indexes.search_index.builds == 1
@@ -0,0 +1,185 @@
+import mmap
+import threading
+import time
+
+from config import Config
+from src.services.snapshot import (
+    LAST_LAUNCHED_OFFSET,
+    MIN_COMPACT_HEAP,
+    SEQUENCE,
+    SEQUENCE_OFFSET,
+    SnapshotClient,
+    SnapshotStore,
+)
+
+
+class Source:
+    """Just the reads SnapshotStore builds from."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def iter_apps(self):
+        return iter(self.rows)
+
+    def get_categories(self):
+        return ["games", "tools"]
+
+    def get_settings(self):
+        return {"id": "settings", "icon_size": 60}
+
+
+def make_row(n, **values):
+    row = {
+        "id": f"app-{n:04d}",
+        "name": f"App number {n}",
+        "category": "games",
+        "icon_url": f"https://example.com/icons/{n}.png",
+        "app_store_link": None,
+        "launch_count": 0,
+        "last_modified": "2026-01-01T00:00:00+00:00",
+        "last_launched": None,
+    }
+    row.update(values)
+    return row
+
+
+def make_store(tmp_path, count=50):
+    store = SnapshotStore(
+        str(tmp_path / "catalog.snapshot"),
+        lambda: Source([make_row(n) for n in range(count)]),
+        3600,
+    )
+    return store, store.current()
+
+
+def test_published_sequences_are_even(tmp_path):
+    store, snapshot = make_store(tmp_path)
+    sequence = snapshot.sequence
+    assert sequence % 2 == 0
+
+    store.apply([make_row(1, launch_count=3, last_launched="2026-01-02T00:00:00+00:00")])
+    assert store.patches == 1
+    assert store.current().sequence == sequence + 2
+    assert snapshot.find("app-0001")["launch_count"] == 3
+
+    store.apply([make_row(1, name="Renamed")])
+    assert store.publishes == 1
+    assert store.current().sequence % 2 == 0
+
+
+def test_readers_wait_out_a_launch_patch(tmp_path):
+    store, snapshot = make_store(tmp_path)
+    record = snapshot.find("app-0001")
+    sequence = snapshot.sequence
+    results = []
+
+    with open(store.path, "r+b") as f, mmap.mmap(f.fileno(), 0) as buffer:
+        # Begin a patch the way _patch does, and leave it half-written
+        SEQUENCE.pack_into(buffer, SEQUENCE_OFFSET, sequence + 1)
+        start = record._offset + LAST_LAUNCHED_OFFSET
+        buffer[start : start + 10] = b"2026-02-03"
+        reader = threading.Thread(target=lambda: results.append(record["last_launched"]))
+        reader.start()
+        time.sleep(0.1)
+        assert results == []
+
+        buffer[start : start + 40] = b"2026-02-03T04:05:06.123456+00:00".ljust(40, b"\0")
+        SEQUENCE.pack_into(buffer, SEQUENCE_OFFSET, sequence + 2)
+        reader.join(timeout=2)
+
+    assert results == ["2026-02-03T04:05:06.123456+00:00"]
+
+
+def test_stuck_patch_is_replaced_by_a_clean_publish(tmp_path):
+    store, snapshot = make_store(tmp_path)
+    with open(store.path, "r+b") as f, mmap.mmap(f.fileno(), 0) as buffer:
+        SEQUENCE.pack_into(buffer, SEQUENCE_OFFSET, snapshot.sequence + 1)
+
+    store.apply([make_row(2, launch_count=9, last_launched="2026-01-03T00:00:00+00:00")])
+
+    assert store.patches == 0 and store.publishes == 1
+    current = store.current()
+    assert current.sequence % 2 == 0
+    assert current.find("app-0002")["launch_count"] == 9
+
+
+def test_republish_reuses_unchanged_strings(tmp_path):
+    store, snapshot = make_store(tmp_path)
+    heap_size = snapshot.heap_size
+
+    store.apply([make_row(3, name="A new name")])
+
+    current = store.current()
+    assert current.heap_size == heap_size + len("A new name")
+    assert dict(current.find("app-0003"))["name"] == "A new name"
+    assert current.find("app-0003")["icon_url"] == "https://example.com/icons/3.png"
+
+
+def test_heap_is_compacted_once_it_doubles(tmp_path):
+    store, snapshot = make_store(tmp_path)
+    long_name = "x" * 2000
+    for n in range(200):
+        store.apply([make_row(4, name=f"{long_name}{n}")])
+
+    current = store.current()
+    assert current.heap_size <= 2 * max(snapshot.heap_size, MIN_COMPACT_HEAP) + len(long_name) + 3
+    assert current.find("app-0004")["name"] == f"{long_name}199"
+    assert [record["id"] for record in current.records()] == [f"app-{n:04d}" for n in range(50)]
+    assert current.records()[5]["name"] == "App number 5"
+
+
+def test_launch_patches_keep_orders_over_other_columns(tmp_path):
+    store, snapshot = make_store(tmp_path)
+    by_name = snapshot.ordered((("name", False), ("id", False)))
+    by_launches = snapshot.ordered((("launch_count", True), ("id", False)))
+
+    store.apply([make_row(7, launch_count=5, last_launched="2026-01-02T00:00:00+00:00")])
+
+    assert store.patches == 1
+    assert snapshot.ordered((("name", False), ("id", False))) is by_name
+    reordered = snapshot.ordered((("launch_count", True), ("id", False)))
+    assert reordered is not by_launches
+    assert snapshot.id_at(reordered[0]) == "app-0007"
+
+
+def test_filtered_queries_decode_columns_once_per_file_or_patch(tmp_path, monkeypatch):
+    store, snapshot = make_store(tmp_path)
+    decoded = []
+    decode = snapshot._decode_column
+
+    def counting_decode(column):
+        decoded.append(column)
+        return decode(column)
+
+    monkeypatch.setattr(snapshot, "_decode_column", counting_decode)
+    client = SnapshotClient(store)
+
+    def launched_games():
+        query = (
+            client.table(Config.APPS_TABLE)
+            .select("*")
+            .eq("category", "games")
+            .gt("launch_count", 0)
+        )
+        return [row["id"] for row in query.execute().data]
+
+    assert launched_games() == []
+    assert launched_games() == []
+    store.apply([make_row(8, launch_count=2, last_launched="2026-01-02T00:00:00+00:00")])
+    assert launched_games() == ["app-0008"]
+
+    assert decoded == ["category", "launch_count", "launch_count"]
+
+
+def test_background_refresh_can_run_again(tmp_path):
+    store, snapshot = make_store(tmp_path)
+    store.max_age = 0
+    for _ in range(2):
+        rebuilds = store.rebuilds
+        time.sleep(0.01)
+        store.current()
+        deadline = time.monotonic() + 5
+        while (store.rebuilds == rebuilds or store._refreshing) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.rebuilds == rebuilds + 1
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from config import Config
+from src.services.data_processing import DataProcessor
+from src.services.database import DatabaseService, encode_sync_token
+from src.services.sqlite_backend import SQLiteClient
+
+APP_IDS = [f"00000000-0000-0000-0000-{n:012d}" for n in range(4)]
+LONG_AGO = "2020-01-01T00:00:00"
+
+
+@pytest.fixture
+def db():
+    client = SQLiteClient(":memory:")
+    rows = [
+        {"id": app_id, "name": f"App {n}", "launch_count": 0, "last_modified": LONG_AGO}
+        for n, app_id in enumerate(APP_IDS)
+    ]
+    client.table(Config.APPS_TABLE).insert(rows).execute()
+    return DatabaseService(client)
+
+
+def tombstones(db):
+    rows = db.client.table(Config.TOMBSTONES_TABLE).select("id").execute().data
+    return sorted(row["id"] for row in rows)
+
+
+def test_without_a_token_the_whole_catalog_is_sent(db):
+    changes = db.get_changes()
+    assert changes["reset"]
+    assert changes["deleted"] == []
+    assert sorted(app["id"] for app in changes["apps"]) == APP_IDS
+
+
+def test_a_token_brings_only_what_changed_since(db):
+    token = db.get_changes()["token"]
+    db.update_app(APP_IDS[0], DataProcessor.validate_app_data({"name": "Renamed"}, for_update=True))
+    db.increment_launch_count(APP_IDS[1])
+    db.delete_app(APP_IDS[2])
+    created = db.create_app(DataProcessor.validate_app_data({"name": "New"}))
+
+    changes = db.get_changes(token)
+
+    assert not changes["reset"]
+    assert sorted(app["id"] for app in changes["apps"]) == sorted(
+        [APP_IDS[0], APP_IDS[1], created["id"]]
+    )
+    assert changes["deleted"] == [APP_IDS[2]]
+
+
+def test_tokens_older_than_the_tombstones_start_over(db):
+    expired = datetime.now(timezone.utc) - timedelta(days=Config.TOMBSTONE_RETENTION_DAYS + 1)
+    changes = db.get_changes(encode_sync_token(expired))
+    assert changes["reset"]
+    assert len(changes["apps"]) == len(APP_IDS)
+
+
+def test_deleting_purges_tombstones_past_retention(db):
+    expired = datetime.utcnow() - timedelta(days=Config.TOMBSTONE_RETENTION_DAYS + 1)
+    db.client.table(Config.TOMBSTONES_TABLE).insert(
+        [{"id": APP_IDS[3], "deleted_at": expired.isoformat()}]
+    ).execute()
+
+    db.delete_app(APP_IDS[0])
+
+    assert tombstones(db) == [APP_IDS[0]]
+
+
+def test_a_deleted_app_reaches_clients_through_the_api(client):
+    created = client.post("/api/apps", json={"name": "Short lived"}).get_json()["app"]
+    token = client.get("/api/apps/changes").get_json()["token"]
+
+    assert client.delete(f"/api/apps/{created['id']}").status_code == 200
+    changes = client.get(f"/api/apps/changes?since={token}").get_json()
+
+    # The app database is shared with other tests, whose deletes may fall in the overlap
+    assert created["id"] in changes["deleted"]
+    assert created["id"] not in [app["id"] for app in changes["apps"]]